@@ -0,0 +1,179 @@
+"""
+Benchmarks for the availability engine in interviews/utils.py (pytest-benchmark).
+
+Not collected by the regular test run, run them explicitly:
+
+    pytest benchmarks/bench_availability.py --benchmark-sort=mean
+    pytest benchmarks/bench_availability.py -k "calc and panel" --benchmark-histogram
+
+Every function is swept along one axis at a time (panel size, range length, busy
+density, interview duration) around a baseline case, and each sweep is its own
+benchmark group, so a group's table reads as the scaling curve of that function along
+that axis. Inputs are generated by services.mock_availability from a fixed seed per case
+and cached, only the dates move with the day the benchmarks run (the engine drops
+everything before its cutoff).
+"""
+
+import random
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from functools import cache
+from typing import NamedTuple
+
+import pytest
+
+from interviews.utils import calc_available_slots
+from interviews.utils import calc_available_slots_with_date_range
+from interviews.utils import get_available_slots
+from interviews.utils import get_available_slots_range
+from interviews.utils import get_interview_slots
+from interviews.utils import get_shared_slots
+from services.mock_availability import generate_busy_blocks_with_range
+
+SEED = 20250501
+
+
+class Case(NamedTuple):
+    panel: int = 5  # interviewers
+    days: int = 30  # length of the requested range
+    density: int = 3  # busy blocks per interviewer per day
+    duration: int = 60  # interview length in minutes
+
+
+BASELINE = Case()
+AXES = {
+    "panel": (1, 2, 5, 10, 25, 50),
+    "days": (7, 14, 30, 90, 180, 365),
+    "density": (0, 1, 3, 6, 12),
+    "duration": (30, 60, 90, 120, 240),
+}
+
+
+# one case per value of every axis, the other fields at the baseline; the duration axis
+# is left out for functions that do not take a duration
+def sweep(*axes: str) -> list:
+    return [
+        pytest.param(axis, BASELINE._replace(**{axis: value}), id=f"{axis}={value}")
+        for axis in axes
+        for value in AXES[axis]
+    ]
+
+
+WITHOUT_DURATION = sweep("panel", "days", "density")
+ALL_AXES = sweep("panel", "days", "density", "duration")
+
+
+def case_range(case: Case) -> tuple[str, str]:
+    start = datetime.combine(
+        datetime.now(UTC).date() + timedelta(days=2),
+        datetime.min.time(),
+    )
+    end = start + timedelta(days=case.days - 1, hours=23, minutes=59, seconds=59)
+    return f"{start.isoformat()}Z", f"{end.isoformat()}Z"
+
+
+# busy data in the provider format, the same for a given case on every run
+@cache
+def busy_data(case: Case) -> list[dict]:
+    rng = random.Random(f"{SEED}:{case.panel}:{case.days}:{case.density}")  # noqa: S311
+    start, end = case_range(case)
+    return [
+        {
+            "interviewerId": interviewer_id,
+            "name": f"Interviewer {interviewer_id}",
+            "busy": generate_busy_blocks_with_range(
+                start,
+                end,
+                blocks=case.density * case.days,
+                rng=rng,
+            ),
+        }
+        for interviewer_id in range(1, case.panel + 1)
+    ]
+
+
+def interviewer_ids(case: Case) -> list[int]:
+    return [interviewer["interviewerId"] for interviewer in busy_data(case)]
+
+
+@cache
+def interviewers_availability(case: Case) -> dict:
+    start, end = case_range(case)
+    return {
+        interviewer["interviewerId"]: get_available_slots_range(
+            [interviewer],
+            start,
+            end,
+        )
+        for interviewer in busy_data(case)
+    }
+
+
+@cache
+def shared_slots(case: Case) -> dict:
+    return get_shared_slots(interviewers_availability(case))
+
+
+def label(benchmark, function, axis: str, case: Case):
+    benchmark.group = f"{function.__name__}: {axis}"
+    benchmark.extra_info.update(case._asdict())
+
+
+@pytest.mark.parametrize(("axis", "case"), WITHOUT_DURATION)
+def test_get_available_slots(benchmark, axis, case):
+    label(benchmark, get_available_slots, axis, case)
+    data = busy_data(case)
+    benchmark(
+        lambda: [get_available_slots(interviewer["busy"]) for interviewer in data],
+    )
+
+
+@pytest.mark.parametrize(("axis", "case"), WITHOUT_DURATION)
+def test_get_available_slots_range(benchmark, axis, case):
+    label(benchmark, get_available_slots_range, axis, case)
+    data = busy_data(case)
+    start, end = case_range(case)
+    benchmark(get_available_slots_range, data, start, end)
+
+
+@pytest.mark.parametrize(("axis", "case"), WITHOUT_DURATION)
+def test_get_shared_slots(benchmark, axis, case):
+    label(benchmark, get_shared_slots, axis, case)
+    benchmark(get_shared_slots, interviewers_availability(case))
+
+
+@pytest.mark.parametrize(("axis", "case"), ALL_AXES)
+def test_get_interview_slots(benchmark, axis, case):
+    label(benchmark, get_interview_slots, axis, case)
+    benchmark(get_interview_slots, shared_slots(case), case.duration)
+
+
+@pytest.mark.parametrize(("axis", "case"), ALL_AXES)
+def test_calc_available_slots(benchmark, axis, case):
+    label(benchmark, calc_available_slots, axis, case)
+    benchmark(
+        calc_available_slots,
+        busy_data(case),
+        interviewer_ids(case),
+        case.duration,
+    )
+
+
+@pytest.mark.parametrize("engine", ["bitmask", "numpy"])
+@pytest.mark.parametrize(("axis", "case"), ALL_AXES)
+def test_calc_available_slots_with_date_range(benchmark, axis, case, engine):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    label(benchmark, calc_available_slots_with_date_range, axis, case)
+    benchmark.group += f" ({engine})"
+    start, end = case_range(case)
+    benchmark(
+        calc_available_slots_with_date_range,
+        busy_data(case),
+        interviewer_ids(case),
+        case.duration,
+        start,
+        end,
+        engine,
+    )
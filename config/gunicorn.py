@@ -0,0 +1,22 @@
+# gunicorn settings for production, see compose/production/django/start
+import os
+
+from prometheus_client import CollectorRegistry
+from prometheus_client import multiprocess
+from prometheus_client import start_http_server
+
+
+# worker metrics live in PROMETHEUS_MULTIPROC_DIR, drop the per-process files of a
+# worker that exited
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
+
+
+# Prometheus scrapes the merged worker samples from the arbiter on this port, which is
+# not routed through the public proxy; "0" turns the exporter off
+def when_ready(server):
+    port = int(os.environ.get("INTERVIEWS_METRICS_PORT", "9100"))
+    if port:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(port, registry=registry)
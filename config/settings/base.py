@@ -48,7 +48,7 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 
 # COMMENTED OUT <--------------------------------------------------------------------------------------------------------------------------
-#DATABASES = {"default": env.db("DATABASE_URL")}
+# DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -57,7 +57,7 @@ DATABASES = {
         "PASSWORD": env("POSTGRES_PASSWORD"),
         "HOST": env("POSTGRES_HOST"),
         "PORT": env("POSTGRES_PORT"),
-    }
+    },
 }
 
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
@@ -82,6 +82,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -100,7 +101,7 @@ THIRD_PARTY_APPS = [
 
 LOCAL_APPS = [
     "candidate_fyi_takehome_project.users",
-    "interviews"
+    "interviews",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -149,6 +150,8 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "interviews.timing.ServerTimingMiddleware",
+    "interviews.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -159,6 +162,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "interviews.log.DebugLogSamplingMiddleware",
 ]
 
 # STATIC
@@ -258,9 +262,15 @@ DJANGO_ADMIN_FORCE_ALLAUTH = env.bool("DJANGO_ADMIN_FORCE_ALLAUTH", default=Fals
 # https://docs.djangoproject.com/en/dev/ref/settings/#logging
 # See https://docs.djangoproject.com/en/dev/topics/logging for
 # more details on how to customize your logging configuration.
+# interviews_availability goes through a queue: the request thread only enqueues records and a
+# listener thread formats them and writes the console and the size rotated log file. Its level
+# (INTERVIEWS_LOG_LEVEL) gates the debug dumps, which are also sampled per request.
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "sampled_debug": {"()": "interviews.log.SampledDebugFilter"},
+    },
     "formatters": {
         "verbose": {
             "format": "%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s",
@@ -272,22 +282,34 @@ LOGGING = {
             "class": "logging.StreamHandler",
             "formatter": "verbose",
         },
-        "interview_file": { #<--------------------------------------------------------------------------------------------------------------------------------
+        "interview_file": {  # <--------------------------------------------------------------------------------------------------------------------------------
             "level": "DEBUG",
-            "class": "logging.FileHandler",
+            "class": "logging.handlers.RotatingFileHandler",
             "filename": str(BASE_DIR / "logs" / "interviews_availability.log"),
+            "maxBytes": env.int("INTERVIEWS_LOG_MAX_BYTES", default=10 * 1024 * 1024),
+            "backupCount": env.int("INTERVIEWS_LOG_BACKUP_COUNT", default=5),
             "formatter": "verbose",
         },
+        "interview_queue": {
+            "class": "interviews.log.DeferredQueueHandler",
+            "handlers": ["console", "interview_file"],
+            "respect_handler_level": True,
+        },
     },
     "root": {"level": "INFO", "handlers": ["console"]},
-    "loggers": { #<-------------------------------------------------------------------------------------------------------------------------------------------
+    "loggers": {  # <-------------------------------------------------------------------------------------------------------------------------------------------
         "interviews_availability": {
-            "handlers": ["console", "interview_file"],
-            "level": "DEBUG",
+            "handlers": ["interview_queue"],
+            "filters": ["sampled_debug"],
+            "level": env("INTERVIEWS_LOG_LEVEL", default="DEBUG"),
+            "propagate": False,
+        },
+        "interviews_timing": {
+            "handlers": ["interview_queue"],
+            "level": "INFO",
             "propagate": False,
         },
     },
-
 }
 
 REDIS_URL = env("REDIS_URL", default="redis://redis:6379/0")
@@ -347,9 +369,13 @@ ACCOUNT_ADAPTER = "candidate_fyi_takehome_project.users.adapters.AccountAdapter"
 # https://docs.allauth.org/en/latest/account/forms.html
 ACCOUNT_FORMS = {"signup": "candidate_fyi_takehome_project.users.forms.UserSignupForm"}
 # https://docs.allauth.org/en/latest/socialaccount/configuration.html
-SOCIALACCOUNT_ADAPTER = "candidate_fyi_takehome_project.users.adapters.SocialAccountAdapter"
+SOCIALACCOUNT_ADAPTER = (
+    "candidate_fyi_takehome_project.users.adapters.SocialAccountAdapter"
+)
 # https://docs.allauth.org/en/latest/socialaccount/configuration.html
-SOCIALACCOUNT_FORMS = {"signup": "candidate_fyi_takehome_project.users.forms.UserSocialSignupForm"}
+SOCIALACCOUNT_FORMS = {
+    "signup": "candidate_fyi_takehome_project.users.forms.UserSocialSignupForm",
+}
 
 # django-rest-framework
 # -------------------------------------------------------------------------------
@@ -377,3 +403,100 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+
+# interviews
+# ------------------------------------------------------------------------------
+# Engine behind calc_available_slots_with_date_range: "bitmask" (pure Python) or
+# "numpy" (vectorized over the whole range, falls back to bitmask without numpy)
+INTERVIEWS_AVAILABILITY_ENGINE = env(
+    "INTERVIEWS_AVAILABILITY_ENGINE",
+    default="bitmask",
+)
+# Slot grid in minutes (5, 10, 15 or 30); interview starts land on this grid and
+# durations are rounded up to whole slots. Requests may override it with "granularity".
+INTERVIEWS_SLOT_GRANULARITY = env.int("INTERVIEWS_SLOT_GRANULARITY", default=30)
+# Per-interviewer free bitmaps are cached in the default cache (Redis in production)
+# and in a per-worker LRU in front of it. TTLs are in seconds.
+INTERVIEWS_AVAILABILITY_CACHE_TTL = env.int(
+    "INTERVIEWS_AVAILABILITY_CACHE_TTL",
+    default=300,
+)
+INTERVIEWS_AVAILABILITY_LOCAL_CACHE_TTL = env.int(
+    "INTERVIEWS_AVAILABILITY_LOCAL_CACHE_TTL",
+    default=30,
+)
+INTERVIEWS_AVAILABILITY_LOCAL_CACHE_SIZE = env.int(
+    "INTERVIEWS_AVAILABILITY_LOCAL_CACHE_SIZE",
+    default=10000,
+)
+# With a Redis URL (e.g. REDIS_URL) the free bitmaps are kept there instead, one string
+# per interviewer and day, and panels are intersected server side with BITOP AND
+INTERVIEWS_BITMAP_STORE_URL = env("INTERVIEWS_BITMAP_STORE_URL", default="")
+# Computed slots per panel query are shared across workers for RESULT_TTL seconds (so
+# the 24 hour cutoff may lag by that much); only one worker computes a key at a time,
+# holding a lock for at most LOCK_TIMEOUT seconds while the others wait for its result.
+INTERVIEWS_AVAILABILITY_RESULT_TTL = env.int(
+    "INTERVIEWS_AVAILABILITY_RESULT_TTL",
+    default=30,
+)
+INTERVIEWS_AVAILABILITY_LOCK_TIMEOUT = env.int(
+    "INTERVIEWS_AVAILABILITY_LOCK_TIMEOUT",
+    default=10,
+)
+# Panel busy data is fetched concurrently from the calendar provider; a request fails
+# when the whole panel takes longer than the timeout (seconds). The mock provider
+# sleeps for the simulated latency (seconds) on every interviewer fetch.
+INTERVIEWS_PROVIDER_TIMEOUT = env.float("INTERVIEWS_PROVIDER_TIMEOUT", default=5.0)
+INTERVIEWS_MOCK_PROVIDER_LATENCY = env.float(
+    "INTERVIEWS_MOCK_PROVIDER_LATENCY",
+    default=0.0,
+)
+# With a seed the in-process provider serves deterministic synthetic calendars
+# (services/calendar_generator.py) instead of new random blocks on every call
+INTERVIEWS_MOCK_PROVIDER_SEED = env.int("INTERVIEWS_MOCK_PROVIDER_SEED", default=None)
+# Batched free/busy API (python -m services.mock_availability serves a local stand-in).
+# Without a URL the in-process mock provider is used. Panels above the batch size are
+# split into several requests; the pool size is per worker process.
+INTERVIEWS_PROVIDER_URL = env("INTERVIEWS_PROVIDER_URL", default="")
+INTERVIEWS_PROVIDER_BATCH_SIZE = env.int("INTERVIEWS_PROVIDER_BATCH_SIZE", default=50)
+INTERVIEWS_PROVIDER_POOL_SIZE = env.int("INTERVIEWS_PROVIDER_POOL_SIZE", default=10)
+# Share of requests (0 to 1) whose DEBUG records are written to the
+# interviews_availability log
+INTERVIEWS_DEBUG_LOG_SAMPLE_RATE = env.float(
+    "INTERVIEWS_DEBUG_LOG_SAMPLE_RATE",
+    default=1.0,
+)
+# Streamed date range responses ("stream": true) are computed and sent in chunks of
+# this many days
+INTERVIEWS_STREAM_CHUNK_DAYS = env.int("INTERVIEWS_STREAM_CHUNK_DAYS", default=7)
+# Per request phase timings (roster, etag, cache, provider, compute, log, serialize,
+# total) in a Server-Timing response header, and optionally as one JSON line per request
+# on interviews_timing
+INTERVIEWS_SERVER_TIMING = env.bool("INTERVIEWS_SERVER_TIMING", default=True)
+INTERVIEWS_TIMING_LOG = env.bool("INTERVIEWS_TIMING_LOG", default=False)
+# Prometheus scrapes production on the gunicorn exporter port (INTERVIEWS_METRICS_PORT,
+# see config/gunicorn.py); /metrics on the app only answers these client addresses
+INTERVIEWS_METRICS_ALLOWED_IPS = env.list(
+    "INTERVIEWS_METRICS_ALLOWED_IPS",
+    default=["127.0.0.1", "::1"],
+)
+# Celery beat prewarms the availability of every template for the next BUSINESS_DAYS
+# business days every INTERVAL seconds (keep it below the availability cache TTL), in
+# chunks of CHUNK_SIZE templates, the most requested over the last POPULARITY_WINDOW
+# seconds first
+INTERVIEWS_PREWARM_BUSINESS_DAYS = env.int(
+    "INTERVIEWS_PREWARM_BUSINESS_DAYS",
+    default=10,
+)
+INTERVIEWS_PREWARM_INTERVAL = env.int("INTERVIEWS_PREWARM_INTERVAL", default=240)
+INTERVIEWS_PREWARM_CHUNK_SIZE = env.int("INTERVIEWS_PREWARM_CHUNK_SIZE", default=20)
+INTERVIEWS_PREWARM_POPULARITY_WINDOW = env.int(
+    "INTERVIEWS_PREWARM_POPULARITY_WINDOW",
+    default=3600,
+)
+CELERY_BEAT_SCHEDULE = {
+    "interviews-prewarm-availability": {
+        "task": "interviews.tasks.prewarm_availability",
+        "schedule": INTERVIEWS_PREWARM_INTERVAL,
+    },
+}
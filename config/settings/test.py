@@ -36,3 +36,7 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore[index]
 MEDIA_URL = "http://media.testserver/"
 # Your stuff...
 # ------------------------------------------------------------------------------
+# write the interviews log synchronously, the queue listener would outlive pytest's
+# output capture
+for logger_name in ("interviews_availability", "interviews_timing"):
+    LOGGING["loggers"][logger_name]["handlers"] = ["console", "interview_file"]  # noqa: F405
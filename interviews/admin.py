@@ -1,13 +1,33 @@
-from .models import Interviewer, InterviewTemplate
 from django.contrib import admin
 
+from .models import BusyBlock
+from .models import Interviewer
+from .models import InterviewerDayAvailability
+from .models import InterviewTemplate
+
+
 @admin.register(Interviewer)
 class InterviewerAdmin(admin.ModelAdmin):
-    list_display = ('id', 'first_name', 'last_name')
-    search_fields = ('first_name', 'last_name')
+    list_display = ("id", "first_name", "last_name")
+    search_fields = ("first_name", "last_name")
+
 
 @admin.register(InterviewTemplate)
 class InterviewTemplateAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'duration')
-    search_fields = ('name',)
-    filter_horizontal = ('interviewers',)
\ No newline at end of file
+    list_display = ("id", "name", "duration")
+    search_fields = ("name",)
+    filter_horizontal = ("interviewers",)
+
+
+@admin.register(BusyBlock)
+class BusyBlockAdmin(admin.ModelAdmin):
+    list_display = ("id", "interviewer", "calendar", "period")
+    list_filter = ("calendar",)
+    raw_id_fields = ("interviewer",)
+
+
+@admin.register(InterviewerDayAvailability)
+class InterviewerDayAvailabilityAdmin(admin.ModelAdmin):
+    list_display = ("id", "interviewer", "day", "free_bits")
+    list_filter = ("day",)
+    raw_id_fields = ("interviewer",)
@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class InterviewsConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'interviews'
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "interviews"
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import interviews.signals  # noqa: F401
@@ -0,0 +1,380 @@
+import hashlib
+import json
+from collections.abc import Iterator
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from functools import cache
+from math import ceil
+
+from django.conf import settings
+from django.utils.http import quote_etag
+
+from services.mock_availability import MockAvailabilityProvider
+from services.provider_client import HttpBusyDataProvider
+from services.providers import BusyDataProvider
+from services.providers import get_panel_busy_data
+
+from .cache import availability_cache
+from .cache import get_cached_free_masks
+from .coalescing import result_cache
+from .redis_bitmaps import get_bitmap_store
+from .redis_bitmaps import get_redis_panel_masks
+from .timing import phase
+from .timing import timed
+from .utils import apply_cutoff
+from .utils import calc_available_slots_with_date_range
+from .utils import calc_interview_starts_from_free_masks
+from .utils import get_default_cutoff
+from .utils import get_interview_slots_from_starts
+from .utils import get_interview_start_masks
+from .utils import iter_interview_slots_from_starts
+from .utils import log_busydata
+from .utils import log_interview_slots
+from .utils import parse_datetime
+
+# the provider window covers today and the following 6 days
+AVAILABILITY_WINDOW_DAYS = 7
+
+
+# the /availability window: today and the following days the provider covers
+def get_availability_window() -> tuple[date, date]:
+    start_date = datetime.now(UTC).date()
+    return start_date, start_date + timedelta(days=AVAILABILITY_WINDOW_DAYS - 1)
+
+
+# interviewer ids and names of a template's panel, from its roster
+def get_template_panel(template: dict) -> tuple[list[int], dict[int, str]]:
+    interviewer_ids = [interviewer["id"] for interviewer in template["interviewers"]]
+    interviewer_names = {
+        interviewer["id"]: interviewer["name"]
+        for interviewer in template["interviewers"]
+    }
+    return interviewer_ids, interviewer_names
+
+
+# the /availability panel: the template's plus interviewer 3, which that endpoint has
+# always included. The prewarm task builds it here too, so both land on the same cache
+# keys.
+def get_availability_panel(template: dict) -> tuple[list[int], dict[int, str]]:
+    interviewer_ids, interviewer_names = get_template_panel(template)
+    interviewer_ids.append(3)
+    return interviewer_ids, interviewer_names
+
+
+# Version stamp of everything an availability response depends on: the template and its
+# roster, each interviewer's busy data version (renewed whenever fresh busy data is
+# fetched, generation bumped by invalidate_interviewer), the range, the grid, the wire
+# format and the 24 hour cutoff rounded up to the grid, since slots only drop out when
+# it crosses a slot start. Cheap enough to check If-None-Match before any fetch or slot
+# computation. None while some interviewer's busy data is not in the cache, nothing can
+# be vouched for then.
+@timed("etag")
+def get_availability_etag(  # noqa: PLR0913
+    template: dict,
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    start_date: date,
+    end_date: date,
+    granularity: int,
+    wire_format: str = "json",
+) -> str | None:
+    versions = availability_cache.get_versions(interviewer_ids)
+    if None in versions.values():
+        return None
+    cutoff_slot = ceil(
+        get_default_cutoff().replace(tzinfo=UTC).timestamp() / (granularity * 60),
+    )
+    stamp = json.dumps(
+        [
+            template["id"],
+            template["name"],
+            template["duration"],
+            [
+                [
+                    interviewer_id,
+                    interviewer_names.get(interviewer_id, ""),
+                    versions[interviewer_id],
+                ]
+                for interviewer_id in interviewer_ids
+            ],
+            start_date.isoformat(),
+            end_date.isoformat(),
+            granularity,
+            cutoff_slot,
+            wire_format,
+        ],
+    )
+    return quote_etag(hashlib.sha1(stamp.encode(), usedforsecurity=False).hexdigest())
+
+
+# identical panel queries share one computation; the interviewers' busy data versions
+# are part of the key, so refetched busy data and invalidate_interviewer() also retire
+# the computed starts
+def get_panel_key(
+    interviewer_ids: list[int],
+    duration: int,
+    start_date,
+    end_date,
+    granularity: int,
+) -> str:
+    versions = availability_cache.get_versions(interviewer_ids)
+    panel = ",".join(
+        f"{interviewer_id}.{versions[interviewer_id]}"
+        for interviewer_id in sorted(versions)
+    )
+    window = f"{start_date.isoformat()}:{end_date.isoformat()}"
+    return f"starts:{window}:{duration}:{granularity}:{panel}"
+
+
+# one client per worker process, so its connection pool outlives the request
+@cache
+def get_http_provider(base_url: str) -> HttpBusyDataProvider:
+    return HttpBusyDataProvider(
+        base_url,
+        max_batch_size=settings.INTERVIEWS_PROVIDER_BATCH_SIZE,
+        pool_size=settings.INTERVIEWS_PROVIDER_POOL_SIZE,
+        timeout=settings.INTERVIEWS_PROVIDER_TIMEOUT,
+    )
+
+
+# days_to_deduct is a test scenario of the in-process mock, a real free/busy API and the
+# seeded synthetic calendars ignore it
+def get_provider(days_to_deduct: int = 0) -> BusyDataProvider:
+    if settings.INTERVIEWS_PROVIDER_URL:
+        return get_http_provider(settings.INTERVIEWS_PROVIDER_URL)
+    if settings.INTERVIEWS_MOCK_PROVIDER_SEED is not None:
+        from services.calendar_generator import CalendarGenerator  # needs numpy
+        from services.calendar_generator import (  # needs numpy
+            SyntheticAvailabilityProvider,
+        )
+
+        return SyntheticAvailabilityProvider(
+            CalendarGenerator(settings.INTERVIEWS_MOCK_PROVIDER_SEED),
+            settings.INTERVIEWS_MOCK_PROVIDER_LATENCY,
+        )
+    return MockAvailabilityProvider(
+        settings.INTERVIEWS_MOCK_PROVIDER_LATENCY,
+        days_to_deduct,
+    )
+
+
+# interview start bitmaps of a panel over [start_date, end_date]. Start bitmaps rather
+# than slot lists are what identical queries share, they are small and both wire formats
+# are built from them.
+def get_panel_start_masks(  # noqa: PLR0913
+    provider: BusyDataProvider,
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    duration: int,
+    start_date: date,
+    end_date: date,
+    granularity: int,
+) -> dict[date, int]:
+    def fetch_busy_data(missing_ids):
+        with phase("provider"):
+            busy_data = get_panel_busy_data(
+                provider,
+                missing_ids,
+                interviewer_names,
+                start_date,
+                end_date,
+                settings.INTERVIEWS_PROVIDER_TIMEOUT,
+            )
+        log_busydata(busy_data)
+        return busy_data
+
+    def compute_start_masks():
+        if settings.INTERVIEWS_BITMAP_STORE_URL:
+            # panel intersection in Redis, only the shared bitmaps come back
+            store = get_bitmap_store(settings.INTERVIEWS_BITMAP_STORE_URL)
+            shared_masks = get_redis_panel_masks(
+                store,
+                interviewer_ids,
+                start_date,
+                end_date,
+                fetch_busy_data,
+                granularity,
+            )
+            with phase("compute"):
+                return get_interview_start_masks(
+                    apply_cutoff(shared_masks, get_default_cutoff(), granularity),
+                    duration,
+                    granularity,
+                )
+        interviewers_free_masks = get_cached_free_masks(
+            interviewer_ids,
+            start_date,
+            end_date,
+            fetch_busy_data,
+            granularity,
+        )
+        with phase("compute"):
+            return calc_interview_starts_from_free_masks(
+                interviewers_free_masks,
+                duration,
+                granularity,
+            )
+
+    with phase("cache"):
+        return result_cache.get_or_compute(
+            get_panel_key(interviewer_ids, duration, start_date, end_date, granularity),
+            compute_start_masks,
+        )
+
+
+# interview start bitmaps for the /availability endpoint: the provider's window starting
+# today
+def get_availability_start_masks(
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    duration: int,
+    granularity: int,
+) -> dict[date, int]:
+    start_date, end_date = get_availability_window()
+    return get_panel_start_masks(
+        get_provider(),
+        interviewer_ids,
+        interviewer_names,
+        duration,
+        start_date,
+        end_date,
+        granularity,
+    )
+
+
+def get_availability_slots(
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    duration: int,
+    granularity: int,
+) -> list[dict[str, str]]:
+    start_masks = get_availability_start_masks(
+        interviewer_ids,
+        interviewer_names,
+        duration,
+        granularity,
+    )
+    with phase("compute"):
+        interview_slots = get_interview_slots_from_starts(
+            start_masks,
+            duration,
+            granularity,
+        )
+    log_interview_slots(interview_slots, duration)
+    return interview_slots
+
+
+# interview start bitmaps for /availability_date_range
+def get_date_range_start_masks(  # noqa: PLR0913
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    duration: int,
+    start_date_str: str,
+    end_date_str: str,
+    granularity: int,
+) -> dict[date, int]:
+    start_date = parse_datetime(start_date_str).date()
+    end_date = parse_datetime(end_date_str).date()
+    # pass 2 for days to deduct: busy data only generate for end_date -2
+    #    To verify that interviewers will have open schedules prior to end date
+    provider = get_provider(days_to_deduct=2)
+    return get_panel_start_masks(
+        provider,
+        interviewer_ids,
+        interviewer_names,
+        duration,
+        start_date,
+        end_date,
+        granularity,
+    )
+
+
+# interview slots for /availability_date_range; the numpy engine works on the raw busy
+# data of the whole range at once so it bypasses the per-interviewer bitmap cache
+def get_date_range_slots(  # noqa: PLR0913
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    duration: int,
+    start_date_str: str,
+    end_date_str: str,
+    granularity: int,
+) -> list[dict[str, str]]:
+    if settings.INTERVIEWS_AVAILABILITY_ENGINE == "numpy":
+        start_date = parse_datetime(start_date_str).date()
+        end_date = parse_datetime(end_date_str).date()
+        with phase("provider"):
+            busy_data = get_panel_busy_data(
+                get_provider(days_to_deduct=2),
+                interviewer_ids,
+                interviewer_names,
+                start_date,
+                end_date,
+                settings.INTERVIEWS_PROVIDER_TIMEOUT,
+            )
+        log_busydata(busy_data)
+        availability_cache.bump_versions(
+            interviewer_ids,
+        )  # every request sees fresh busy data here
+        with phase("compute"):
+            return calc_available_slots_with_date_range(
+                busy_data,
+                interviewer_ids,
+                duration,
+                start_date_str,
+                end_date_str,
+                "numpy",
+                granularity,
+            )
+
+    start_masks = get_date_range_start_masks(
+        interviewer_ids,
+        interviewer_names,
+        duration,
+        start_date_str,
+        end_date_str,
+        granularity,
+    )
+    with phase("compute"):
+        interview_slots = get_interview_slots_from_starts(
+            start_masks,
+            duration,
+            granularity,
+        )
+    log_interview_slots(interview_slots, duration)
+    return interview_slots
+
+
+# Streaming version of get_date_range_slots: the range is processed in windows of
+# INTERVIEWS_STREAM_CHUNK_DAYS, each window is fetched, computed (and cached/coalesced)
+# on its own and its slots are yielded day by day, so memory and time to first byte do
+# not grow with the range. Always uses the bitmask engine.
+def iter_date_range_slots(  # noqa: PLR0913
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    duration: int,
+    start_date_str: str,
+    end_date_str: str,
+    granularity: int,
+) -> Iterator[list[dict[str, str]]]:
+    start_date = parse_datetime(start_date_str).date()
+    end_date = parse_datetime(end_date_str).date()
+    chunk_days = settings.INTERVIEWS_STREAM_CHUNK_DAYS
+
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        # the mock's open days before end_date only apply to the window holding end_date
+        provider = get_provider(days_to_deduct=2 if chunk_end == end_date else 0)
+        start_masks = get_panel_start_masks(
+            provider,
+            interviewer_ids,
+            interviewer_names,
+            duration,
+            chunk_start,
+            chunk_end,
+            granularity,
+        )
+        yield from iter_interview_slots_from_starts(start_masks, duration, granularity)
+        chunk_start = chunk_end + timedelta(days=1)
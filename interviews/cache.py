@@ -0,0 +1,283 @@
+import threading
+import time as clock
+from collections import OrderedDict
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .intervals import normalize_busy_data
+from .metrics import record_cache
+from .timing import phase
+from .utils import SATURDAY
+from .utils import SLOT_MINUTES
+from .utils import date_range
+from .utils import get_range_free_masks
+
+
+class LRUCache:
+    """Thread-safe LRU with a per-entry TTL, one instance per worker process."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys) -> dict:
+        now = clock.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at <= now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, mapping: dict):
+        expires_at = clock.monotonic() + self.ttl
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class AvailabilityCache:
+    """
+    Free bitmaps per (interviewer, day, granularity), before the 24 hour cutoff.
+
+    Reads go to the in-process LRU first and then to the shared Django cache (Redis in
+    production). Every key embeds the interviewer's generation number, so invalidating
+    an interviewer is a single counter bump that orphans all of their entries at once.
+    Other workers see the bump once their local copy of the generation expires (local
+    TTL).
+
+    Next to the generation every interviewer has a version, renewed whenever fresh busy
+    data is written and expiring with the bitmaps. Generation and version together stamp
+    the busy data a response was computed from (ETags, panel results) without orphaning
+    the bitmaps of other windows and grids the way a generation bump would.
+    """
+
+    prefix = "interviews:free"
+
+    def __init__(
+        self,
+        cache_alias: str = "default",
+        ttl: int = 300,
+        local_ttl: float = 30,
+        local_maxsize: int = 10000,
+    ):
+        self.cache_alias = cache_alias
+        self.ttl = ttl
+        self.local = LRUCache(local_maxsize, local_ttl)
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    def generation_key(self, interviewer_id: int) -> str:
+        return f"{self.prefix}:gen:{interviewer_id}"
+
+    def version_key(self, interviewer_id: int) -> str:
+        return f"{self.prefix}:version:{interviewer_id}"
+
+    def mask_key(
+        self,
+        interviewer_id: int,
+        generation: int,
+        day: date,
+        granularity: int,
+    ) -> str:
+        day_key = f"{day.isoformat()}:{granularity}"
+        return f"{self.prefix}:{interviewer_id}:{generation}:{day_key}"
+
+    def _get_many(self, keys: list[str]) -> dict:
+        found = self.local.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            shared_found = self.shared.get_many(missing)
+            self.local.set_many(shared_found)
+            found.update(shared_found)
+        return found
+
+    def get_generations(self, interviewer_ids) -> dict[int, int]:
+        keys = {
+            self.generation_key(interviewer_id): interviewer_id
+            for interviewer_id in interviewer_ids
+        }
+        found = self._get_many(list(keys))
+        return {
+            interviewer_id: found.get(key, 0) for key, interviewer_id in keys.items()
+        }
+
+    # "<generation>.<version>" per interviewer, None when no fresh busy data is known
+    # (the version expired with the bitmaps or was never written)
+    def get_versions(self, interviewer_ids) -> dict[int, str | None]:
+        keys = {
+            interviewer_id: (
+                self.generation_key(interviewer_id),
+                self.version_key(interviewer_id),
+            )
+            for interviewer_id in interviewer_ids
+        }
+        found = self._get_many([key for pair in keys.values() for key in pair])
+        return {
+            interviewer_id: f"{found.get(generation_key, 0)}.{found[version_key]}"
+            if version_key in found
+            else None
+            for interviewer_id, (generation_key, version_key) in keys.items()
+        }
+
+    # called after fresh busy data of these interviewers was fetched
+    def bump_versions(self, interviewer_ids):
+        version = clock.time_ns()
+        entries = {
+            self.version_key(interviewer_id): version
+            for interviewer_id in interviewer_ids
+        }
+        self.shared.set_many(entries, self.ttl)
+        self.local.set_many(entries)
+
+    # cached bitmaps for every interviewer whose days are all present, the rest are left
+    # out
+    def get_masks(
+        self,
+        interviewer_ids,
+        days: list[date],
+        granularity: int = SLOT_MINUTES,
+        generations: dict[int, int] | None = None,
+    ) -> dict[int, dict[date, int]]:
+        if generations is None:
+            generations = self.get_generations(interviewer_ids)
+        keys = {
+            self.mask_key(interviewer_id, generation, day, granularity): (
+                interviewer_id,
+                day,
+            )
+            for interviewer_id, generation in generations.items()
+            for day in days
+        }
+        found = self._get_many(list(keys))
+
+        interviewers_masks = {}
+        for key, (interviewer_id, day) in keys.items():
+            if key in found:
+                interviewers_masks.setdefault(interviewer_id, {})[day] = found[key]
+        return {
+            interviewer_id: masks
+            for interviewer_id, masks in interviewers_masks.items()
+            if len(masks) == len(days)
+        }
+
+    def set_masks(
+        self,
+        interviewer_id: int,
+        masks: dict[date, int],
+        granularity: int = SLOT_MINUTES,
+        generation: int | None = None,
+    ):
+        if generation is None:
+            generation = self.get_generations([interviewer_id])[interviewer_id]
+        entries = {
+            self.mask_key(interviewer_id, generation, day, granularity): mask
+            for day, mask in masks.items()
+        }
+        self.shared.set_many(entries, self.ttl)
+        self.local.set_many(entries)
+
+    # invalidation hook: call whenever an interviewer's busy data may have changed
+    def invalidate(self, interviewer_id: int):
+        key = self.generation_key(interviewer_id)
+        self.shared.add(key, 0, None)
+        self.shared.incr(key)
+        self.local.delete_many([key])
+
+    def clear_local(self):
+        self.local.clear()
+
+
+availability_cache = AvailabilityCache(
+    ttl=getattr(settings, "INTERVIEWS_AVAILABILITY_CACHE_TTL", 300),
+    local_ttl=getattr(settings, "INTERVIEWS_AVAILABILITY_LOCAL_CACHE_TTL", 30),
+    local_maxsize=getattr(settings, "INTERVIEWS_AVAILABILITY_LOCAL_CACHE_SIZE", 10000),
+)
+
+
+def invalidate_interviewer(interviewer_id: int):
+    availability_cache.invalidate(interviewer_id)
+
+
+# free bitmaps for each interviewer over [start_date, end_date], only interviewers
+# missing from the cache are passed to fetch_busy_data (a callable taking a list of ids
+# and returning busy data)
+def get_cached_free_masks(
+    interviewer_ids: list[int],
+    start_date: date,
+    end_date: date,
+    fetch_busy_data,
+    granularity: int = SLOT_MINUTES,
+) -> dict[int, dict[date, int]]:
+    interviewer_ids = list(dict.fromkeys(interviewer_ids))
+    days = [day for day in date_range(start_date, end_date) if day.weekday() < SATURDAY]
+    if not days:
+        return {interviewer_id: {} for interviewer_id in interviewer_ids}
+    generations = availability_cache.get_generations(interviewer_ids)
+    interviewers_masks = availability_cache.get_masks(
+        interviewer_ids,
+        days,
+        granularity,
+        generations,
+    )
+
+    missing_ids = [
+        interviewer_id
+        for interviewer_id in interviewer_ids
+        if interviewer_id not in interviewers_masks
+    ]
+    record_cache(
+        "masks",
+        hits=len(interviewer_ids) - len(missing_ids),
+        misses=len(missing_ids),
+    )
+    if missing_ids:
+        busy_data = fetch_busy_data(missing_ids)
+        with phase("compute"):
+            normalized_busy = normalize_busy_data(busy_data)
+            for interviewer_id in missing_ids:
+                masks = get_range_free_masks(
+                    normalized_busy.get(interviewer_id, []),
+                    start_date,
+                    end_date,
+                    granularity,
+                )
+                availability_cache.set_masks(
+                    interviewer_id,
+                    masks,
+                    granularity,
+                    generations[interviewer_id],
+                )
+                interviewers_masks[interviewer_id] = masks
+        availability_cache.bump_versions(missing_ids)
+
+    # keep the caller's interviewer order
+    return {
+        interviewer_id: interviewers_masks[interviewer_id]
+        for interviewer_id in interviewer_ids
+    }
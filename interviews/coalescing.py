@@ -0,0 +1,151 @@
+import math
+import random
+import threading
+import time as clock
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import record_cache
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Concurrent calls for one key in a process share the first caller's result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: str, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class CoalescedCache:
+    """
+    Computed results shared across workers via the Django cache (Redis in production).
+
+    Within a worker identical in-flight lookups go through one SingleFlight call. Across
+    workers a short lock (cache.add, SET NX in Redis) lets a single worker compute a
+    missing key while the others poll for its result. Entries are refreshed early with
+    probability growing as they approach expiry (XFetch: recompute when
+    now - delta * beta * log(rand) >= expiry, delta being how long the last computation
+    took), so hot keys are recomputed by one request before they expire instead of by
+    every request after. Stale values are served while someone refreshes.
+    """
+
+    prefix = "interviews:result"
+
+    def __init__(
+        self,
+        cache_alias: str = "default",
+        ttl: int = 30,
+        lock_timeout: float = 10,
+        beta: float = 1.0,
+        poll_interval: float = 0.05,
+    ):
+        self.cache_alias = cache_alias
+        self.ttl = ttl
+        # lock expiry and how long waiters poll before computing themselves
+        self.lock_timeout = lock_timeout
+        self.beta = beta  # > 1 refreshes earlier, < 1 later
+        self.poll_interval = poll_interval
+        self.single_flight = SingleFlight()
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    # the draw only spreads refreshes out, it does not need a cryptographic generator
+    def should_refresh(self, entry: dict) -> bool:
+        rand = 1 - random.random()  # noqa: S311
+        return (
+            clock.time() - entry["delta"] * self.beta * math.log(rand)
+            >= entry["expires_at"]
+        )
+
+    def get_or_compute(self, key: str, compute):
+        return self.single_flight.do(key, lambda: self._get_or_compute(key, compute))
+
+    def _get_or_compute(self, key: str, compute):
+        entry_key = f"{self.prefix}:{key}"
+        lock_key = f"{self.prefix}:lock:{key}"
+        entry = self.shared.get(entry_key)
+        if entry is not None and not self.should_refresh(entry):
+            record_cache("result", hits=1)
+            return entry["value"]
+
+        token = uuid.uuid4().hex
+        if not self.shared.add(lock_key, token, math.ceil(self.lock_timeout)):
+            if entry is not None:
+                record_cache("result", hits=1)
+                return entry[
+                    "value"
+                ]  # another worker is refreshing, the current value is still valid
+            entry = self._wait_for(entry_key, lock_key)
+            if entry is not None:
+                record_cache("result", hits=1)
+                return entry["value"]
+            # the lock holder died or is too slow, compute without the lock
+
+        record_cache("result", misses=1)
+        try:
+            started = clock.monotonic()
+            value = compute()
+            delta = clock.monotonic() - started
+            self.shared.set(
+                entry_key,
+                {"value": value, "delta": delta, "expires_at": clock.time() + self.ttl},
+                self.ttl,
+            )
+        finally:
+            # not atomic, but a lock that outlived lock_timeout only costs one extra
+            # computation
+            if self.shared.get(lock_key) == token:
+                self.shared.delete(lock_key)
+        return value
+
+    def _wait_for(self, entry_key: str, lock_key: str) -> dict | None:
+        deadline = clock.monotonic() + self.lock_timeout
+        while clock.monotonic() < deadline:
+            clock.sleep(self.poll_interval)
+            entry = self.shared.get(entry_key)
+            if entry is not None:
+                return entry
+            if self.shared.get(lock_key) is None:
+                return self.shared.get(entry_key)
+        return None
+
+
+result_cache = CoalescedCache(
+    ttl=getattr(settings, "INTERVIEWS_AVAILABILITY_RESULT_TTL", 30),
+    lock_timeout=getattr(settings, "INTERVIEWS_AVAILABILITY_LOCK_TIMEOUT", 10),
+)
@@ -0,0 +1,70 @@
+import heapq
+from bisect import bisect_left
+from bisect import bisect_right
+from datetime import datetime
+
+BusyInterval = tuple[datetime, datetime]
+
+
+def parse_busy_blocks(busy_slots: list[dict[str, str]]) -> list[BusyInterval]:
+    # providers return calendars sorted by start already, so this sort is a linear pass
+    # in practice
+    return sorted(
+        (
+            datetime.fromisoformat(slot["start"].rstrip("Z")),
+            datetime.fromisoformat(slot["end"].rstrip("Z")),
+        )
+        for slot in busy_slots
+    )
+
+
+# k-way merge of sorted calendars through a heap, coalescing overlapping and adjacent
+# blocks on the way, so the result is the minimal sorted list of disjoint busy intervals
+def merge_calendars(calendars: list[list[dict[str, str]]]) -> list[BusyInterval]:
+    merged = []
+    for start, end in heapq.merge(
+        *(parse_busy_blocks(calendar) for calendar in calendars),
+    ):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+# an interviewer entry carries its "busy" list and optionally one busy list per extra
+# source calendar
+def get_calendars(interviewer: dict) -> list[list[dict[str, str]]]:
+    return [interviewer.get("busy", []), *interviewer.get("calendars", [])]
+
+
+# canonical busy data: one sorted, coalesced interval list per interviewer, repeated
+# entries for the same interviewer are treated as additional calendars
+def normalize_busy_data(busy_data: list[dict]) -> dict[int, list[BusyInterval]]:
+    calendars = {}
+    for item in busy_data:
+        calendars.setdefault(item["interviewerId"], []).extend(get_calendars(item))
+    return {
+        interviewer_id: merge_calendars(cals)
+        for interviewer_id, cals in calendars.items()
+    }
+
+
+# the intervals are sorted and disjoint, so both starts and ends are sorted and the
+# blocks touching [window_start, window_end) can be found with two binary searches
+def busy_between(
+    intervals: list[BusyInterval],
+    window_start: datetime,
+    window_end: datetime,
+) -> list[BusyInterval]:
+    first = bisect_right(intervals, window_start, key=lambda interval: interval[1])
+    last = bisect_left(
+        intervals,
+        window_end,
+        lo=first,
+        key=lambda interval: interval[0],
+    )
+    return intervals[first:last]
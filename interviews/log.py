@@ -0,0 +1,91 @@
+import atexit
+import logging
+import random
+import threading
+from contextvars import ContextVar
+from logging.handlers import QueueHandler
+
+from django.conf import settings
+
+# whether DEBUG records of the current request are kept, requests outside the sampling
+# middleware (management commands, shells, tests) are always sampled
+_debug_sampled = ContextVar("interviews_debug_sampled", default=True)
+
+
+def is_debug_sampled() -> bool:
+    return _debug_sampled.get()
+
+
+# gate for debug dumps: only build them when the logger will write them for this request
+def debug_enabled(logger: logging.Logger) -> bool:
+    return logger.isEnabledFor(logging.DEBUG) and is_debug_sampled()
+
+
+class lazy_message:  # noqa: N801 -- passed around like a function call
+    """Log argument built only when the record is formatted, on the listener thread."""
+
+    def __init__(self, fn, *args, **kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.fn(*self.args, **self.kwargs))
+
+
+class SampledDebugFilter(logging.Filter):
+    """Drops DEBUG records of requests left out by DebugLogSamplingMiddleware."""
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or is_debug_sampled()
+
+
+class DebugLogSamplingMiddleware:
+    """Keeps the DEBUG logs of INTERVIEWS_DEBUG_LOG_SAMPLE_RATE of the requests."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # sampling, not security: the module level generator is fine
+        sampled = random.random() < settings.INTERVIEWS_DEBUG_LOG_SAMPLE_RATE  # noqa: S311
+        token = _debug_sampled.set(sampled)
+        try:
+            return self.get_response(request)
+        finally:
+            _debug_sampled.reset(token)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler for dictConfig ("handlers" lists the handlers the listener writes to).
+
+    Records are queued as they are, so message formatting (and any lazy_message) runs on
+    the listener thread together with the disk writes instead of on the request thread.
+    dictConfig does not start the listener, so it is started by the first record and
+    stopped at exit, which also flushes whatever is still queued.
+    """
+
+    _start_lock = threading.Lock()
+
+    def prepare(self, record):
+        return record
+
+    def emit(self, record):
+        if not getattr(self, "_listener_started", False):
+            self.start_listener()
+        super().emit(record)
+
+    def start_listener(self):
+        with self._start_lock:
+            if getattr(self, "_listener_started", False) or self.listener is None:
+                return
+            self.listener.start()
+            atexit.register(self.stop_listener)
+            self._listener_started = True
+
+    def stop_listener(self):
+        with self._start_lock:
+            if getattr(self, "_listener_started", False):
+                self.listener.stop()
+                self._listener_started = False
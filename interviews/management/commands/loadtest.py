@@ -0,0 +1,431 @@
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from http import HTTPStatus
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from interviews.models import InterviewTemplate
+from services.mock_availability import MockFreeBusyServer
+
+
+# "1:3,2:1" -> {1: 3.0, 2: 1.0}, an entry without a weight counts once
+def parse_weights(value: str) -> dict[int, float]:
+    weights = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        key, _, weight = entry.partition(":")
+        try:
+            weights[int(key)] = float(weight or 1)
+        except ValueError as exc:
+            msg = f"Invalid weight entry {entry!r}, expected <int>[:<weight>]"
+            raise CommandError(msg) from exc
+        if weights[int(key)] <= 0:
+            msg = f"Weight of {key} must be positive"
+            raise CommandError(msg)
+    if not weights:
+        msg = f"No entries in {value!r}"
+        raise CommandError(msg)
+    return weights
+
+
+# nearest rank percentile of an already sorted list
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def is_error(status) -> bool:
+    if not isinstance(status, int):
+        return True  # the request failed before a response came back
+    return not (
+        HTTPStatus.OK <= status < HTTPStatus.MULTIPLE_CHOICES
+        or status == HTTPStatus.NOT_MODIFIED
+    )
+
+
+def summarize(latencies: list[float], statuses: list, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    errors = sum(is_error(status) for status in statuses)
+    return {
+        "requests": len(statuses),
+        "errors": errors,
+        "errorRate": errors / len(statuses) if statuses else 0.0,
+        "throughput": (len(statuses) - errors) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50) * 1000,
+        "p90": percentile(latencies, 90) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "max": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+# Open loop load generator: request i is due at start + i / rps whatever happened to the
+# ones before it, and its latency is measured from that due time, so a stalled server
+# shows up in the percentiles instead of silently lowering the request rate (coordinated
+# omission).
+class LoadRun:
+    def __init__(  # noqa: PLR0913
+        self,
+        base_url: str,
+        templates: dict[int, float],
+        ranges: dict[int, float],
+        horizon: int,
+        seed: int,
+        timeout: float,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.templates = templates
+        self.ranges = ranges
+        self.horizon = horizon
+        self.rng = random.Random(seed)  # noqa: S311 -- a reproducible mix, not a secret
+        self.timeout = timeout
+        self.local = threading.local()
+        # (label, status, latency in seconds), list.append is thread safe
+        self.results = []
+
+    # (label, method, path, json body) of the next request in the weighted mix; range
+    # length 0 is the GET availability endpoint, N a POST availability_date_range over N
+    # days
+    def next_request(self) -> tuple[str, str, str, dict | None]:
+        template_id = self.rng.choices(
+            list(self.templates),
+            weights=list(self.templates.values()),
+        )[0]
+        days = self.rng.choices(
+            list(self.ranges),
+            weights=list(self.ranges.values()),
+        )[0]
+        if not days:
+            return (
+                "availability",
+                "GET",
+                f"/api/interviews/{template_id}/availability/",
+                None,
+            )
+        start = datetime.now(UTC).date() + timedelta(
+            days=2 + self.rng.randrange(self.horizon),
+        )
+        end = start + timedelta(days=days - 1)
+        body = {
+            "templateId": template_id,
+            "startDate": f"{start}T00:00:00Z",
+            "endDate": f"{end}T23:59:59Z",
+        }
+        return (
+            f"range {days}d",
+            "POST",
+            "/api/interviews/availability_date_range/",
+            body,
+        )
+
+    def send(self, label: str, method: str, path: str, body: dict | None, due: float):
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        try:
+            response = session.request(
+                method,
+                self.base_url + path,
+                json=body,
+                timeout=self.timeout,
+            )
+            status = response.status_code
+        except requests.RequestException as exc:
+            status = type(exc).__name__
+        self.results.append((label, status, time.perf_counter() - due))
+
+    def run(self, rps: float, duration: float, concurrency: int) -> float:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for index in range(int(rps * duration)):
+                due = start + index / rps
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self.send, *self.next_request(), due)
+        return time.perf_counter() - start
+
+    def report(self, elapsed: float) -> dict:
+        by_label = defaultdict(lambda: ([], []))
+        for label, status, latency in self.results:
+            for key in (label, "all"):
+                by_label[key][0].append(latency)
+                by_label[key][1].append(status)
+        return {
+            "elapsed": elapsed,
+            "statuses": {
+                str(status): count
+                for status, count in Counter(
+                    status for _, status, _ in self.results
+                ).most_common()
+            },
+            "endpoints": {
+                label: summarize(latencies, statuses, elapsed)
+                for label, (latencies, statuses) in sorted(by_label.items())
+            },
+        }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays a weighted mix of availability requests at a target rate and reports "
+        "latency percentiles, throughput and errors"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            help=(
+                "Base URL of a running server; without it one is started on a free "
+                "local port"
+            ),
+        )
+        parser.add_argument(
+            "--server",
+            choices=["runserver", "gunicorn"],
+            default="runserver",
+            help="Server to start when --url is not given",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="gunicorn worker processes",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Mock provider latency in seconds (started servers only)",
+        )
+        parser.add_argument(
+            "--batched-provider",
+            action="store_true",
+            help=(
+                "Serve busy data from the local batched free/busy mock instead of the "
+                "in-process one"
+            ),
+        )
+        parser.add_argument(
+            "--calendar-seed",
+            type=int,
+            help=(
+                "Serve deterministic synthetic calendars generated from this seed "
+                "(started servers only)"
+            ),
+        )
+        parser.add_argument(
+            "--rps",
+            type=float,
+            default=20.0,
+            help="Target requests per second",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=30.0,
+            help="Seconds to generate load for",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=64,
+            help="Maximum requests in flight",
+        )
+        parser.add_argument(
+            "--templates",
+            help=(
+                "Weighted template ids, e.g. 1:3,2:1 (default: every template, equally)"
+            ),
+        )
+        parser.add_argument(
+            "--ranges",
+            default="0:4,7:2,30:1",
+            help="Weighted range lengths in days, 0 is the GET availability endpoint",
+        )
+        parser.add_argument(
+            "--horizon",
+            type=int,
+            default=28,
+            help="Date range starts are spread over this many days",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed for the request mix",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=30.0,
+            help="Per request timeout in seconds",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the report as JSON",
+        )
+
+    def handle(self, *args, **options):
+        if options["rps"] <= 0 or options["duration"] <= 0:
+            msg = "--rps and --duration must be positive"
+            raise CommandError(msg)
+        if options["templates"]:
+            templates = parse_weights(options["templates"])
+        else:
+            templates = dict.fromkeys(
+                InterviewTemplate.objects.values_list("id", flat=True),
+                1.0,
+            )
+            if not templates:
+                msg = (
+                    "No interview templates, run load_interviewers first or pass "
+                    "--templates"
+                )
+                raise CommandError(msg)
+
+        provider = process = None
+        base_url = options["url"]
+        try:
+            if base_url is None:
+                env = {
+                    **os.environ,
+                    "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+                    "INTERVIEWS_MOCK_PROVIDER_LATENCY": str(options["latency"]),
+                }
+                if options["calendar_seed"] is not None:
+                    env["INTERVIEWS_MOCK_PROVIDER_SEED"] = str(options["calendar_seed"])
+                if options["batched_provider"]:
+                    provider = MockFreeBusyServer(latency=options["latency"]).start()
+                    env["INTERVIEWS_PROVIDER_URL"] = provider.url
+                base_url, process = self.start_server(
+                    options["server"],
+                    options["workers"],
+                    env,
+                )
+
+            run = LoadRun(
+                base_url,
+                templates,
+                parse_weights(options["ranges"]),
+                max(1, options["horizon"]),
+                options["seed"],
+                options["timeout"],
+            )
+            # warm up the connection and the worker
+            run.send(*run.next_request(), time.perf_counter())
+            run.results.clear()
+            elapsed = run.run(
+                options["rps"],
+                options["duration"],
+                options["concurrency"],
+            )
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=10)
+            if provider is not None:
+                provider.stop()
+
+        report = run.report(elapsed)
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.write_report(report, options["rps"])
+
+    def start_server(
+        self,
+        server: str,
+        workers: int,
+        env: dict,
+    ) -> tuple[str, subprocess.Popen]:
+        port = free_port()
+        if server == "gunicorn":
+            command = [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "config.wsgi",
+                "--bind",
+                f"127.0.0.1:{port}",
+                "--workers",
+                str(workers),
+                "--threads",
+                "4",
+            ]
+        else:
+            command = [
+                sys.executable,
+                "manage.py",
+                "runserver",
+                f"127.0.0.1:{port}",
+                "--noreload",
+            ]
+        # the command line is built above from the interpreter and fixed arguments
+        process = subprocess.Popen(  # noqa: S603
+            command,
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                msg = f"{server} exited with status {process.returncode}"
+                raise CommandError(msg)
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            except OSError:
+                time.sleep(0.1)
+            else:
+                return f"http://127.0.0.1:{port}", process
+        process.terminate()
+        msg = f"{server} did not start listening on port {port}"
+        raise CommandError(msg)
+
+    def write_report(self, report: dict, rps: float):
+        requests_sent = report["endpoints"]["all"]["requests"]
+        self.stdout.write(
+            f"{requests_sent} requests in {report['elapsed']:.1f}s "
+            f"(target {rps:g} rps)",
+        )
+        self.stdout.write(
+            f"{'endpoint':<14}{'requests':>9}{'errors':>8}{'rps':>8}"
+            f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}",
+        )
+        for label, stats in report["endpoints"].items():
+            self.stdout.write(
+                f"{label:<14}{stats['requests']:>9}{stats['errorRate']:>8.1%}"
+                f"{stats['throughput']:>8.1f}{stats['p50']:>9.1f}{stats['p90']:>9.1f}"
+                f"{stats['p99']:>9.1f}{stats['max']:>9.1f}",
+            )
+        self.stdout.write(
+            "status codes: "
+            + ", ".join(
+                f"{status}={count}" for status, count in report["statuses"].items()
+            ),
+        )
@@ -0,0 +1,167 @@
+import os
+from time import perf_counter
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.http import HttpResponseNotFound
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Histogram
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+
+from .timing import get_request_timings
+
+# Prometheus metrics for the availability endpoints. Under gunicorn every worker writes
+# its samples to PROMETHEUS_MULTIPROC_DIR (set by compose/production/django/start) and
+# config/gunicorn.py serves them merged on an internal port (INTERVIEWS_METRICS_PORT),
+# away from the public URLconf. /metrics only answers INTERVIEWS_METRICS_ALLOWED_IPS
+# (loopback by default, for runserver); without the multiprocess variable the worker's
+# own registry is exposed. Labels are the DRF url names, a bounded set.
+
+FAST_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+REQUEST_SECONDS = Histogram(
+    "interviews_request_seconds",
+    "Time to the response headers",
+    ["endpoint"],
+    buckets=FAST_BUCKETS,
+)
+PROVIDER_SECONDS = Histogram(
+    "interviews_provider_fetch_seconds",
+    "Busy data fetch time per request",
+    ["endpoint"],
+    buckets=FAST_BUCKETS,
+)
+COMPUTE_SECONDS = Histogram(
+    "interviews_slot_compute_seconds",
+    "Slot engine time per request",
+    ["endpoint"],
+    buckets=FAST_BUCKETS,
+)
+SERIALIZE_SECONDS = Histogram(
+    "interviews_serialize_seconds",
+    "Response encoding time per request",
+    ["endpoint"],
+    buckets=FAST_BUCKETS,
+)
+RESPONSE_BYTES = Histogram(
+    "interviews_response_bytes",
+    "Response body size (streamed responses excluded)",
+    ["endpoint"],
+    buckets=tuple(256 * 4**i for i in range(9)),
+)
+
+SLOTS_RETURNED = Histogram(
+    "interviews_slots_returned",
+    "Interview slots in a response",
+    ["endpoint"],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+PANEL_SIZE = Histogram(
+    "interviews_panel_size",
+    "Interviewers on the requested panel",
+    ["endpoint"],
+    buckets=(1, 2, 3, 4, 5, 8, 10, 15, 20, 30, 50),
+)
+RANGE_DAYS = Histogram(
+    "interviews_date_range_days",
+    "Days in the requested range",
+    ["endpoint"],
+    buckets=(1, 7, 14, 31, 62, 92, 183, 366, 731),
+)
+
+CACHE_REQUESTS = Counter(
+    "interviews_cache_requests",
+    "Cache lookups by cache (roster, result, masks) and result (hit, miss)",
+    ["cache", "result"],
+)
+
+PHASE_HISTOGRAMS = {
+    "provider": PROVIDER_SECONDS,
+    "compute": COMPUTE_SECONDS,
+    "serialize": SERIALIZE_SECONDS,
+}
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0):
+    if hits:
+        CACHE_REQUESTS.labels(cache, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache, "miss").inc(misses)
+
+
+def get_endpoint(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.url_name or "unnamed"
+
+
+# request shape of an availability response; slots is None for streamed responses
+def observe_availability(
+    request,
+    panel_size: int,
+    range_days: int,
+    slots: int | None = None,
+):
+    endpoint = get_endpoint(request)
+    PANEL_SIZE.labels(endpoint).observe(panel_size)
+    RANGE_DAYS.labels(endpoint).observe(range_days)
+    if slots is not None:
+        SLOTS_RETURNED.labels(endpoint).observe(slots)
+
+
+class MetricsMiddleware:
+    """
+    Request latency, response size and the provider/compute/serialize phases.
+
+    The phases come from the timings interviews.timing records for the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = perf_counter()
+        response = self.get_response(request)
+        endpoint = get_endpoint(request)
+        REQUEST_SECONDS.labels(endpoint).observe(perf_counter() - start)
+
+        timings = get_request_timings()
+        if timings is not None:
+            for name, histogram in PHASE_HISTOGRAMS.items():
+                if name in timings.phases:
+                    histogram.labels(endpoint).observe(timings.phases[name])
+        if not response.streaming:
+            RESPONSE_BYTES.labels(endpoint).observe(len(response.content))
+        return response
+
+
+# per template request counts and latencies are not public, anyone else gets a 404
+def metrics_view(request):
+    if request.META.get("REMOTE_ADDR") not in settings.INTERVIEWS_METRICS_ALLOWED_IPS:
+        return HttpResponseNotFound()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.8 on 2026-10-18 17:28
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusyBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('calendar', models.CharField(max_length=255)),
+                ('period', django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+                ('interviewer', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='busy_blocks', to='interviews.interviewer')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GistIndex(fields=['period'], name='busyblock_period_gist'), models.Index(models.F('interviewer'), django.contrib.postgres.fields.ranges.RangeStartsWith('period'), name='busyblock_interviewer_start')],
+            },
+        ),
+    ]
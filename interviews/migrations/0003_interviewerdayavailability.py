@@ -0,0 +1,26 @@
+# Generated by Django 5.1.8 on 2026-10-18 17:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0002_busyblock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewerDayAvailability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('free_bits', models.BigIntegerField()),
+                ('interviewer', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='day_availability', to='interviews.interviewer')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('interviewer', 'day'), name='interviewerdayavailability_interviewer_day')],
+            },
+        ),
+    ]
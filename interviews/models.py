@@ -1,19 +1,401 @@
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+
+from django.contrib.postgres.aggregates import BitAnd
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.fields.ranges import RangeStartsWith
+from django.contrib.postgres.indexes import GistIndex
+from django.db import connections
 from django.db import models
-import uuid
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models import F
+
+from .intervals import normalize_busy_data
+from .utils import SLOT_MINUTES
+from .utils import WORK_WINDOW
+from .utils import apply_cutoff
+from .utils import get_default_cutoff
+from .utils import get_interview_slots_from_starts
+from .utils import get_interview_start_masks
+from .utils import get_range_free_masks
+from .utils import get_slots_needed
+from .utils import validate_granularity
+
 
 class Interviewer(models.Model):
-    #id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     first_name = models.CharField(max_length=32)
     last_name = models.CharField(max_length=32)
-    
+
     def __str__(self):
         return f"{self.id}: {self.first_name} {self.last_name}"
 
+
 class InterviewTemplate(models.Model):
-    #id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    name = models.CharField(max_length=64)   # name of interview
-    duration = models.PositiveIntegerField() # minutes
-    interviewers = models.ManyToManyField(Interviewer, related_name='interview_templates')
-    
+    # id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=64)  # name of interview
+    duration = models.PositiveIntegerField()  # minutes
+    interviewers = models.ManyToManyField(
+        Interviewer,
+        related_name="interview_templates",
+    )
+
+    def __str__(self):
+        return f"{self.id}: {self.name}"
+
+
+def format_busy_time(value: datetime) -> str:
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# [first day 00:00, day after the last 00:00) in UTC
+def day_window(start_date: date, end_date: date) -> tuple[datetime, datetime]:
+    return datetime.combine(start_date, time.min, UTC), datetime.combine(
+        end_date + timedelta(days=1),
+        time.min,
+        UTC,
+    )
+
+
+# Free time per interviewer as multiranges: the work hours of every weekday in the
+# window minus range_agg of the interviewer's busy blocks (the {busy} subquery).
+# Interviewers without blocks are entirely free. Params: work window minutes, first and
+# last day, interviewer ids.
+FREE_TIME_SQL = """
+WITH busy AS ({busy}),
+work AS (
+    SELECT coalesce(range_agg(tstzrange(
+        (day + make_interval(mins => %s)) AT TIME ZONE 'UTC',
+        (day + make_interval(mins => %s)) AT TIME ZONE 'UTC'
+    )), '{{}}') AS hours
+    FROM generate_series(%s::timestamp, %s::timestamp, interval '1 day') AS day
+    WHERE extract(isodow FROM day) < 6
+),
+free AS (
+    SELECT panel.interviewer_id,
+        (SELECT hours FROM work) - coalesce(range_agg(busy.period), '{{}}') AS free
+    FROM unnest(%s::bigint[]) AS panel(interviewer_id)
+    LEFT JOIN busy ON busy.interviewer_id = panel.interviewer_id
+    GROUP BY panel.interviewer_id
+)
+"""
+
+# one row per free range of each interviewer
+FREE_RANGES_SQL = (
+    FREE_TIME_SQL
+    + """
+SELECT free.interviewer_id, lower(period), upper(period)
+FROM free, unnest(free.free) AS period
+ORDER BY 1, 2
+"""
+)
+
+# Panel intersection with range_intersect_agg, cut at the cutoff rounded up to the grid,
+# then one row per grid aligned start with room for the interview. Params after
+# FREE_TIME_SQL's: cutoff, grid seconds (twice), seconds needed, grid seconds (twice).
+# Constants only, every value is a query parameter.
+PANEL_STARTS_SQL = (
+    FREE_TIME_SQL  # noqa: S608
+    + """
+SELECT start
+FROM (
+    SELECT range_intersect_agg(free)
+        * tstzmultirange(tstzrange(
+            to_timestamp(ceil(extract(epoch FROM %s::timestamptz) / %s) * %s),
+            NULL
+        )) AS free
+    FROM free
+) AS panel, unnest(panel.free) AS period,
+generate_series(
+    to_timestamp(ceil(extract(epoch FROM lower(period)) / %s) * %s),
+    upper(period) - make_interval(secs => %s),
+    make_interval(secs => %s)
+) AS start
+ORDER BY start
+"""
+)
+
+
+class BusyBlockQuerySet(models.QuerySet):
+    # blocks of these interviewers intersecting [start, end), answered by the GiST index
+    # on period
+    def overlapping(
+        self,
+        interviewer_ids: list[int],
+        start: datetime,
+        end: datetime,
+    ) -> "BusyBlockQuerySet":
+        return self.filter(
+            interviewer_id__in=interviewer_ids,
+            period__overlap=DateTimeTZRange(start, end),
+        )
+
+    # busy data of a panel between two dates in the get_free_busy_data shape, from one
+    # query instead of a provider round trip. Blocks of every source calendar are
+    # returned sorted by start, overlaps between calendars are merged downstream like
+    # the provider's.
+    def panel_busy_data(
+        self,
+        interviewer_ids: list[int],
+        interviewer_names: dict[int, str],
+        start_date: date,
+        end_date: date,
+    ) -> list[dict]:
+        busy = {interviewer_id: [] for interviewer_id in interviewer_ids}
+        blocks = self.overlapping(
+            interviewer_ids,
+            *day_window(start_date, end_date),
+        ).order_by("interviewer_id", "period__startswith", "period__endswith")
+        for interviewer_id, period in blocks.values_list("interviewer_id", "period"):
+            busy[interviewer_id].append(
+                {
+                    "start": format_busy_time(period.lower),
+                    "end": format_busy_time(period.upper),
+                },
+            )
+        return [
+            {
+                "interviewerId": interviewer_id,
+                "name": interviewer_names.get(interviewer_id, ""),
+                "busy": busy[interviewer_id],
+            }
+            for interviewer_id in interviewer_ids
+        ]
+
+    def _free_time_query(
+        self,
+        sql: str,
+        interviewer_ids: list[int],
+        start_date: date,
+        end_date: date,
+        params: tuple = (),
+    ) -> list[tuple]:
+        # an empty IN () has no SQL, and an empty panel has no free time to intersect
+        if not interviewer_ids:
+            return []
+        busy = self.overlapping(
+            interviewer_ids,
+            *day_window(start_date, end_date),
+        ).values_list("interviewer_id", "period")
+        # only trusted SQL is interpolated: one of the constants above and the ORM
+        # compiled busy subquery, whose values stay parameters (busy_params)
+        busy_sql, busy_params = busy.query.get_compiler(using=self.db).as_sql()
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                sql.format(busy=busy_sql),
+                (
+                    *busy_params,
+                    *WORK_WINDOW,
+                    start_date,
+                    end_date,
+                    list(interviewer_ids),
+                    *params,
+                ),
+            )
+            return cursor.fetchall()
+
+    # free time of each interviewer between two dates as sorted (start, end) ranges,
+    # computed by Postgres as work_hours_multirange - range_agg(busy)
+    def free_time(
+        self,
+        interviewer_ids: list[int],
+        start_date: date,
+        end_date: date,
+    ) -> dict[int, list[tuple[datetime, datetime]]]:
+        free = {interviewer_id: [] for interviewer_id in interviewer_ids}
+        for interviewer_id, start, end in self._free_time_query(
+            FREE_RANGES_SQL,
+            interviewer_ids,
+            start_date,
+            end_date,
+        ):
+            free[interviewer_id].append((start, end))
+        return free
+
+    # The database counterpart of calc_available_slots_with_date_range: the same
+    # interview slots, from one statement that intersects the panel's free multiranges,
+    # so no busy rows are shipped to Python. Rows of this queryset are the busy time,
+    # e.g. filter(calendar=...) narrows it.
+    def available_slots(  # noqa: PLR0913
+        self,
+        interviewer_ids: list[int],
+        duration: int,
+        start_date: date,
+        end_date: date,
+        granularity: int = SLOT_MINUTES,
+        cutoff_datetime: datetime | None = None,
+    ) -> list[dict[str, str]]:
+        validate_granularity(granularity)
+        if cutoff_datetime is None:
+            cutoff_datetime = get_default_cutoff()
+        if cutoff_datetime.tzinfo is None:
+            cutoff_datetime = cutoff_datetime.replace(tzinfo=UTC)
+        step = granularity * 60
+        needed = get_slots_needed(duration, granularity) * step
+        rows = self._free_time_query(
+            PANEL_STARTS_SQL,
+            interviewer_ids,
+            start_date,
+            end_date,
+            (cutoff_datetime, step, step, step, step, needed, step),
+        )
+        return [
+            {
+                "start": format_busy_time(start),
+                "end": format_busy_time(start + timedelta(minutes=duration)),
+            }
+            for (start,) in rows
+        ]
+
+
+class BusyBlock(models.Model):
+    interviewer = models.ForeignKey(
+        Interviewer,
+        on_delete=models.CASCADE,
+        related_name="busy_blocks",
+        db_index=False,
+    )  # led by the (interviewer, start) index
+    calendar = models.CharField(
+        max_length=255,
+    )  # source calendar the block was synced from
+    period = DateTimeRangeField()  # tstzrange, [start, end)
+
+    objects = BusyBlockQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GistIndex(fields=["period"], name="busyblock_period_gist"),
+            models.Index(
+                F("interviewer"),
+                RangeStartsWith("period"),
+                name="busyblock_interviewer_start",
+            ),
+        ]
+
+    def __str__(self):
+        period = f"{self.period.lower} - {self.period.upper}"
+        return f"{self.interviewer_id}: {period} ({self.calendar})"
+
+
+class InterviewerDayAvailabilityQuerySet(models.QuerySet):
+    # recompute the free bitmaps of these interviewers' weekdays from their busy blocks,
+    # upserting one row per day
+    def refresh(
+        self,
+        interviewer_ids: list[int],
+        start_date: date,
+        end_date: date,
+    ) -> int:
+        normalized_busy = normalize_busy_data(
+            BusyBlock.objects.panel_busy_data(
+                interviewer_ids,
+                {},
+                start_date,
+                end_date,
+            ),
+        )
+        rows = [
+            InterviewerDayAvailability(
+                interviewer_id=interviewer_id,
+                day=day,
+                free_bits=free_bits,
+            )
+            for interviewer_id in interviewer_ids
+            for day, free_bits in get_range_free_masks(
+                normalized_busy.get(interviewer_id, []),
+                start_date,
+                end_date,
+            ).items()
+        ]
+        self.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["interviewer", "day"],
+            update_fields=["free_bits"],
+        )
+        return len(rows)
+
+    # Panel bitmaps of a template between two dates: bit_and of its interviewers' rows
+    # per day, semi-joined with the template's interviewers table, in one GROUP BY day.
+    # Rows are written for every day a block touches, so a missing row is a day without
+    # blocks, i.e. the whole work day; bit_and over the rows that exist is the same as
+    # with the work day mask included. Days without a free slot are left out, like
+    # get_shared_masks.
+    def panel_masks(
+        self,
+        template_id: int,
+        start_date: date,
+        end_date: date,
+    ) -> dict[date, int]:
+        roster = InterviewTemplate.interviewers.through.objects.filter(
+            interviewtemplate_id=template_id,
+        )
+        days = (
+            self.filter(
+                interviewer_id__in=roster.values("interviewer_id"),
+                day__range=(start_date, end_date),
+            )
+            .values("day")
+            .annotate(panel_bits=BitAnd("free_bits"))
+            .order_by("day")
+        )
+        panel_bits = {row["day"]: row["panel_bits"] for row in days}
+        work_days = get_range_free_masks([], start_date, end_date)
+        if len(panel_bits) < len(work_days) and not roster.exists():
+            return {}
+        return {
+            day: panel_bits.get(day, work_mask)
+            for day, work_mask in work_days.items()
+            if panel_bits.get(day, work_mask)
+        }
+
+    # interview slots of a template on the default grid, from the panel bitmaps
+    def available_slots(
+        self,
+        template_id: int,
+        duration: int,
+        start_date: date,
+        end_date: date,
+        cutoff_datetime: datetime | None = None,
+    ) -> list[dict[str, str]]:
+        if cutoff_datetime is None:
+            cutoff_datetime = get_default_cutoff()
+        shared_masks = apply_cutoff(
+            self.panel_masks(template_id, start_date, end_date),
+            cutoff_datetime,
+        )
+        return get_interview_slots_from_starts(
+            get_interview_start_masks(shared_masks, duration),
+            duration,
+        )
+
+
+# Materialized free bitmap of one interviewer and weekday on the SLOT_MINUTES grid (bit
+# i is the slot starting i * 30 minutes after midnight, 48 bits fit a bigint), kept up
+# to date from BusyBlock by the signals in signals.py or by refresh() after bulk
+# imports. Days without a row are free for the whole work day.
+class InterviewerDayAvailability(models.Model):
+    interviewer = models.ForeignKey(
+        Interviewer,
+        on_delete=models.CASCADE,
+        related_name="day_availability",
+        db_index=False,
+    )  # led by the unique (interviewer, day) index
+    day = models.DateField()
+    free_bits = models.BigIntegerField()
+
+    objects = InterviewerDayAvailabilityQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["interviewer", "day"],
+                name="interviewerdayavailability_interviewer_day",
+            ),
+        ]
+
     def __str__(self):
-        return f"{self.id}: {self.name}"
\ No newline at end of file
+        return f"{self.interviewer_id}: {self.day} {self.free_bits:048b}"
@@ -0,0 +1,114 @@
+import time as clock
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .availability import get_availability_panel
+from .availability import get_availability_start_masks
+from .availability import get_panel_start_masks
+from .availability import get_provider
+from .availability import get_template_panel
+from .roster import get_template_roster
+from .utils import SATURDAY
+
+REQUEST_BUCKET_SECONDS = 300  # request counts are kept per template and 5 minute bucket
+
+
+def request_count_key(template_id: int, bucket: int) -> str:
+    return f"interviews:requests:{bucket}:{template_id}"
+
+
+# one counter increment in the shared cache per availability request, so every worker's
+# traffic feeds the prewarm priorities; the counters expire once they leave the
+# popularity window
+def record_template_request(template_id: int, cache_alias: str = "default"):
+    cache = caches[cache_alias]
+    key = request_count_key(template_id, int(clock.time() // REQUEST_BUCKET_SECONDS))
+    try:
+        cache.incr(key)
+    except ValueError:  # first request of the bucket
+        if not cache.add(
+            key,
+            1,
+            settings.INTERVIEWS_PREWARM_POPULARITY_WINDOW + REQUEST_BUCKET_SECONDS,
+        ):
+            cache.incr(key)
+
+
+# requests per template over the popularity window, templates without any are left out
+def get_request_counts(
+    template_ids: list[int],
+    cache_alias: str = "default",
+) -> dict[int, int]:
+    current = int(clock.time() // REQUEST_BUCKET_SECONDS)
+    buckets = range(
+        current
+        - settings.INTERVIEWS_PREWARM_POPULARITY_WINDOW // REQUEST_BUCKET_SECONDS,
+        current + 1,
+    )
+    keys = {
+        request_count_key(template_id, bucket): template_id
+        for template_id in template_ids
+        for bucket in buckets
+    }
+    counts = {}
+    for key, count in caches[cache_alias].get_many(list(keys)).items():
+        counts[keys[key]] = counts.get(keys[key], 0) + count
+    return counts
+
+
+# most requested templates first, ties (and templates nobody asked for) by id
+def rank_templates(template_ids: list[int]) -> list[int]:
+    counts = get_request_counts(template_ids)
+    return sorted(
+        template_ids,
+        key=lambda template_id: (-counts.get(template_id, 0), template_id),
+    )
+
+
+def chunk(items: list, size: int) -> list[list]:
+    return [items[index : index + size] for index in range(0, len(items), size)]
+
+
+# today through the days-th business day from today
+def get_business_day_window(days: int, today: date | None = None) -> tuple[date, date]:
+    start_date = today or datetime.now(UTC).date()
+    end_date = start_date - timedelta(days=1)
+    while days > 0:
+        end_date += timedelta(days=1)
+        days -= end_date.weekday() < SATURDAY
+    return start_date, max(start_date, end_date)
+
+
+# Computes a template's availability over the next business days through the regular
+# path, which leaves the roster, every interviewer's per day free bitmaps and the panel
+# result in the caches (or the Redis bitmap store). Any request inside the window then
+# skips the provider. The /availability panel and window differ from the template's, so
+# they are warmed as well.
+def prewarm_template(template_id: int, days: int, granularity: int) -> bool:
+    roster = get_template_roster(template_id)
+    if roster is None:
+        return False
+    interviewer_ids, interviewer_names = get_template_panel(roster)
+    start_date, end_date = get_business_day_window(days)
+    get_panel_start_masks(
+        get_provider(),
+        interviewer_ids,
+        interviewer_names,
+        roster["duration"],
+        start_date,
+        end_date,
+        granularity,
+    )
+    interviewer_ids, interviewer_names = get_availability_panel(roster)
+    get_availability_start_masks(
+        interviewer_ids,
+        interviewer_names,
+        roster["duration"],
+        granularity,
+    )
+    return True
@@ -0,0 +1,310 @@
+import threading
+from datetime import date
+
+import redis
+from django.conf import settings
+
+from .cache import availability_cache
+from .intervals import normalize_busy_data
+from .metrics import record_cache
+from .timing import phase
+from .utils import SATURDAY
+from .utils import SLOT_MINUTES
+from .utils import date_range
+from .utils import get_range_free_masks
+from .utils import get_shared_masks
+from .utils import slots_per_day
+
+
+# Redis numbers bits from the most significant bit of the first byte, our masks from the
+# least significant bit, so bit i of a mask (the slot starting i * granularity minutes
+# after midnight) is Redis bit offset i. Every grid's day is a whole number of bytes (48
+# bits on the 30 min grid).
+def mask_to_bitmap(mask: int, granularity: int = SLOT_MINUTES) -> bytes:
+    slots = slots_per_day(granularity)
+    return int(format(mask, f"0{slots}b")[::-1], 2).to_bytes(slots // 8, "big")
+
+
+# bitmap bytes that start at byte first_byte of the day back to a mask
+def bitmap_to_mask(bitmap: bytes, first_byte: int = 0) -> int:
+    if not bitmap:
+        return 0
+    return int(
+        format(int.from_bytes(bitmap, "big"), f"0{len(bitmap) * 8}b")[::-1],
+        2,
+    ) << (first_byte * 8)
+
+
+# KEYS: the panel's day keys, day by day (ARGV[1] interviewers per day), then the
+# scratch key. Returns "missing" plus the indexes of interviewers lacking a day, or for
+# every day with a free slot in common: its index, the byte of the first free slot and
+# the bytes from there on.
+PANEL_SCRIPT = """
+local panel = tonumber(ARGV[1])
+local scratch = KEYS[#KEYS]
+local missing = {}
+for index = 1, #KEYS - 1 do
+    if redis.call('EXISTS', KEYS[index]) == 0 then
+        missing[(index - 1) % panel] = true
+    end
+end
+if next(missing) then
+    local result = {'missing'}
+    for interviewer in pairs(missing) do
+        table.insert(result, interviewer)
+    end
+    return result
+end
+local result = {}
+for day = 0, (#KEYS - 1) / panel - 1 do
+    local first_key = day * panel
+    redis.call('BITOP', 'AND', scratch, unpack(KEYS, first_key + 1, first_key + panel))
+    local first_free = redis.call('BITPOS', scratch, 1)
+    if first_free >= 0 then
+        local first_byte = math.floor(first_free / 8)
+        table.insert(result, day)
+        table.insert(result, first_byte)
+        table.insert(result, redis.call('GETRANGE', scratch, first_byte, -1))
+    end
+end
+redis.call('DEL', scratch)
+return result
+"""
+
+
+class RedisBitmapStore:
+    """
+    Free bitmaps per (interviewer, day, granularity) as Redis strings, shared by every
+    worker and Celery task, with the panel intersection done in Redis.
+
+    Keys embed the interviewer's generation from availability_cache, so
+    invalidate_interviewer() orphans the bitmaps here too. A panel query is one script
+    call: BITOP AND of the panel's bitmaps into a scratch key per day, BITPOS to skip
+    days without a common free slot and GETRANGE to read the rest; the script runs
+    atomically, so one scratch key serves every call.
+    """
+
+    prefix = "interviews:bitmap"
+
+    def __init__(self, url: str, ttl: int = 300):
+        self.url = url
+        self.ttl = ttl
+        self._client = None
+        self._script = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        with self._lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(self.url)
+                self._script = self._client.register_script(PANEL_SCRIPT)
+
+    @property
+    def client(self) -> redis.Redis:
+        self._connect()
+        return self._client
+
+    @property
+    def panel_script(self):
+        self._connect()
+        return self._script
+
+    def day_key(
+        self,
+        interviewer_id: int,
+        generation: int,
+        day: date,
+        granularity: int,
+    ) -> str:
+        day_key = f"{day.isoformat()}:{granularity}"
+        return f"{self.prefix}:{interviewer_id}:{generation}:{day_key}"
+
+    def set_masks(
+        self,
+        interviewer_id: int,
+        masks: dict[date, int],
+        granularity: int = SLOT_MINUTES,
+        generation: int = 0,
+    ):
+        pipeline = self.client.pipeline(transaction=False)
+        for day, mask in masks.items():
+            pipeline.set(
+                self.day_key(interviewer_id, generation, day, granularity),
+                mask_to_bitmap(mask, granularity),
+                ex=self.ttl,
+            )
+        pipeline.execute()
+
+    # shared free bitmaps of the panel for days with a free slot in common, or the ids
+    # of the interviewers with a day missing from the store
+    def get_panel_masks(
+        self,
+        generations: dict[int, int],
+        days: list[date],
+        granularity: int = SLOT_MINUTES,
+    ) -> tuple[dict[date, int], list[int]]:
+        interviewer_ids = list(generations)
+        keys = [
+            self.day_key(interviewer_id, generations[interviewer_id], day, granularity)
+            for day in days
+            for interviewer_id in interviewer_ids
+        ]
+        result = self.panel_script(
+            keys=[*keys, f"{self.prefix}:scratch"],
+            args=[len(interviewer_ids)],
+        )
+        if result and result[0] == b"missing":
+            return {}, [interviewer_ids[index] for index in sorted(result[1:])]
+        return {
+            days[day_index]: bitmap_to_mask(bitmap, first_byte)
+            for day_index, first_byte, bitmap in zip(
+                result[::3],
+                result[1::3],
+                result[2::3],
+                strict=True,
+            )
+        }, []
+
+    # free bitmaps of every interviewer whose days are all in the store, the rest are
+    # left out
+    def get_masks(
+        self,
+        generations: dict[int, int],
+        days: list[date],
+        granularity: int = SLOT_MINUTES,
+    ) -> dict[int, dict[date, int]]:
+        interviewers_masks = {}
+        for interviewer_id, generation in generations.items():
+            bitmaps = self.client.mget(
+                [
+                    self.day_key(interviewer_id, generation, day, granularity)
+                    for day in days
+                ],
+            )
+            if None not in bitmaps:
+                interviewers_masks[interviewer_id] = {
+                    day: bitmap_to_mask(bitmap)
+                    for day, bitmap in zip(days, bitmaps, strict=True)
+                }
+        return interviewers_masks
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}:*", count=1000):
+            self.client.delete(key)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_bitmap_store(url: str) -> RedisBitmapStore:
+    with _stores_lock:
+        if url not in _stores:
+            _stores[url] = RedisBitmapStore(
+                url,
+                getattr(settings, "INTERVIEWS_AVAILABILITY_CACHE_TTL", 300),
+            )
+        return _stores[url]
+
+
+# Counterpart of get_cached_free_masks + get_shared_masks: the panel's shared free
+# bitmaps over [start_date, end_date] (before the cutoff, days without a common free
+# slot left out). Only interviewers missing from the store are passed to
+# fetch_busy_data, then the panel is read again. Keys can expire or be evicted between
+# the write and that read, the panel is then intersected here from the bitmaps just
+# computed and whatever the store still has.
+def get_redis_panel_masks(  # noqa: PLR0913
+    store: RedisBitmapStore,
+    interviewer_ids: list[int],
+    start_date: date,
+    end_date: date,
+    fetch_busy_data,
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, int]:
+    interviewer_ids = list(dict.fromkeys(interviewer_ids))
+    days = [day for day in date_range(start_date, end_date) if day.weekday() < SATURDAY]
+    if not days or not interviewer_ids:
+        return {}
+    generations = availability_cache.get_generations(interviewer_ids)
+    shared_masks, missing_ids = store.get_panel_masks(generations, days, granularity)
+    record_cache(
+        "bitmaps",
+        hits=len(interviewer_ids) - len(missing_ids),
+        misses=len(missing_ids),
+    )
+    if not missing_ids:
+        return shared_masks
+
+    interviewers_masks = compute_masks(
+        store,
+        fetch_busy_data(missing_ids),
+        missing_ids,
+        generations,
+        days,
+        granularity,
+    )
+    shared_masks, missing_ids = store.get_panel_masks(generations, days, granularity)
+    if not missing_ids:
+        return shared_masks
+
+    interviewers_masks.update(
+        store.get_masks(
+            {
+                interviewer_id: generations[interviewer_id]
+                for interviewer_id in interviewer_ids
+                if interviewer_id not in interviewers_masks
+            },
+            days,
+            granularity,
+        ),
+    )
+    refetch_ids = [
+        interviewer_id
+        for interviewer_id in interviewer_ids
+        if interviewer_id not in interviewers_masks
+    ]
+    if refetch_ids:
+        interviewers_masks.update(
+            compute_masks(
+                store,
+                fetch_busy_data(refetch_ids),
+                refetch_ids,
+                generations,
+                days,
+                granularity,
+            ),
+        )
+    with phase("compute"):
+        return get_shared_masks(interviewers_masks)
+
+
+# the interviewers' free bitmaps from their busy data, written to the store and returned
+def compute_masks(  # noqa: PLR0913
+    store: RedisBitmapStore,
+    busy_data: list[dict],
+    interviewer_ids: list[int],
+    generations: dict[int, int],
+    days: list[date],
+    granularity: int,
+) -> dict[int, dict[date, int]]:
+    interviewers_masks = {}
+    with phase("compute"):
+        normalized_busy = normalize_busy_data(busy_data)
+        for interviewer_id in interviewer_ids:
+            masks = get_range_free_masks(
+                normalized_busy.get(interviewer_id, []),
+                days[0],
+                days[-1],
+                granularity,
+            )
+            store.set_masks(
+                interviewer_id,
+                masks,
+                granularity,
+                generations[interviewer_id],
+            )
+            interviewers_masks[interviewer_id] = {
+                day: masks.get(day, 0) for day in days
+            }
+    availability_cache.bump_versions(interviewer_ids)
+    return interviewers_masks
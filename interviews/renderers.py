@@ -0,0 +1,121 @@
+import base64
+import json
+from collections.abc import Iterable
+from collections.abc import Iterator
+from datetime import date
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from .timing import timed
+from .utils import slots_per_day
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib encoder is used without it
+    orjson = None
+
+
+@timed("serialize")
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    DRF JSON renderer encoding with orjson.
+
+    Indented output (?indent / Accept params) stays on the stdlib path.
+    """
+
+    @timed("serialize")
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(
+            accepted_media_type or "",
+            renderer_context or {},
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data)
+
+
+class ORJSONResponse(HttpResponse):
+    """JsonResponse for plain Django views, encoded with orjson when available."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+# JSON object streamed in pieces: the envelope first, then the list under key one batch
+# at a time. Concatenated, the chunks are the same document
+# dumps({**envelope, key: [...]}) would give.
+def iter_json_envelope(
+    envelope: dict,
+    key: str,
+    batches: Iterable[list],
+) -> Iterator[bytes]:
+    head = dumps(envelope)[:-1]
+    yield head + (b"," if envelope else b"") + dumps(key) + b":["
+    first = True
+    for batch in batches:
+        if not batch:
+            continue
+        items = dumps(batch)[1:-1]
+        yield items if first else b"," + items
+        first = False
+    yield b"]}"
+
+
+class BitmapRenderer(ORJSONRenderer):
+    """
+    Opt-in compact availability format, picked with ?format=bitmap or the media type in
+    Accept. The view checks request.accepted_renderer.format and builds the body with
+    bitmap_availability().
+    """
+
+    media_type = "application/vnd.interviews.bitmap+json"
+    format = "bitmap"
+
+
+def is_bitmap_request(request) -> bool:
+    renderer = getattr(request, "accepted_renderer", None)
+    return renderer is not None and renderer.format == BitmapRenderer.format
+
+
+# bit i of a day bitmap is the start at i * granularity minutes after midnight UTC of
+# that day, little endian, so byte 0 holds the first slots of the day
+def encode_day_bitmap(mask: int, granularity: int) -> str:
+    return base64.b64encode(
+        mask.to_bytes(-(-slots_per_day(granularity) // 8), "little"),
+    ).decode()
+
+
+def decode_day_bitmap(encoded: str) -> int:
+    return int.from_bytes(base64.b64decode(encoded), "little")
+
+
+# interview start bitmaps in place of the availableSlots list: same grid and cutoff, the
+# client expands each set bit to start = day + bit * granularity, end = start +
+# durationMinutes
+@timed("serialize")
+def bitmap_availability(
+    start_masks: dict[date, int],
+    start_date: date,
+    end_date: date,
+    granularity: int,
+) -> dict:
+    return {
+        "startDate": start_date.isoformat(),
+        "endDate": end_date.isoformat(),
+        "granularity": granularity,
+        "slotsPerDay": slots_per_day(granularity),
+        "availableStarts": {
+            day.isoformat(): encode_day_bitmap(mask, granularity)
+            for day, mask in sorted(start_masks.items())
+        },
+    }
@@ -0,0 +1,119 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .cache import LRUCache
+from .metrics import record_cache
+from .models import InterviewTemplate
+from .timing import timed
+
+
+# Template rosters ({"id", "name", "duration", "interviewers": [{"id", "name"}]}) for
+# the availability endpoints, loaded with one query and cached in the worker's LRU and
+# in the shared Django cache (Redis in production). interviews/signals.py drops the
+# entries when a template, its interviewers or the relation between them change; other
+# workers' local copies expire after the local TTL.
+class RosterCache:
+    prefix = "interviews:roster"
+
+    def __init__(
+        self,
+        cache_alias: str = "default",
+        ttl: int = 3600,
+        local_ttl: float = 30,
+        local_maxsize: int = 1000,
+    ):
+        self.cache_alias = cache_alias
+        self.ttl = ttl
+        self.local = LRUCache(local_maxsize, local_ttl)
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    def key(self, template_id: int) -> str:
+        return f"{self.prefix}:{template_id}"
+
+    def get(self, template_id: int) -> dict | None:
+        key = self.key(template_id)
+        roster = self.local.get_many([key]).get(key)
+        if roster is None:
+            roster = self.shared.get(key)
+            if roster is not None:
+                self.local.set_many({key: roster})
+        return roster
+
+    def set(self, template_id: int, roster: dict):
+        key = self.key(template_id)
+        self.shared.set(key, roster, self.ttl)
+        self.local.set_many({key: roster})
+
+    def invalidate(self, template_ids):
+        keys = [self.key(template_id) for template_id in template_ids]
+        self.shared.delete_many(keys)
+        self.local.delete_many(keys)
+
+    def clear_local(self):
+        self.local.clear()
+
+
+roster_cache = RosterCache(
+    ttl=getattr(settings, "INTERVIEWS_ROSTER_CACHE_TTL", 3600),
+    local_ttl=getattr(settings, "INTERVIEWS_AVAILABILITY_LOCAL_CACHE_TTL", 30),
+)
+
+
+# the template and its interviewers in a single LEFT JOIN, one row per interviewer
+def load_template_roster(template_id: int) -> dict | None:
+    rows = list(
+        InterviewTemplate.objects.filter(id=template_id)
+        .order_by("interviewers__id")
+        .values(
+            "id",
+            "name",
+            "duration",
+            "interviewers__id",
+            "interviewers__first_name",
+            "interviewers__last_name",
+        ),
+    )
+    if not rows:
+        return None
+    return {
+        "id": rows[0]["id"],
+        "name": rows[0]["name"],
+        "duration": rows[0]["duration"],
+        "interviewers": [
+            {
+                "id": row["interviewers__id"],
+                "name": " ".join(
+                    (row["interviewers__first_name"], row["interviewers__last_name"]),
+                ),
+            }
+            for row in rows
+            if row["interviewers__id"] is not None
+        ],
+    }
+
+
+# None when the template does not exist (misses are not cached)
+@timed("roster")
+def get_template_roster(template_id) -> dict | None:
+    try:
+        template_id = int(template_id)
+    except (TypeError, ValueError):
+        return None
+    roster = roster_cache.get(template_id)
+    record_cache("roster", hits=int(roster is not None), misses=int(roster is None))
+    if roster is None:
+        roster = load_template_roster(template_id)
+        if roster is not None:
+            roster_cache.set(template_id, roster)
+    return roster
+
+
+# deferred until the surrounding transaction commits (requests are atomic), otherwise
+# another request could cache the old roster again before the change is visible
+def invalidate_templates(template_ids):
+    template_ids = list(template_ids)
+    transaction.on_commit(lambda: roster_cache.invalidate(template_ids))
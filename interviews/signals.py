@@ -0,0 +1,70 @@
+from datetime import UTC
+from datetime import timedelta
+
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_interviewer
+from .models import BusyBlock
+from .models import Interviewer
+from .models import InterviewerDayAvailability
+from .models import InterviewTemplate
+from .roster import invalidate_templates
+
+
+@receiver([post_save, post_delete], sender=InterviewTemplate)
+def template_changed(sender, instance, **kwargs):
+    invalidate_templates([instance.pk])
+
+
+# an interviewer's name is part of every roster they are on; on delete the templates are
+# looked up before the cascade removes the relation rows
+@receiver([post_save, pre_delete], sender=Interviewer)
+def interviewer_changed(sender, instance, **kwargs):
+    invalidate_templates(instance.interview_templates.values_list("id", flat=True))
+
+
+@receiver(m2m_changed, sender=InterviewTemplate.interviewers.through)
+def roster_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        invalidate_templates([instance.pk])
+    elif action == "pre_clear":
+        # interviewer.interview_templates.clear(): pk_set is not given, look the
+        # templates up before they go
+        invalidate_templates(instance.interview_templates.values_list("id", flat=True))
+    else:
+        invalidate_templates(pk_set)
+
+
+# a block that moves frees the days it used to cover, so those are refreshed as well
+@receiver(pre_save, sender=BusyBlock)
+def busy_block_saving(sender, instance, **kwargs):
+    instance._previous_period = (  # noqa: SLF001 -- read back in busy_block_changed
+        BusyBlock.objects.filter(pk=instance.pk)
+        .values_list("period", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver([post_save, post_delete], sender=BusyBlock)
+def busy_block_changed(sender, instance, origin=None, **kwargs):
+    if origin is not None and getattr(origin, "model", type(origin)) is not BusyBlock:
+        return  # cascade from deleting the interviewer, their day rows are deleted too
+    invalidate_interviewer(instance.interviewer_id)
+    for period in (instance.period, getattr(instance, "_previous_period", None)):
+        if period and period.lower and period.upper:
+            first_day = period.lower.astimezone(UTC).date()
+            last_day = (period.upper.astimezone(UTC) - timedelta(microseconds=1)).date()
+            InterviewerDayAvailability.objects.refresh(
+                [instance.interviewer_id],
+                first_day,
+                last_day,
+            )
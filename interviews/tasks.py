@@ -0,0 +1,46 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from services.providers import ProviderTimeoutError
+
+from .models import InterviewTemplate
+from .prewarm import chunk
+from .prewarm import prewarm_template
+from .prewarm import rank_templates
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task()
+def prewarm_availability(days: int | None = None, granularity: int | None = None):
+    """Fans the availability prewarm out in chunks, most requested templates first."""
+    days = days or settings.INTERVIEWS_PREWARM_BUSINESS_DAYS
+    granularity = granularity or settings.INTERVIEWS_SLOT_GRANULARITY
+    template_ids = rank_templates(
+        list(InterviewTemplate.objects.values_list("id", flat=True)),
+    )
+    chunks = chunk(template_ids, settings.INTERVIEWS_PREWARM_CHUNK_SIZE)
+    # queued in priority order, a chunk still queued at the next run is dropped
+    for template_chunk in chunks:
+        prewarm_templates.apply_async(
+            (template_chunk, days, granularity),
+            expires=settings.INTERVIEWS_PREWARM_INTERVAL,
+        )
+    return len(chunks)
+
+
+@shared_task()
+def prewarm_templates(template_ids: list[int], days: int, granularity: int):
+    """Computes and caches availability of a chunk of templates for the next days."""
+    warmed = 0
+    for template_id in template_ids:
+        try:
+            warmed += prewarm_template(template_id, days, granularity)
+        except ProviderTimeoutError:
+            logger.warning(
+                "Prewarming template %s timed out on the calendar provider",
+                template_id,
+            )
+    return warmed
@@ -0,0 +1,29 @@
+import pytest
+from django.core.cache import cache
+
+from interviews.cache import availability_cache
+from interviews.models import Interviewer
+from interviews.models import InterviewTemplate
+from interviews.roster import roster_cache
+
+
+# every cache layer starts and ends empty: the shared Django cache and the local LRUs
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    cache.clear()
+    availability_cache.clear_local()
+    roster_cache.clear_local()
+    yield
+    cache.clear()
+    availability_cache.clear_local()
+    roster_cache.clear_local()
+
+
+@pytest.fixture
+def template(db) -> InterviewTemplate:
+    template = InterviewTemplate.objects.create(name="Technical Interview", duration=60)
+    template.interviewers.add(
+        Interviewer.objects.create(first_name="Ada", last_name="Lovelace"),
+        Interviewer.objects.create(first_name="Alan", last_name="Turing"),
+    )
+    return template
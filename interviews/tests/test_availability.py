@@ -0,0 +1,106 @@
+from datetime import date
+from datetime import datetime
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from interviews.availability import get_availability_etag
+from interviews.cache import availability_cache
+from interviews.cache import invalidate_interviewer
+from interviews.views import is_not_modified
+
+MONDAY = date(2030, 6, 3)
+FRIDAY = date(2030, 6, 7)
+TEMPLATE = {"id": 1, "name": "Technical Interview", "duration": 60}
+NAMES = {1: "Ada Lovelace", 2: "Alan Turing"}
+
+
+def etag(**overrides):
+    inputs = {
+        "template": TEMPLATE,
+        "interviewer_ids": [1, 2],
+        "interviewer_names": NAMES,
+        "start_date": MONDAY,
+        "end_date": FRIDAY,
+        "granularity": 30,
+        "wire_format": "json",
+    }
+    return get_availability_etag(**(inputs | overrides))
+
+
+@pytest.fixture
+def cached():
+    availability_cache.bump_versions([1, 2])
+
+
+def test_etag_is_stable_for_the_same_inputs(cached):
+    assert etag() == etag()
+    assert etag().startswith('"')
+    assert etag().endswith('"')
+
+
+def test_etag_changes_with_its_inputs(cached):
+    assert etag(granularity=15) != etag()
+    assert etag(end_date=date(2030, 6, 6)) != etag()
+    assert etag(interviewer_ids=[1]) != etag()
+    assert etag(interviewer_names={**NAMES, 2: "Grace Hopper"}) != etag()
+    assert etag(template={**TEMPLATE, "duration": 45}) != etag()
+    assert etag(wire_format="bitmap") != etag()
+
+
+def test_etag_changes_with_the_busy_data(cached):
+    before = etag()
+    availability_cache.bump_versions([2])  # fresh busy data fetched
+    refetched = etag()
+    invalidate_interviewer(1)
+    availability_cache.clear_local()
+
+    etags = [before, refetched, etag()]
+    assert len(set(etags)) == len(etags)
+
+
+def test_no_etag_without_cached_busy_data(cached):
+    assert etag(interviewer_ids=[1, 2, 3]) is None
+    cache.clear()
+    availability_cache.clear_local()
+    assert etag() is None
+
+
+def test_etag_changes_when_the_cutoff_passes_a_slot(cached, monkeypatch):
+    monkeypatch.setattr(
+        "interviews.availability.get_default_cutoff",
+        lambda: datetime.fromisoformat("2030-06-03T09:05:00"),
+    )
+    before = etag()
+    monkeypatch.setattr(
+        "interviews.availability.get_default_cutoff",
+        lambda: datetime.fromisoformat("2030-06-03T09:25:00"),
+    )
+    assert etag() == before
+    monkeypatch.setattr(
+        "interviews.availability.get_default_cutoff",
+        lambda: datetime.fromisoformat("2030-06-03T09:35:00"),
+    )
+    assert etag() != before
+
+
+def test_if_none_match(cached):
+    factory = RequestFactory()
+    current = etag()
+
+    assert is_not_modified(
+        factory.get("/", headers={"If-None-Match": current}),
+        current,
+    )
+    assert is_not_modified(
+        factory.post("/", headers={"If-None-Match": f'"other", {current}'}),
+        current,
+    )
+    assert is_not_modified(factory.get("/", headers={"If-None-Match": "*"}), current)
+    assert not is_not_modified(
+        factory.get("/", headers={"If-None-Match": '"other"'}),
+        current,
+    )
+    assert not is_not_modified(factory.get("/"), current)
+    assert not is_not_modified(factory.get("/", headers={"If-None-Match": "*"}), None)
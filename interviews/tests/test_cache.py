@@ -0,0 +1,71 @@
+from datetime import date
+
+from interviews.cache import LRUCache
+from interviews.cache import get_cached_free_masks
+from interviews.cache import invalidate_interviewer
+from interviews.utils import WORK_WINDOW
+from interviews.utils import intervals_to_mask
+
+MONDAY = date(2030, 6, 3)
+TUESDAY = date(2030, 6, 4)
+
+
+class FakeProvider:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, interviewer_ids):
+        self.calls.append(list(interviewer_ids))
+        return [
+            {
+                "interviewerId": interviewer_id,
+                "busy": [
+                    {"start": "2030-06-03T09:00:00Z", "end": "2030-06-03T12:00:00Z"},
+                ],
+            }
+            for interviewer_id in interviewer_ids
+        ]
+
+
+def test_lru_cache_evicts_least_recently_used():
+    lru = LRUCache(maxsize=2, ttl=60)
+    lru.set_many({"a": 1, "b": 2})
+    lru.get_many(["a"])
+    lru.set_many({"c": 3})
+    assert lru.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+
+def test_lru_cache_expires_entries():
+    lru = LRUCache(maxsize=2, ttl=0)
+    lru.set_many({"a": 1})
+    assert lru.get_many(["a"]) == {}
+
+
+def test_cached_free_masks_only_fetch_missing_interviewers():
+    provider = FakeProvider()
+    first = get_cached_free_masks([1, 2], MONDAY, TUESDAY, provider)
+    assert first[1] == {
+        MONDAY: intervals_to_mask([(12 * 60, WORK_WINDOW[1])]),
+        TUESDAY: intervals_to_mask([WORK_WINDOW]),
+    }
+
+    # a second panel sharing interviewer 2 reuses its bitmaps
+    second = get_cached_free_masks([2, 3], MONDAY, TUESDAY, provider)
+    assert provider.calls == [[1, 2], [3]]
+    assert second[2] == first[2]
+    assert list(second) == [2, 3]
+
+
+def test_granularity_is_part_of_the_key():
+    provider = FakeProvider()
+    get_cached_free_masks([1], MONDAY, MONDAY, provider)
+    get_cached_free_masks([1], MONDAY, MONDAY, provider, granularity=15)
+    assert provider.calls == [[1], [1]]
+
+
+def test_invalidate_interviewer_forces_refetch():
+    provider = FakeProvider()
+    get_cached_free_masks([1, 2], MONDAY, TUESDAY, provider)
+    invalidate_interviewer(1)
+    get_cached_free_masks([1, 2], MONDAY, TUESDAY, provider)
+    assert provider.calls == [[1, 2], [1]]
@@ -0,0 +1,151 @@
+import io
+import json
+from datetime import date
+from datetime import datetime
+from itertools import pairwise
+
+import pytest
+
+from interviews.intervals import normalize_busy_data
+from services.providers import get_panel_busy_data
+
+pytest.importorskip("numpy")
+
+from services.calendar_generator import WORKDAYS
+from services.calendar_generator import CalendarGenerator
+from services.calendar_generator import SyntheticAvailabilityProvider
+
+JUNE_1 = date(2030, 6, 1)  # a Saturday
+JUNE_30 = date(2030, 6, 30)
+JUNE_WEEKDAYS = 20
+
+
+def in_range(blocks, first: str, last: str):
+    return [block for block in blocks if first <= block["start"][:10] <= last]
+
+
+def test_blocks_depend_only_on_seed_interviewer_and_day():
+    generator = CalendarGenerator(seed=7, calendars=2)
+    month = {
+        entry["interviewerId"]: entry
+        for entry in generator.iter_calendars([5, 1, 3], JUNE_1, JUNE_30, batch_size=2)
+    }
+    week = next(
+        CalendarGenerator(seed=7, calendars=2).iter_calendars(
+            [1],
+            date(2030, 6, 10),
+            date(2030, 6, 16),
+        ),
+    )
+
+    assert week["busy"] == in_range(month[1]["busy"], "2030-06-10", "2030-06-16")
+    assert week["calendars"][0] == in_range(
+        month[1]["calendars"][0],
+        "2030-06-10",
+        "2030-06-16",
+    )
+    assert month[1] != month[3]
+    assert (
+        next(
+            CalendarGenerator(seed=8, calendars=2).iter_calendars([1], JUNE_1, JUNE_30),
+        )
+        != month[1]
+    )
+
+
+def test_calendar_shape():
+    density = 4
+    busy = next(
+        CalendarGenerator(
+            seed=1,
+            density=density,
+            recurring=0,
+            all_day_rate=0,
+        ).iter_calendars([1], JUNE_1, JUNE_30),
+    )["busy"]
+    days = {datetime.fromisoformat(block["start"].rstrip("Z")).date() for block in busy}
+
+    assert all(day.weekday() < WORKDAYS for day in days)
+    assert density / 2 <= len(busy) / JUNE_WEEKDAYS <= density * 1.5
+    assert busy == sorted(busy, key=lambda block: (block["start"], block["end"]))
+    assert all(
+        block["start"][10:] >= "T08:00:00Z" and block["start"] < block["end"]
+        for block in busy
+    )
+    assert any(
+        later["start"] < earlier["end"] for earlier, later in pairwise(busy)
+    )  # overlaps
+
+
+def test_recurring_and_all_day_blocks():
+    recurring = next(
+        CalendarGenerator(
+            seed=3,
+            density=0,
+            recurring=1,
+            all_day_rate=0,
+        ).iter_calendars([1], JUNE_1, JUNE_30),
+    )["busy"]
+    all_day = next(
+        CalendarGenerator(
+            seed=3,
+            density=0,
+            recurring=0,
+            all_day_rate=1,
+        ).iter_calendars([1], JUNE_1, JUNE_30),
+    )["busy"]
+
+    assert len({block["start"][10:] + block["end"][10:] for block in recurring}) == 1
+    assert (
+        len(
+            {
+                datetime.fromisoformat(block["start"].rstrip("Z")).weekday()
+                for block in recurring
+            },
+        )
+        == 1
+    )
+    assert len(all_day) == JUNE_WEEKDAYS
+    assert all_day[0] == {
+        "start": "2030-06-03T00:00:00Z",
+        "end": "2030-06-04T00:00:00Z",
+    }
+
+
+def test_jsonl_matches_the_calendars():
+    generator = CalendarGenerator(seed=5, calendars=3)
+    out = io.StringIO()
+
+    written = generator.write_jsonl(out, [1, 2, 3], JUNE_1, JUNE_30, batch_size=2)
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert lines == list(generator.iter_calendars([1, 2, 3], JUNE_1, JUNE_30))
+    assert written == sum(
+        len(line["busy"]) + sum(map(len, line["calendars"])) for line in lines
+    )
+    assert set(normalize_busy_data(lines)) == {1, 2, 3}
+
+
+def test_synthetic_provider_merges_calendars():
+    generator = CalendarGenerator(seed=5, calendars=2)
+    entry = next(generator.iter_calendars([4], JUNE_1, JUNE_30))
+
+    busy_data = get_panel_busy_data(
+        SyntheticAvailabilityProvider(generator),
+        [4],
+        {4: "Edsger Dijkstra"},
+        JUNE_1,
+        JUNE_30,
+    )
+
+    assert busy_data[0]["busy"] == sorted(
+        entry["busy"] + entry["calendars"][0],
+        key=lambda block: (block["start"], block["end"]),
+    )
+    assert busy_data == get_panel_busy_data(
+        SyntheticAvailabilityProvider(generator),
+        [4],
+        {4: "Edsger Dijkstra"},
+        JUNE_1,
+        JUNE_30,
+    )
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from interviews.coalescing import CoalescedCache
+from interviews.coalescing import SingleFlight
+
+
+class SlowCompute:
+    def __init__(self, value="slots", delay=0.1):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+def run_concurrently(fn, count):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(fn())) for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight_shares_one_call():
+    compute = SlowCompute()
+    single_flight = SingleFlight()
+
+    results = run_concurrently(lambda: single_flight.do("key", compute), 8)
+
+    assert results == ["slots"] * 8
+    assert compute.calls == 1
+
+
+def test_single_flight_propagates_errors_and_forgets_them():
+    single_flight = SingleFlight()
+
+    def fail():
+        msg = "provider down"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="provider down"):
+        single_flight.do("key", fail)
+    assert single_flight.do("key", lambda: "ok") == "ok"
+
+
+def test_results_are_cached_across_calls():
+    compute = SlowCompute(delay=0)
+    result_cache = CoalescedCache(ttl=60)
+
+    assert result_cache.get_or_compute("key", compute) == "slots"
+    assert (
+        CoalescedCache(ttl=60).get_or_compute("key", compute) == "slots"
+    )  # another worker
+    assert compute.calls == 1
+
+
+def test_waits_for_another_worker_holding_the_lock():
+    compute = SlowCompute(delay=0)
+    result_cache = CoalescedCache(ttl=60, poll_interval=0.01)
+    cache.add("interviews:result:lock:key", "other-worker", 10)
+
+    def other_worker_finishes():
+        time.sleep(0.05)
+        cache.set(
+            "interviews:result:key",
+            {"value": "theirs", "delta": 0.05, "expires_at": time.time() + 60},
+        )
+
+    threading.Thread(target=other_worker_finishes).start()
+
+    assert result_cache.get_or_compute("key", compute) == "theirs"
+    assert compute.calls == 0
+
+
+def test_computes_when_the_lock_holder_gives_up():
+    compute = SlowCompute(delay=0)
+    result_cache = CoalescedCache(ttl=60, poll_interval=0.01)
+    cache.add("interviews:result:lock:key", "other-worker", 10)
+    threading.Timer(0.05, lambda: cache.delete("interviews:result:lock:key")).start()
+
+    assert result_cache.get_or_compute("key", compute) == "slots"
+    assert compute.calls == 1
+
+
+def test_entries_close_to_expiry_are_refreshed_early():
+    compute = SlowCompute(value="fresh", delay=0)
+    result_cache = CoalescedCache(ttl=60)
+    # the last computation took an hour, so an entry expiring in a second is refreshed
+    cache.set(
+        "interviews:result:key",
+        {"value": "stale", "delta": 3600, "expires_at": time.time() + 1},
+    )
+
+    assert result_cache.get_or_compute("key", compute) == "fresh"
+    assert compute.calls == 1
+
+
+def test_stale_value_is_served_while_another_worker_refreshes():
+    compute = SlowCompute(value="fresh", delay=0)
+    result_cache = CoalescedCache(ttl=60)
+    cache.set(
+        "interviews:result:key",
+        {"value": "stale", "delta": 3600, "expires_at": time.time() + 1},
+    )
+    cache.add("interviews:result:lock:key", "other-worker", 10)
+
+    assert result_cache.get_or_compute("key", compute) == "stale"
+    assert compute.calls == 0
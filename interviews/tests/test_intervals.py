@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from interviews.intervals import busy_between
+from interviews.intervals import merge_calendars
+from interviews.intervals import normalize_busy_data
+
+
+def block(start: str, end: str) -> dict[str, str]:
+    return {"start": f"2030-06-03T{start}:00Z", "end": f"2030-06-03T{end}:00Z"}
+
+
+def at(hhmm: str) -> datetime:
+    return datetime.fromisoformat(f"2030-06-03T{hhmm}:00")
+
+
+def test_merge_calendars_coalesces_overlapping_and_adjacent_blocks():
+    work = [block("09:00", "10:00"), block("13:00", "14:00")]
+    personal = [
+        block("09:30", "10:30"),
+        block("10:30", "11:00"),
+        block("16:00", "16:00"),
+    ]
+    shared = [block("09:00", "10:00"), block("13:30", "13:45")]
+    assert merge_calendars([work, personal, shared]) == [
+        (at("09:00"), at("11:00")),
+        (at("13:00"), at("14:00")),
+    ]
+
+
+def test_merge_calendars_sorts_unsorted_input():
+    assert merge_calendars([[block("14:00", "15:00"), block("09:00", "10:00")]]) == [
+        (at("09:00"), at("10:00")),
+        (at("14:00"), at("15:00")),
+    ]
+
+
+def test_normalize_busy_data_merges_extra_calendars_and_repeated_entries():
+    busy_data = [
+        {
+            "interviewerId": 1,
+            "busy": [block("09:00", "10:00")],
+            "calendars": [[block("09:30", "11:00")]],
+        },
+        {"interviewerId": 2, "busy": []},
+        {"interviewerId": 1, "busy": [block("15:00", "16:00")]},
+    ]
+    assert normalize_busy_data(busy_data) == {
+        1: [(at("09:00"), at("11:00")), (at("15:00"), at("16:00"))],
+        2: [],
+    }
+
+
+def test_busy_between_binary_searches_overlapping_blocks():
+    intervals = merge_calendars(
+        [
+            [
+                block("08:00", "09:00"),
+                block("09:30", "10:30"),
+                block("12:00", "13:00"),
+                block("15:00", "16:00"),
+            ],
+        ],
+    )
+    assert busy_between(intervals, at("09:00"), at("12:00")) == [
+        (at("09:30"), at("10:30")),
+    ]
+    assert busy_between(intervals, at("10:00"), at("15:30")) == intervals[1:]
+    assert busy_between(intervals, at("16:00"), at("17:00")) == []
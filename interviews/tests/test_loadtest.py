@@ -0,0 +1,67 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from interviews.management.commands.loadtest import LoadRun
+from interviews.management.commands.loadtest import parse_weights
+from interviews.management.commands.loadtest import percentile
+from interviews.models import Interviewer
+from interviews.models import InterviewTemplate
+
+
+def test_parse_weights():
+    assert parse_weights("1:3, 2:0.5,7") == {1: 3.0, 2: 0.5, 7: 1.0}
+    with pytest.raises(CommandError):
+        parse_weights("a:1")
+    with pytest.raises(CommandError):
+        parse_weights("1:0")
+    with pytest.raises(CommandError):
+        parse_weights("")
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    for q in (50, 99, 100):
+        assert percentile(values, q) == q
+    single = [0.2]
+    assert percentile(single, 99) == single[0]
+    assert percentile([], 50) == 0
+
+
+def test_request_mix_is_seeded():
+    def mix(seed):
+        run = LoadRun("http://testserver", {1: 1, 2: 3}, {0: 1, 7: 1}, 28, seed, 1)
+        return [run.next_request() for _ in range(20)]
+
+    assert mix(1) == mix(1)
+    assert {label for label, *_ in mix(1)} == {"availability", "range 7d"}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_loadtest_against_live_server(live_server):
+    template = InterviewTemplate.objects.create(name="Technical Interview", duration=60)
+    template.interviewers.add(
+        Interviewer.objects.create(first_name="Ada", last_name="Lovelace"),
+    )
+    out = StringIO()
+    rps, duration = 20, 0.5
+
+    call_command(
+        "loadtest",
+        url=live_server.url,
+        rps=rps,
+        duration=duration,
+        json=True,
+        stdout=out,
+    )
+
+    report = json.loads(out.getvalue())
+    sent = int(rps * duration)
+    assert report["statuses"] == {"200": sent}
+    assert report["endpoints"]["all"]["requests"] == sent
+    assert report["endpoints"]["all"]["errorRate"] == 0
+    assert 0 < report["endpoints"]["all"]["p50"] <= report["endpoints"]["all"]["p99"]
@@ -0,0 +1,107 @@
+import logging
+import queue
+import threading
+from logging.handlers import QueueListener
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from interviews.log import DebugLogSamplingMiddleware
+from interviews.log import DeferredQueueHandler
+from interviews.log import SampledDebugFilter
+from interviews.log import debug_enabled
+from interviews.log import is_debug_sampled
+from interviews.log import lazy_message
+from interviews.utils import log_busydata
+from interviews.utils import logger
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.append(threading.get_ident())
+
+
+class Exploding:
+    def __repr__(self):
+        msg = "debug dump was built"
+        raise AssertionError(msg)
+
+
+def test_debug_dumps_are_not_built_when_disabled():
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        log_busydata([{"interviewerId": 1, "busy": Exploding()}])
+    finally:
+        logger.setLevel(level)
+
+
+def test_lazy_message_is_built_on_format():
+    calls = []
+    message = lazy_message(lambda value: calls.append(value) or f"value={value}", 3)
+
+    assert calls == []
+    assert str(message) == "value=3"
+    assert calls == [3]
+
+
+def test_sampling_middleware_and_filter(settings):
+    record = logging.LogRecord(
+        "interviews_availability",
+        logging.DEBUG,
+        __file__,
+        1,
+        "dump",
+        None,
+        None,
+    )
+    warning = logging.LogRecord(
+        "interviews_availability",
+        logging.WARNING,
+        __file__,
+        1,
+        "warning",
+        None,
+        None,
+    )
+    seen = {}
+
+    def view(request):
+        seen["sampled"] = is_debug_sampled()
+        seen["debug"] = SampledDebugFilter().filter(record)
+        seen["warning"] = SampledDebugFilter().filter(warning)
+        seen["enabled"] = debug_enabled(logger)
+        return HttpResponse()
+
+    settings.INTERVIEWS_DEBUG_LOG_SAMPLE_RATE = 0
+    DebugLogSamplingMiddleware(view)(RequestFactory().get("/"))
+    assert seen == {"sampled": False, "debug": False, "warning": True, "enabled": False}
+
+    settings.INTERVIEWS_DEBUG_LOG_SAMPLE_RATE = 1
+    DebugLogSamplingMiddleware(view)(RequestFactory().get("/"))
+    assert seen["sampled"]
+    assert seen["debug"]
+    assert is_debug_sampled()  # outside a request
+
+
+def test_queue_handler_formats_on_the_listener_thread():
+    target = RecordingHandler()
+    handler = DeferredQueueHandler(queue.Queue())
+    handler.listener = QueueListener(handler.queue, target)
+    test_logger = logging.getLogger("interviews_availability.test_log")
+    test_logger.addHandler(handler)
+    test_logger.setLevel(logging.DEBUG)
+    try:
+        test_logger.debug("slots: %s", lazy_message(lambda: "09:00 AM - 09:30 AM"))
+    finally:
+        test_logger.removeHandler(handler)
+        handler.stop_listener()
+
+    assert target.messages == ["slots: 09:00 AM - 09:30 AM"]
+    assert target.threads != [threading.get_ident()]
@@ -0,0 +1,118 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.test import RequestFactory
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from interviews.metrics import metrics_view
+
+pytestmark = pytest.mark.django_db
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_cache_counters(template):
+    client = APIClient()
+    url = f"/api/interviews/{template.id}/availability/"
+    watched = [
+        (cache_name, result)
+        for cache_name in ("roster", "result", "masks")
+        for result in ("hit", "miss")
+    ]
+    before = {
+        key: sample("interviews_cache_requests_total", cache=key[0], result=key[1])
+        for key in watched
+    }
+
+    client.get(url)
+    client.get(url, {"granularity": 15})  # new result key, same roster
+
+    delta = {
+        key: sample("interviews_cache_requests_total", cache=key[0], result=key[1])
+        - before[key]
+        for key in watched
+    }
+    assert delta == {
+        ("roster", "hit"): 1,
+        ("roster", "miss"): 1,
+        ("result", "hit"): 0,
+        ("result", "miss"): 2,
+        ("masks", "hit"): 0,
+        ("masks", "miss"): 6,  # two interviewers and the test one, on each grid
+    }
+
+
+def test_request_histograms(template):
+    endpoint = {"endpoint": "interviewtemplate-availability-date-range"}
+    start = datetime.now(UTC).date() + timedelta(days=2)
+    body = {
+        "templateId": template.id,
+        "startDate": f"{start}T00:00:00Z",
+        "endDate": f"{start + timedelta(days=13)}T23:59:59Z",
+    }
+    names = [
+        "interviews_request_seconds_count",
+        "interviews_provider_fetch_seconds_count",
+        "interviews_slot_compute_seconds_count",
+        "interviews_serialize_seconds_count",
+        "interviews_response_bytes_count",
+        "interviews_slots_returned_count",
+        "interviews_panel_size_sum",
+        "interviews_date_range_days_sum",
+    ]
+    before = {name: sample(name, **endpoint) for name in names}
+
+    response = APIClient().post(
+        "/api/interviews/availability_date_range/",
+        body,
+        format="json",
+    )
+
+    after = {name: sample(name, **endpoint) for name in names}
+    assert response.status_code == HTTPStatus.OK
+    assert {name: after[name] - before[name] for name in names} == {
+        "interviews_request_seconds_count": 1,
+        "interviews_provider_fetch_seconds_count": 1,
+        "interviews_slot_compute_seconds_count": 1,
+        "interviews_serialize_seconds_count": 1,
+        "interviews_response_bytes_count": 1,
+        "interviews_slots_returned_count": 1,
+        "interviews_panel_size_sum": 2,
+        "interviews_date_range_days_sum": 14,
+    }
+    assert sample("interviews_slots_returned_sum", **endpoint) >= len(
+        response.json()["availableSlots"],
+    )
+
+
+def test_metrics_view():
+    response = metrics_view(RequestFactory().get("/metrics"))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("text/plain")
+    assert b"# TYPE interviews_provider_fetch_seconds histogram" in response.content
+    assert b"interviews_cache_requests_total" in response.content
+
+
+def test_metrics_are_not_public(settings):
+    public = APIClient().get("/metrics", REMOTE_ADDR="203.0.113.7")
+    assert public.status_code == HTTPStatus.NOT_FOUND
+    assert APIClient().get("/metrics").status_code == HTTPStatus.OK  # loopback
+
+    settings.INTERVIEWS_METRICS_ALLOWED_IPS = []
+    assert APIClient().get("/metrics").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_metrics_view_reads_the_multiprocess_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    response = metrics_view(RequestFactory().get("/metrics"))
+
+    assert response.status_code == HTTPStatus.OK
+    assert b"interviews_" not in response.content  # no worker has written samples there
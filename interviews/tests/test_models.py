@@ -0,0 +1,414 @@
+import random
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+
+from interviews.cache import availability_cache
+from interviews.intervals import normalize_busy_data
+from interviews.models import BusyBlock
+from interviews.models import Interviewer
+from interviews.models import InterviewerDayAvailability
+from interviews.models import InterviewTemplate
+from interviews.models import format_busy_time
+from interviews.utils import calc_available_slots_with_date_range
+from interviews.utils import get_range_free_masks
+from interviews.utils import get_shared_masks
+
+pytestmark = pytest.mark.django_db
+
+
+def at(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2030, 6, day, hour, minute, tzinfo=UTC)
+
+
+@pytest.fixture
+def interviewers():
+    return [
+        Interviewer.objects.create(first_name="Ada", last_name="Lovelace"),
+        Interviewer.objects.create(first_name="Alan", last_name="Turing"),
+        Interviewer.objects.create(first_name="Grace", last_name="Hopper"),
+    ]
+
+
+def block(interviewer, start, end, calendar="primary"):
+    return BusyBlock.objects.create(
+        interviewer=interviewer,
+        calendar=calendar,
+        period=DateTimeTZRange(start, end),
+    )
+
+
+def test_overlapping(interviewers):
+    ada, alan, grace = interviewers
+    inside = block(ada, at(3, 10), at(3, 11))
+    straddling = block(alan, at(2, 23), at(3, 9, 30), calendar="travel")
+    block(ada, at(3, 8), at(3, 9))  # ends exactly where the window starts
+    block(ada, at(4, 9), at(4, 10))
+    block(grace, at(3, 10), at(3, 11))  # not asked for
+
+    found = BusyBlock.objects.overlapping([ada.id, alan.id], at(3, 9), at(4, 9))
+
+    assert set(found) == {inside, straddling}
+
+
+def test_panel_busy_data(interviewers):
+    ada, alan, grace = interviewers
+    block(ada, at(3, 14), at(3, 15))
+    block(ada, at(3, 9), at(3, 10, 30), calendar="work")
+    block(ada, at(3, 9), at(3, 9, 30))
+    block(ada, at(5, 0), at(6, 0))  # day after the range
+    block(alan, at(2, 23), at(3, 1))
+
+    busy_data = BusyBlock.objects.panel_busy_data(
+        [alan.id, ada.id, grace.id],
+        {ada.id: "Ada Lovelace"},
+        date(2030, 6, 3),
+        date(2030, 6, 4),
+    )
+
+    assert busy_data == [
+        {
+            "interviewerId": alan.id,
+            "name": "",
+            "busy": [{"start": "2030-06-02T23:00:00Z", "end": "2030-06-03T01:00:00Z"}],
+        },
+        {
+            "interviewerId": ada.id,
+            "name": "Ada Lovelace",
+            "busy": [
+                {"start": "2030-06-03T09:00:00Z", "end": "2030-06-03T09:30:00Z"},
+                {"start": "2030-06-03T09:00:00Z", "end": "2030-06-03T10:30:00Z"},
+                {"start": "2030-06-03T14:00:00Z", "end": "2030-06-03T15:00:00Z"},
+            ],
+        },
+        {"interviewerId": grace.id, "name": "", "busy": []},
+    ]
+
+
+def test_overlap_query_uses_the_gist_index(interviewers):
+    BusyBlock.objects.bulk_create(
+        BusyBlock(
+            interviewer=interviewers[day % 3],
+            calendar="primary",
+            period=DateTimeTZRange(at(1 + day % 28, 9), at(1 + day % 28, 10)),
+        )
+        for day in range(3000)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE interviews_busyblock")
+
+    plan = BusyBlock.objects.overlapping(
+        [interviewers[0].id],
+        at(3, 0),
+        at(4, 0),
+    ).explain()
+
+    assert "busyblock_period_gist" in plan
+
+
+def random_busy_data(
+    rng,
+    interviewer_ids,
+    first_day: datetime,
+    days: int,
+) -> list[dict]:
+    busy_data = []
+    for interviewer_id in interviewer_ids:
+        busy = []
+        for _ in range(rng.randint(0, 4 * days)):
+            start = first_day + timedelta(
+                days=rng.randrange(-1, days + 1),
+                hours=rng.randint(7, 18),
+                minutes=rng.randrange(60),
+                seconds=rng.choice([0, 0, 30]),
+            )
+            busy.append(
+                {
+                    "start": format_busy_time(start),
+                    "end": format_busy_time(
+                        start + timedelta(minutes=rng.randint(5, 600)),
+                    ),
+                },
+            )
+        busy_data.append({"interviewerId": interviewer_id, "busy": busy})
+    return busy_data
+
+
+def store(busy_data, calendar="primary"):
+    BusyBlock.objects.bulk_create(
+        BusyBlock(
+            interviewer_id=item["interviewerId"],
+            calendar=calendar,
+            period=DateTimeTZRange(
+                datetime.fromisoformat(block["start"]),
+                datetime.fromisoformat(block["end"]),
+            ),
+        )
+        for item in busy_data
+        for block in item["busy"]
+    )
+
+
+def test_free_time(interviewers):
+    ada, alan, _ = interviewers
+    block(ada, at(3, 8), at(3, 10))
+    block(ada, at(3, 9, 30), at(3, 11), calendar="work")
+    block(ada, at(4, 16), at(5, 9, 15))
+
+    free = BusyBlock.objects.free_time(
+        [ada.id, alan.id],
+        date(2030, 6, 1),
+        date(2030, 6, 5),
+    )  # a Saturday to a Wednesday
+
+    assert free == {
+        ada.id: [
+            (at(3, 11), at(3, 17)),
+            (at(4, 9), at(4, 16)),
+            (at(5, 9, 15), at(5, 17)),
+        ],
+        alan.id: [(at(3, 9), at(3, 17)), (at(4, 9), at(4, 17)), (at(5, 9), at(5, 17))],
+    }
+
+
+@pytest.mark.parametrize(
+    ("duration", "granularity"),
+    [(60, 30), (45, 30), (30, 15), (90, 10), (25, 5)],
+)
+def test_available_slots_match_the_bitmask_engine(
+    interviewers,
+    duration,
+    granularity,
+    monkeypatch,
+):
+    rng = random.Random(duration * granularity)  # noqa: S311
+    ids = [interviewer.id for interviewer in interviewers]
+    busy_data = random_busy_data(rng, ids, at(3, 0), 12)
+    store(busy_data)
+    cutoff = datetime.fromisoformat("2030-06-05T11:07:30")
+    monkeypatch.setattr("interviews.utils.get_default_cutoff", lambda: cutoff)
+
+    expected = calc_available_slots_with_date_range(
+        busy_data,
+        ids,
+        duration,
+        "2030-06-03T00:00:00Z",
+        "2030-06-14T23:59:59Z",
+        granularity=granularity,
+    )
+
+    assert (
+        BusyBlock.objects.available_slots(
+            ids,
+            duration,
+            date(2030, 6, 3),
+            date(2030, 6, 14),
+            granularity,
+            cutoff,
+        )
+        == expected
+    )
+    assert expected
+
+
+def test_available_slots_edge_cases(interviewers):
+    ada, alan, grace = interviewers
+    block(ada, at(3, 0), at(4, 0))
+    block(alan, at(4, 9), at(4, 12, 10), calendar="work")
+    block(grace, at(4, 15), at(4, 16))
+    cutoff = at(1, 0)
+
+    assert (
+        BusyBlock.objects.available_slots(
+            [],
+            60,
+            date(2030, 6, 3),
+            date(2030, 6, 4),
+            cutoff_datetime=cutoff,
+        )
+        == []
+    )
+    assert (
+        BusyBlock.objects.available_slots(
+            [ada.id],
+            60,
+            date(2030, 6, 1),
+            date(2030, 6, 3),
+            cutoff_datetime=cutoff,
+        )
+        == []
+    )
+    assert BusyBlock.objects.available_slots(
+        [ada.id, alan.id, grace.id],
+        120,
+        date(2030, 6, 3),
+        date(2030, 6, 4),
+        cutoff_datetime=cutoff,
+    ) == [
+        {"start": "2030-06-04T12:30:00Z", "end": "2030-06-04T14:30:00Z"},
+        {"start": "2030-06-04T13:00:00Z", "end": "2030-06-04T15:00:00Z"},
+    ]
+    # the work calendar is filtered out, leaving Alan free all day
+    assert BusyBlock.objects.filter(calendar="primary").available_slots(
+        [alan.id],
+        420,
+        date(2030, 6, 4),
+        date(2030, 6, 4),
+        cutoff_datetime=cutoff,
+    ) == [
+        {"start": "2030-06-04T09:00:00Z", "end": "2030-06-04T16:00:00Z"},
+        {"start": "2030-06-04T09:30:00Z", "end": "2030-06-04T16:30:00Z"},
+        {"start": "2030-06-04T10:00:00Z", "end": "2030-06-04T17:00:00Z"},
+    ]
+
+
+@pytest.fixture
+def template(interviewers):
+    template = InterviewTemplate.objects.create(name="Technical Interview", duration=60)
+    template.interviewers.add(*interviewers)
+    return template
+
+
+def day_bits(interviewer):
+    return dict(
+        InterviewerDayAvailability.objects.filter(interviewer=interviewer).values_list(
+            "day",
+            "free_bits",
+        ),
+    )
+
+
+def test_day_availability_follows_busy_blocks(interviewers):
+    ada = interviewers[0]
+    work_day = 0xFFFF << 18  # 9:00 - 17:00 on the 30 min grid
+
+    busy = block(ada, at(3, 9), at(3, 10))
+    assert day_bits(ada) == {date(2030, 6, 3): work_day & ~(0b11 << 18)}
+
+    busy.period = DateTimeTZRange(at(4, 16), at(5, 0))
+    busy.save()
+    assert day_bits(ada) == {
+        date(2030, 6, 3): work_day,
+        date(2030, 6, 4): work_day & ~(0b11 << 32),
+    }
+
+    busy.delete()
+    assert day_bits(ada) == {date(2030, 6, 3): work_day, date(2030, 6, 4): work_day}
+
+    ada.delete()
+    assert not InterviewerDayAvailability.objects.exists()
+
+
+def test_busy_block_changes_invalidate_cached_masks(interviewers):
+    ada, alan, _ = interviewers
+
+    busy = block(ada, at(3, 9), at(3, 10))
+    busy.period = DateTimeTZRange(at(4, 9), at(4, 10))
+    busy.save()
+    busy.delete()
+
+    assert availability_cache.get_generations([ada.id, alan.id]) == {
+        ada.id: 3,
+        alan.id: 0,
+    }
+
+
+def test_panel_masks_match_the_bitmask_engine(
+    template,
+    interviewers,
+    django_assert_num_queries,
+):
+    ids = [interviewer.id for interviewer in interviewers]
+    rng = random.Random(4)  # noqa: S311
+    busy_data = random_busy_data(rng, ids, at(3, 0), 12)
+    store(busy_data)  # bulk_create skips the signals
+
+    assert (
+        InterviewerDayAvailability.objects.refresh(
+            ids,
+            date(2030, 6, 1),
+            date(2030, 6, 16),
+        )
+        == 3 * 10
+    )
+    normalized_busy = normalize_busy_data(busy_data)
+    expected = get_shared_masks(
+        {
+            interviewer_id: get_range_free_masks(
+                normalized_busy[interviewer_id],
+                date(2030, 6, 3),
+                date(2030, 6, 14),
+            )
+            for interviewer_id in ids
+        },
+    )
+
+    with django_assert_num_queries(1):
+        assert (
+            InterviewerDayAvailability.objects.panel_masks(
+                template.id,
+                date(2030, 6, 3),
+                date(2030, 6, 14),
+            )
+            == expected
+        )
+
+
+def test_day_availability_slots(template, interviewers, monkeypatch):
+    ids = [interviewer.id for interviewer in interviewers]
+    rng = random.Random(5)  # noqa: S311
+    busy_data = random_busy_data(rng, ids, at(3, 0), 5)
+    store(busy_data)
+    InterviewerDayAvailability.objects.refresh(ids, date(2030, 6, 3), date(2030, 6, 7))
+    cutoff = datetime.fromisoformat("2030-06-04T12:10")
+    monkeypatch.setattr("interviews.utils.get_default_cutoff", lambda: cutoff)
+
+    slots = InterviewerDayAvailability.objects.available_slots(
+        template.id,
+        45,
+        date(2030, 6, 3),
+        date(2030, 6, 7),
+        cutoff,
+    )
+
+    assert slots == calc_available_slots_with_date_range(
+        busy_data,
+        ids,
+        45,
+        "2030-06-03T00:00:00Z",
+        "2030-06-07T23:59:59Z",
+    )
+    assert slots
+
+
+def test_panel_masks_treat_missing_rows_as_free_days(template, interviewers):
+    ada, alan, grace = interviewers  # grace has no blocks and no rows
+    work_day = 0xFFFF << 18
+    block(ada, at(3, 9), at(3, 10))
+    block(alan, at(4, 0), at(5, 0))  # busy all of Tuesday
+    assert not day_bits(grace)
+
+    assert InterviewerDayAvailability.objects.panel_masks(
+        template.id,
+        date(2030, 6, 3),
+        date(2030, 6, 10),
+    ) == {
+        date(2030, 6, 3): work_day & ~(0b11 << 18),
+        date(2030, 6, 5): work_day,
+        date(2030, 6, 6): work_day,
+        date(2030, 6, 7): work_day,
+        date(2030, 6, 10): work_day,
+    }
+    assert (
+        InterviewerDayAvailability.objects.panel_masks(
+            InterviewTemplate.objects.create(name="Empty", duration=30).id,
+            date(2030, 6, 3),
+            date(2030, 6, 4),
+        )
+        == {}
+    )
@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+
+from services.mock_availability import MockFreeBusyServer
+from services.provider_client import HttpBusyDataProvider
+from services.provider_client import ProviderError
+from services.providers import ProviderTimeoutError
+from services.providers import get_panel_busy_data
+
+MONDAY = date(2030, 6, 3)
+FRIDAY = date(2030, 6, 7)
+NAMES = {
+    interviewer_id: f"Interviewer {interviewer_id}" for interviewer_id in range(1, 8)
+}
+MOCK_BLOCKS = range(3, 7)  # the mock generates 3 to 6 busy blocks per interviewer
+
+
+@pytest.fixture
+def server():
+    server = MockFreeBusyServer(max_batch_size=3).start()
+    yield server
+    server.stop()
+
+
+def test_panel_is_fetched_in_one_batch(server):
+    provider = HttpBusyDataProvider(server.url, max_batch_size=3)
+
+    busy_data = get_panel_busy_data(provider, [2, 1, 3], NAMES, MONDAY, FRIDAY)
+
+    assert [item["interviewerId"] for item in busy_data] == [2, 1, 3]
+    assert [item["name"] for item in busy_data] == [
+        "Interviewer 2",
+        "Interviewer 1",
+        "Interviewer 3",
+    ]
+    assert all(len(item["busy"]) in MOCK_BLOCKS for item in busy_data)
+    assert server.batch_sizes == [3]
+
+
+def test_oversize_batches_are_split(server):
+    provider = HttpBusyDataProvider(server.url, max_batch_size=3)
+
+    busy_data = get_panel_busy_data(provider, list(range(1, 8)), NAMES, MONDAY, FRIDAY)
+
+    assert [item["interviewerId"] for item in busy_data] == list(range(1, 8))
+    assert sorted(server.batch_sizes) == [1, 3, 3]
+
+
+def test_connections_are_reused_across_requests(server):
+    provider = HttpBusyDataProvider(server.url, max_batch_size=3)
+
+    requests = 5
+    for _ in range(requests):
+        get_panel_busy_data(provider, [1, 2], NAMES, MONDAY, FRIDAY)
+
+    assert len(server.batch_sizes) == requests
+    assert server.connections == 1
+
+
+def test_provider_errors_are_raised(server):
+    provider = HttpBusyDataProvider(server.url, max_batch_size=10)
+
+    with pytest.raises(ProviderError):
+        get_panel_busy_data(provider, list(range(1, 8)), NAMES, MONDAY, FRIDAY)
+
+
+def test_slow_provider_times_out():
+    server = MockFreeBusyServer(latency=1).start()
+    try:
+        provider = HttpBusyDataProvider(server.url, timeout=0.1)
+        with pytest.raises(ProviderTimeoutError):
+            get_panel_busy_data(provider, [1], NAMES, MONDAY, FRIDAY)
+    finally:
+        server.stop()
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from datetime import date
+
+import pytest
+
+from services.mock_availability import MockAvailabilityProvider
+from services.providers import ProviderTimeoutError
+from services.providers import get_panel_busy_data
+
+MONDAY = date(2030, 6, 3)
+FRIDAY = date(2030, 6, 7)
+NAMES = {1: "Ada Lovelace", 2: "Alan Turing", 3: "Grace Hopper", 4: "Edsger Dijkstra"}
+MOCK_BLOCKS = range(3, 7)  # the mock generates 3 to 6 busy blocks per interviewer
+LATENCY = 0.1
+
+
+class SlowProvider:
+    def __init__(self, latencies):
+        self.latencies = latencies
+
+    async def get_busy_blocks(self, interviewer_id, start_date, end_date):
+        await asyncio.sleep(self.latencies[interviewer_id])
+        return [{"start": f"{start_date}T09:00:00Z", "end": f"{start_date}T10:00:00Z"}]
+
+
+def test_panel_busy_data_keeps_order_and_shape():
+    busy_data = get_panel_busy_data(
+        MockAvailabilityProvider(),
+        [3, 1, 2],
+        NAMES,
+        MONDAY,
+        FRIDAY,
+    )
+
+    assert [item["interviewerId"] for item in busy_data] == [3, 1, 2]
+    assert [item["name"] for item in busy_data] == [
+        "Grace Hopper",
+        "Ada Lovelace",
+        "Alan Turing",
+    ]
+    for item in busy_data:
+        assert len(item["busy"]) in MOCK_BLOCKS
+        for block in item["busy"]:
+            assert MONDAY.isoformat() <= block["start"][:10] <= FRIDAY.isoformat()
+
+
+def test_panel_latency_is_max_not_sum():
+    provider = MockAvailabilityProvider(latency=LATENCY)
+
+    started = time.perf_counter()
+    busy_data = get_panel_busy_data(provider, list(NAMES), NAMES, MONDAY, FRIDAY)
+    elapsed = time.perf_counter() - started
+
+    assert len(busy_data) == len(NAMES)
+    assert elapsed < 3 * LATENCY  # fetched one after another it would take 4x
+
+
+def test_panel_timeout_raises():
+    provider = SlowProvider({1: 0, 2: 5})
+
+    started = time.perf_counter()
+    with pytest.raises(ProviderTimeoutError):
+        get_panel_busy_data(provider, [1, 2], NAMES, MONDAY, FRIDAY, timeout=0.05)
+    assert time.perf_counter() - started < 1
+
+
+def test_empty_panel_skips_provider():
+    assert get_panel_busy_data(SlowProvider({}), [], NAMES, MONDAY, FRIDAY) == []
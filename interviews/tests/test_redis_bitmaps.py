@@ -0,0 +1,185 @@
+import os
+import random
+from datetime import date
+
+import pytest
+import redis
+from django.core.cache import cache
+
+from interviews.availability import get_panel_start_masks
+from interviews.cache import availability_cache
+from interviews.cache import invalidate_interviewer
+from interviews.redis_bitmaps import bitmap_to_mask
+from interviews.redis_bitmaps import get_bitmap_store
+from interviews.redis_bitmaps import get_redis_panel_masks
+from interviews.redis_bitmaps import mask_to_bitmap
+from interviews.utils import SLOT_GRANULARITIES
+from interviews.utils import date_range
+from interviews.utils import get_shared_masks
+from interviews.utils import slots_per_day
+
+REDIS_URL = os.environ.get("INTERVIEWS_TEST_REDIS_URL", "redis://localhost:6379/15")
+MONDAY = date(2030, 6, 3)
+FRIDAY = date(2030, 6, 7)
+# the interviewer FakeProvider keeps busy all Wednesday
+AWAY_ON_WEDNESDAY = 2
+
+
+@pytest.fixture
+def store():
+    store = get_bitmap_store(REDIS_URL)
+    try:
+        store.client.ping()
+    except redis.ConnectionError:
+        pytest.skip(f"no Redis server at {REDIS_URL}")
+    store.clear()
+    yield store
+    store.clear()
+
+
+class FakeProvider:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, interviewer_ids):
+        self.calls.append(list(interviewer_ids))
+        return [
+            {
+                "interviewerId": interviewer_id,
+                "busy": [
+                    {
+                        "start": "2030-06-03T09:00:00Z",
+                        "end": f"2030-06-03T{10 + interviewer_id}:00:00Z",
+                    },
+                    {"start": "2030-06-05T00:00:00Z", "end": "2030-06-06T00:00:00Z"}
+                    if interviewer_id == AWAY_ON_WEDNESDAY
+                    else {
+                        "start": "2030-06-05T15:00:00Z",
+                        "end": "2030-06-05T16:00:00Z",
+                    },
+                ],
+            }
+            for interviewer_id in interviewer_ids
+        ]
+
+    async def get_busy_blocks(self, interviewer_id, start_date, end_date):
+        return self([interviewer_id])[0]["busy"]
+
+
+@pytest.mark.parametrize("granularity", SLOT_GRANULARITIES)
+def test_bitmap_round_trip(granularity):
+    rng = random.Random(granularity)  # noqa: S311
+    for _ in range(50):
+        mask = rng.getrandbits(slots_per_day(granularity))
+        bitmap = mask_to_bitmap(mask, granularity)
+        assert len(bitmap) * 8 == slots_per_day(granularity)
+        assert bitmap_to_mask(bitmap) == mask
+        assert bitmap_to_mask(bitmap[3:], 3) == mask >> 24 << 24
+
+
+def test_mask_bit_is_redis_bit_offset(store):
+    first_free = 3
+    store.client.set(f"{store.prefix}:bits", mask_to_bitmap(1 << first_free | 1 << 18))
+
+    assert store.client.bitpos(f"{store.prefix}:bits", 1) == first_free
+    assert [
+        store.client.getbit(f"{store.prefix}:bits", offset) for offset in (2, 3, 4, 18)
+    ] == [0, 1, 0, 1]
+
+
+@pytest.mark.parametrize("granularity", [30, 5])
+def test_panel_masks_match_get_shared_masks(store, granularity):
+    rng = random.Random(granularity)  # noqa: S311
+    days = date_range(MONDAY, FRIDAY)
+    interviewers_masks = {
+        interviewer_id: {
+            day: rng.getrandbits(slots_per_day(granularity))
+            & rng.getrandbits(slots_per_day(granularity))
+            for day in days
+        }
+        for interviewer_id in (1, 2, 3)
+    }
+    interviewers_masks[3][days[2]] = 0
+    for interviewer_id, masks in interviewers_masks.items():
+        store.set_masks(interviewer_id, masks, granularity)
+
+    shared_masks, missing_ids = store.get_panel_masks(
+        {1: 0, 2: 0, 3: 0},
+        days,
+        granularity,
+    )
+
+    assert missing_ids == []
+    assert shared_masks == get_shared_masks(interviewers_masks)
+    assert days[2] not in shared_masks
+    assert store.get_panel_masks({1: 0, 4: 0, 5: 0}, days, granularity) == ({}, [4, 5])
+    assert store.client.exists(f"{store.prefix}:scratch") == 0
+
+
+def test_only_missing_interviewers_are_fetched(store):
+    provider = FakeProvider()
+
+    first = get_redis_panel_masks(store, [1, 2], MONDAY, FRIDAY, provider)
+    second = get_redis_panel_masks(store, [2, 1, 3], MONDAY, FRIDAY, provider)
+    invalidate_interviewer(1)
+    availability_cache.clear_local()
+    third = get_redis_panel_masks(store, [1, 2], MONDAY, FRIDAY, provider)
+
+    assert provider.calls == [[1, 2], [3], [1]]
+    assert first == third
+    assert set(first) == {
+        MONDAY,
+        date(2030, 6, 4),
+        date(2030, 6, 6),
+        FRIDAY,
+    }  # Wednesday is blocked for 2
+    assert first[MONDAY] == 0xFFFF << 18 & ~(
+        0b111111 << 18
+    )  # 9:00 - 12:00 is busy for 2
+    assert second[MONDAY] == 0xFFFF << 18 & ~(0b11111111 << 18)
+    assert get_redis_panel_masks(store, [], MONDAY, FRIDAY, provider) == {}
+
+
+def test_evicted_bitmaps_are_intersected_locally(store, monkeypatch):
+    expected = get_redis_panel_masks(store, [1, 2, 3], MONDAY, FRIDAY, FakeProvider())
+    store.clear()
+    get_redis_panel_masks(store, [1, 2], MONDAY, FRIDAY, FakeProvider())
+    monkeypatch.setattr(
+        store,
+        "set_masks",
+        lambda *args, **kwargs: None,
+    )  # evicted right after the write
+    provider = FakeProvider()
+
+    assert get_redis_panel_masks(store, [1, 2, 3], MONDAY, FRIDAY, provider) == expected
+    assert provider.calls == [[3]]
+    store.clear()
+    assert get_redis_panel_masks(store, [1, 2, 3], MONDAY, FRIDAY, provider) == expected
+    assert provider.calls == [[3], [1, 2, 3]]
+
+
+def test_panel_start_masks_from_the_store(store, settings):
+    expected = get_panel_start_masks(
+        FakeProvider(),
+        [1, 2, 3],
+        {},
+        90,
+        MONDAY,
+        FRIDAY,
+        15,
+    )
+    cache.clear()
+    settings.INTERVIEWS_BITMAP_STORE_URL = REDIS_URL
+
+    start_masks = get_panel_start_masks(
+        FakeProvider(),
+        [1, 2, 3],
+        {},
+        90,
+        MONDAY,
+        FRIDAY,
+        15,
+    )
+
+    assert start_masks == expected
+    assert store.client.exists(store.day_key(3, 0, MONDAY, 15))
@@ -0,0 +1,95 @@
+import base64
+import json
+from datetime import date
+from http import HTTPStatus
+
+from interviews.renderers import ORJSONRenderer
+from interviews.renderers import ORJSONResponse
+from interviews.renderers import bitmap_availability
+from interviews.renderers import decode_day_bitmap
+from interviews.renderers import encode_day_bitmap
+from interviews.renderers import iter_json_envelope
+from interviews.utils import SLOT_MINUTES
+from interviews.utils import slots_per_day
+
+MONDAY = date(2030, 6, 3)
+TUESDAY = date(2030, 6, 4)
+
+DATA = {
+    "interviewId": 1,
+    "name": "Café Chat",
+    "availableSlots": [
+        {"start": "2030-06-03T09:00:00Z", "end": "2030-06-03T10:00:00Z"},
+    ],
+}
+
+
+def test_renderer_output_matches_stdlib():
+    rendered = ORJSONRenderer().render(DATA, "application/json", {})
+
+    assert json.loads(rendered) == DATA
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_renderer_keeps_indent_requests():
+    rendered = ORJSONRenderer().render(DATA, "application/json; indent=2", {})
+
+    assert json.loads(rendered) == DATA
+    assert b'\n  "interviewId"' in rendered
+
+
+def test_response():
+    response = ORJSONResponse(
+        DATA,
+        status=HTTPStatus.CREATED,
+        headers={"ETag": '"v1"'},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response["Content-Type"] == "application/json"
+    assert response["ETag"] == '"v1"'
+    assert json.loads(response.content) == DATA
+
+
+def test_day_bitmap_round_trip():
+    mask = (1 << 18) | (1 << 19) | (1 << 33)
+
+    encoded = encode_day_bitmap(mask, 30)
+
+    assert len(base64.b64decode(encoded)) == slots_per_day(30) // 8
+    assert decode_day_bitmap(encoded) == mask
+    encoded = encode_day_bitmap(1 << 287, 5)
+    assert len(base64.b64decode(encoded)) == slots_per_day(5) // 8
+
+
+def test_bitmap_availability():
+    data = bitmap_availability(
+        {TUESDAY: 1 << 19, MONDAY: 1 << 18},
+        MONDAY,
+        TUESDAY,
+        SLOT_MINUTES,
+    )
+
+    assert data["startDate"] == "2030-06-03"
+    assert data["endDate"] == "2030-06-04"
+    assert data["granularity"] == SLOT_MINUTES
+    assert data["slotsPerDay"] == slots_per_day(SLOT_MINUTES)
+    assert list(data["availableStarts"]) == ["2030-06-03", "2030-06-04"]
+    assert decode_day_bitmap(data["availableStarts"]["2030-06-03"]) == 1 << 18
+
+
+def test_json_envelope_stream_matches_dumps():
+    envelope = {"interviewId": 1, "name": "Café Chat"}
+    batches = [[{"start": "a"}], [], [{"start": "b"}, {"start": "c"}]]
+
+    chunks = list(iter_json_envelope(envelope, "availableSlots", iter(batches)))
+
+    # the envelope, one chunk per non-empty batch and the closing brackets
+    assert len(chunks) == len([batch for batch in batches if batch]) + 2
+    assert json.loads(b"".join(chunks)) == {
+        **envelope,
+        "availableSlots": [{"start": "a"}, {"start": "b"}, {"start": "c"}],
+    }
+    assert json.loads(b"".join(iter_json_envelope({}, "availableSlots", []))) == {
+        "availableSlots": [],
+    }
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from interviews.models import Interviewer
+from interviews.models import InterviewTemplate
+from interviews.roster import get_template_roster
+from interviews.roster import roster_cache
+
+pytestmark = pytest.mark.django_db
+
+
+def roster_queries(template_id):
+    with CaptureQueriesContext(connection) as queries:
+        roster = get_template_roster(template_id)
+    return roster, len(queries)
+
+
+def test_roster_is_loaded_in_one_query_then_cached(
+    template,
+    django_capture_on_commit_callbacks,
+):
+    roster, queries = roster_queries(template.id)
+
+    assert queries == 1
+    assert roster == {
+        "id": template.id,
+        "name": "Technical Interview",
+        "duration": 60,
+        "interviewers": [
+            {
+                "id": interviewer.id,
+                "name": f"{interviewer.first_name} {interviewer.last_name}",
+            }
+            for interviewer in template.interviewers.order_by("id")
+        ],
+    }
+    assert roster_queries(template.id) == (roster, 0)
+    roster_cache.clear_local()
+    assert roster_queries(template.id) == (roster, 0)  # from the shared cache
+
+
+def test_missing_and_empty_templates():
+    empty = InterviewTemplate.objects.create(name="Empty", duration=30)
+
+    assert get_template_roster(empty.id)["interviewers"] == []
+    assert get_template_roster(empty.id + 1) is None
+    assert get_template_roster("abc") is None
+
+
+def test_template_save_invalidates(template, django_capture_on_commit_callbacks):
+    get_template_roster(template.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        template.duration = 45
+        template.save()
+
+    assert get_template_roster(template.id)["duration"] == template.duration
+
+
+def test_interviewer_save_invalidates(template, django_capture_on_commit_callbacks):
+    get_template_roster(template.id)
+    interviewer = template.interviewers.order_by("id").first()
+    with django_capture_on_commit_callbacks(execute=True):
+        interviewer.first_name = "Grace"
+        interviewer.save()
+
+    assert (
+        get_template_roster(template.id)["interviewers"][0]["name"] == "Grace Lovelace"
+    )
+
+
+def test_roster_changes_invalidate(template, django_capture_on_commit_callbacks):
+    panel_size = len(get_template_roster(template.id)["interviewers"])
+    extra = Interviewer.objects.create(first_name="Grace", last_name="Hopper")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        template.interviewers.add(extra)
+    assert len(get_template_roster(template.id)["interviewers"]) == panel_size + 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        extra.interview_templates.clear()
+    assert len(get_template_roster(template.id)["interviewers"]) == panel_size
+
+    with django_capture_on_commit_callbacks(execute=True):
+        template.interviewers.order_by("id").first().delete()
+    assert len(get_template_roster(template.id)["interviewers"]) == 1
@@ -0,0 +1,162 @@
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from celery.result import EagerResult
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from interviews.models import Interviewer
+from interviews.models import InterviewTemplate
+from interviews.prewarm import get_business_day_window
+from interviews.prewarm import get_request_counts
+from interviews.prewarm import rank_templates
+from interviews.prewarm import record_template_request
+from interviews.tasks import prewarm_availability
+from interviews.tasks import prewarm_templates
+from services.providers import ProviderTimeoutError
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _eager_tasks(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+
+@pytest.fixture
+def templates():
+    ada = Interviewer.objects.create(first_name="Ada", last_name="Lovelace")
+    alan = Interviewer.objects.create(first_name="Alan", last_name="Turing")
+    templates = [
+        InterviewTemplate.objects.create(name=f"Interview {index}", duration=60)
+        for index in range(5)
+    ]
+    for template in templates:
+        template.interviewers.add(ada, alan)
+    return templates
+
+
+@pytest.mark.parametrize(
+    ("today", "days", "end_date"),
+    [
+        (date(2030, 6, 3), 10, date(2030, 6, 14)),  # Monday, two weeks
+        (date(2030, 6, 7), 1, date(2030, 6, 7)),  # Friday
+        (date(2030, 6, 8), 1, date(2030, 6, 10)),  # Saturday, through Monday
+        (date(2030, 6, 8), 0, date(2030, 6, 8)),
+    ],
+)
+def test_business_day_window(today, days, end_date):
+    assert get_business_day_window(days, today) == (today, end_date)
+
+
+def test_templates_are_ranked_by_recent_requests(templates):
+    first, second, third, *_ = [template.id for template in templates]
+    for template_id in [third, third, third, second, third, second]:
+        record_template_request(template_id)
+
+    assert get_request_counts([first, second, third]) == {second: 2, third: 4}
+    assert rank_templates([template.id for template in templates]) == [
+        third,
+        second,
+        first,
+        *[template.id for template in templates[3:]],
+    ]
+
+
+def test_requests_are_counted_by_the_views(templates):
+    start = datetime.now(UTC).date() + timedelta(days=2)
+    body = {
+        "templateId": templates[1].id,
+        "startDate": f"{start}T00:00:00Z",
+        "endDate": f"{start}T23:59:59Z",
+    }
+
+    APIClient().post("/api/interviews/availability_date_range/", body, format="json")
+    APIClient().get(f"/api/interviews/{templates[2].id}/availability/")
+    APIClient().post(
+        "/api/interviews/availability_date_range/",
+        {**body, "templateId": 999},
+        format="json",
+    )
+
+    assert get_request_counts([templates[1].id, templates[2].id, 999]) == {
+        templates[1].id: 1,
+        templates[2].id: 1,
+    }
+
+
+def test_prewarm_availability_chunks_templates_by_priority(
+    templates,
+    settings,
+    monkeypatch,
+):
+    settings.INTERVIEWS_PREWARM_CHUNK_SIZE = 2
+    chunks = []
+    monkeypatch.setattr(
+        prewarm_templates,
+        "apply_async",
+        lambda args, **options: chunks.append((args, options)),
+    )
+    record_template_request(templates[4].id)
+
+    result = prewarm_availability.delay(days=5, granularity=15)
+
+    assert isinstance(result, EagerResult)
+    assert result.result == len(chunks)
+    ids = [template.id for template in templates]
+    assert chunks == [
+        (([ids[4], ids[0]], 5, 15), {"expires": settings.INTERVIEWS_PREWARM_INTERVAL}),
+        (([ids[1], ids[2]], 5, 15), {"expires": settings.INTERVIEWS_PREWARM_INTERVAL}),
+        (([ids[3]], 5, 15), {"expires": settings.INTERVIEWS_PREWARM_INTERVAL}),
+    ]
+
+
+def test_prewarmed_requests_skip_the_provider(templates, monkeypatch):
+    assert prewarm_templates.delay([templates[0].id, 999], 10, 30).result == 1
+
+    def no_provider(*args, **kwargs):
+        msg = "busy data was fetched"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr("interviews.availability.get_panel_busy_data", no_provider)
+    start_date, end_date = get_business_day_window(10)
+    body = {
+        "templateId": templates[3].id,
+        "startDate": f"{start_date + timedelta(days=1)}T00:00:00Z",
+        "endDate": f"{end_date}T23:59:59Z",
+    }
+    response = APIClient().post(
+        "/api/interviews/availability_date_range/",
+        body,
+        format="json",
+    )
+
+    # another template with the same panel, inside the window
+    assert response.status_code == status.HTTP_200_OK
+    assert (
+        APIClient()
+        .get(f"/api/interviews/{templates[3].id}/availability/", {"granularity": 30})
+        .status_code
+        == status.HTTP_200_OK
+    )
+
+
+def test_prewarm_templates_survives_provider_timeouts(templates, monkeypatch):
+    timed_out, *warmed = templates[:3]
+
+    def timeout(template_id, days, granularity):
+        if template_id == timed_out.id:
+            msg = "slow"
+            raise ProviderTimeoutError(msg)
+        return True
+
+    monkeypatch.setattr("interviews.tasks.prewarm_template", timeout)
+
+    assert prewarm_templates.delay(
+        [template.id for template in templates[:3]],
+        10,
+        30,
+    ).result == len(warmed)
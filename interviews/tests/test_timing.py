@@ -0,0 +1,99 @@
+import json
+import logging
+import time
+from http import HTTPStatus
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from interviews.timing import RequestTimings
+from interviews.timing import ServerTimingMiddleware
+from interviews.timing import logger
+from interviews.timing import phase
+from interviews.timing import timed
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def parse_header(value: str) -> dict[str, float]:
+    metrics = {}
+    for metric in value.split(", "):
+        name, _, duration = metric.partition(";dur=")
+        metrics[name] = float(duration)
+    return metrics
+
+
+FETCH_MS = 50  # simulated provider round trip
+WORK_MS = 10  # time spent in the cache and compute phases themselves
+
+
+@timed("provider")
+def fetch():
+    time.sleep(FETCH_MS / 1000)
+
+
+def view(request):
+    with phase("cache"):
+        time.sleep(WORK_MS / 1000)
+        fetch()
+    with phase("compute"):
+        time.sleep(WORK_MS / 1000)
+    return HttpResponse("ok")
+
+
+def test_nested_phases_count_self_time():
+    timings = RequestTimings()
+    timings.enter("cache")
+    timings.enter("provider")
+    timings.enter("provider")
+    timings.exit()
+    timings.exit()
+    timings.exit()
+
+    assert list(timings.phases) == ["cache", "provider"]
+    assert not timings.stack
+
+
+def test_phases_outside_a_request_are_noops():
+    with phase("compute"):
+        fetch()
+
+
+def test_server_timing_header(settings):
+    settings.INTERVIEWS_SERVER_TIMING = True
+    response = ServerTimingMiddleware(view)(RequestFactory().get("/"))
+
+    metrics = parse_header(response["Server-Timing"])
+    assert list(metrics) == ["cache", "provider", "compute", "total"]
+    # the provider call inside the cache phase is not counted twice
+    assert WORK_MS <= metrics["cache"] < FETCH_MS
+    assert metrics["provider"] >= FETCH_MS
+    phases = metrics["cache"] + metrics["provider"] + metrics["compute"]
+    assert phases <= metrics["total"] + 0.2  # rounding
+
+
+def test_timing_log_line(settings):
+    settings.INTERVIEWS_SERVER_TIMING = False
+    settings.INTERVIEWS_TIMING_LOG = True
+    handler = RecordingHandler()
+    logger.addHandler(handler)
+    try:
+        response = ServerTimingMiddleware(view)(
+            RequestFactory().get("/api/interviews/1/availability/"),
+        )
+    finally:
+        logger.removeHandler(handler)
+
+    assert "Server-Timing" not in response
+    line = json.loads(handler.messages[0])
+    assert line["method"] == "GET"
+    assert line["path"] == "/api/interviews/1/availability/"
+    assert line["status"] == HTTPStatus.OK
+    assert set(line) >= {"cache", "provider", "compute", "total"}
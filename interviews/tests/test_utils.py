@@ -0,0 +1,189 @@
+from datetime import date
+from datetime import datetime
+from datetime import time
+
+import pytest
+
+from interviews.intervals import merge_calendars
+from interviews.utils import SLOT_GRANULARITIES
+from interviews.utils import WORK_WINDOW
+from interviews.utils import apply_cutoff
+from interviews.utils import calc_available_slots
+from interviews.utils import calc_available_slots_with_date_range
+from interviews.utils import format_interview_slot
+from interviews.utils import get_busy_intervals
+from interviews.utils import get_free_intervals
+from interviews.utils import get_interview_slots
+from interviews.utils import get_interview_slots_from_masks
+from interviews.utils import get_interview_starts
+from interviews.utils import get_shared_masks
+from interviews.utils import get_shared_slots
+from interviews.utils import get_slots_needed
+from interviews.utils import intervals_to_mask
+from interviews.utils import mask_to_slots
+from interviews.utils import slot_range_mask
+from interviews.utils import validate_granularity
+
+MONDAY = date(2030, 6, 3)
+
+
+def busy(start: str, end: str) -> dict[str, str]:
+    return {"start": f"{start}Z", "end": f"{end}Z"}
+
+
+def test_busy_intervals_split_blocks_past_midnight():
+    intervals = get_busy_intervals(
+        merge_calendars([[busy("2030-06-03T23:00:00", "2030-06-04T01:00:30")]]),
+    )
+    assert intervals == {MONDAY: [(23 * 60, 24 * 60)], date(2030, 6, 4): [(0, 61)]}
+
+
+def test_free_intervals_sweep_overlapping_blocks():
+    busy_intervals = [
+        (600, 660),
+        (8 * 60, 9 * 60 + 30),
+        (630, 700),
+        (700, 710),
+        (16 * 60 + 50, 18 * 60),
+    ]
+    assert get_free_intervals(busy_intervals) == [(570, 600), (710, 16 * 60 + 50)]
+    assert get_free_intervals([]) == [WORK_WINDOW]
+
+
+@pytest.mark.parametrize(
+    ("granularity", "expected"),
+    [
+        (30, slot_range_mask(21, 34)),  # busy until 10:10 blocks the 10:00-10:30 slot
+        (10, slot_range_mask(61, 102)),
+        (5, slot_range_mask(122, 204)),
+    ],
+)
+def test_free_masks_follow_granularity(granularity: int, expected: int):
+    assert intervals_to_mask([(610, 17 * 60)], granularity) == expected
+
+
+def test_cutoff_drops_slots_before_threshold():
+    masks = apply_cutoff(
+        {MONDAY: intervals_to_mask([WORK_WINDOW])},
+        datetime.combine(MONDAY, time(15, 10)),
+    )
+    assert mask_to_slots(masks[MONDAY])[0] == (time(15, 30), time(16, 0))
+
+
+def test_validate_granularity():
+    for granularity in SLOT_GRANULARITIES:
+        assert validate_granularity(granularity) == granularity
+    with pytest.raises(ValueError, match="granularity"):
+        validate_granularity(20)
+
+
+def test_shared_masks_treat_missing_days_as_busy():
+    tuesday = date(2030, 6, 4)
+    shared = get_shared_masks(
+        {
+            1: {MONDAY: 0b0110, tuesday: 0b1},
+            2: {MONDAY: 0b1100},
+        },
+    )
+    assert shared == {MONDAY: 0b0100}
+
+
+def test_shared_slots_match_bitmap_intersection():
+    shared = get_shared_slots(
+        {
+            1: {MONDAY: [(time(9, 0), time(9, 30)), (time(9, 30), time(10, 0))]},
+            2: {MONDAY: [(time(9, 30), time(10, 0))]},
+        },
+    )
+    assert shared == {MONDAY: [(time(9, 30), time(10, 0))]}
+
+
+@pytest.mark.parametrize(
+    ("mask", "slots_needed", "expected"),
+    [
+        (0b1111, 1, 0b1111),
+        (0b1111, 3, 0b0011),
+        (0b1101111, 3, 0b0000011),
+        (0b1101111, 5, 0),
+        (slot_range_mask(18, 34), 16, 1 << 18),
+    ],
+)
+def test_interview_starts(mask: int, slots_needed: int, expected: int):
+    assert get_interview_starts(mask, slots_needed) == expected
+
+
+def test_interview_slots_run_lengths_match_bitmap_search():
+    # 9:00-10:30 and 11:00-12:00 free
+    mask = slot_range_mask(18, 21) | slot_range_mask(22, 24)
+    from_slots = get_interview_slots({MONDAY: mask_to_slots(mask)}, 45)
+    assert from_slots == get_interview_slots_from_masks({MONDAY: mask}, 45)
+    assert [slot["start"] for slot in from_slots] == [
+        "2030-06-03T09:00:00Z",
+        "2030-06-03T09:30:00Z",
+        "2030-06-03T11:00:00Z",
+    ]
+    assert from_slots[0]["end"] == "2030-06-03T09:45:00Z"
+    assert get_slots_needed(45) == get_slots_needed(60)  # whole 30 min slots
+
+
+def test_calc_available_slots_with_date_range():
+    busy_data = [
+        {
+            "interviewerId": 1,
+            "busy": [busy("2030-06-03T09:00:00", "2030-06-03T15:00:00")],
+        },
+        {
+            "interviewerId": 2,
+            "busy": [busy("2030-06-03T16:00:00", "2030-06-03T17:00:00")],
+        },
+    ]
+    slots = calc_available_slots_with_date_range(
+        busy_data,
+        [1, 2],
+        60,
+        "2030-06-01T00:00:00Z",
+        "2030-06-03T23:59:59Z",
+    )
+    assert slots == [{"start": "2030-06-03T15:00:00Z", "end": "2030-06-03T16:00:00Z"}]
+
+
+def test_finer_granularity_fits_durations_exactly():
+    # 45 min fits between two busy blocks on the 15 min grid but not on the 30 min grid
+    busy_data = [
+        {
+            "interviewerId": 1,
+            "busy": [
+                busy("2030-06-03T09:00:00", "2030-06-03T10:15:00"),
+                busy("2030-06-03T11:00:00", "2030-06-03T17:00:00"),
+            ],
+        },
+    ]
+    start, end = "2030-06-03T00:00:00Z", "2030-06-03T23:59:59Z"
+    assert calc_available_slots_with_date_range(busy_data, [1], 45, start, end) == []
+    assert calc_available_slots_with_date_range(
+        busy_data,
+        [1],
+        45,
+        start,
+        end,
+        granularity=15,
+    ) == [
+        {"start": "2030-06-03T10:15:00Z", "end": "2030-06-03T11:00:00Z"},
+    ]
+    with pytest.raises(ValueError, match="granularity"):
+        calc_available_slots(busy_data, [1], 45, granularity=7)
+
+
+def test_format_interview_slot_rolls_over_midnight():
+    assert format_interview_slot(MONDAY, time(9, 30), 45) == {
+        "start": "2030-06-03T09:30:00Z",
+        "end": "2030-06-03T10:15:00Z",
+    }
+    assert format_interview_slot(MONDAY, time(23, 30), 60) == {
+        "start": "2030-06-03T23:30:00Z",
+        "end": "2030-06-04T00:30:00Z",
+    }
+    assert (
+        format_interview_slot(date(2030, 12, 31), time(23, 0), 1500)["end"]
+        == "2031-01-02T00:00:00Z"
+    )
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+
+from interviews.utils import calc_available_slots_with_date_range
+
+pytest.importorskip("numpy")
+
+from interviews.vectorized import calc_available_slots_vectorized
+
+CUTOFF = datetime.fromisoformat("2030-06-03T12:00:00")
+START = "2030-06-01T00:00:00Z"
+END = "2030-06-14T23:59:59Z"
+BUSY_DATA = [
+    {
+        "interviewerId": 1,
+        "busy": [
+            {"start": "2030-06-03T09:00:00Z", "end": "2030-06-03T15:00:00Z"},
+            {"start": "2030-06-04T10:10:00Z", "end": "2030-06-04T12:00:00Z"},
+            {"start": "2030-06-05T23:00:00Z", "end": "2030-06-06T10:30:00Z"},
+        ],
+    },
+    {
+        "interviewerId": 2,
+        "busy": [
+            {"start": "2030-06-03T16:00:00Z", "end": "2030-06-03T17:00:00Z"},
+            {"start": "2030-06-04T11:30:00Z", "end": "2030-06-04T13:00:00Z"},
+        ],
+    },
+]
+
+
+@pytest.mark.parametrize("duration", [15, 45, 60, 90])
+def test_vectorized_matches_bitmask_engine(duration: int):
+    vectorized = calc_available_slots_vectorized(
+        BUSY_DATA,
+        [1, 2, 3],
+        duration,
+        START,
+        END,
+        CUTOFF,
+    )
+    expected = calc_available_slots_with_date_range(
+        BUSY_DATA,
+        [1, 2, 3],
+        duration,
+        START,
+        END,
+    )
+    # the bitmask engine uses the real cutoff, both ranges are far enough in the future
+    # to agree
+    assert vectorized
+    assert vectorized == expected
+
+
+def test_vectorized_applies_cutoff():
+    slots = calc_available_slots_vectorized(
+        BUSY_DATA,
+        [1, 2],
+        60,
+        START,
+        END,
+        datetime.fromisoformat("2030-06-04T13:10:00"),
+    )
+    assert slots[0]["start"] == "2030-06-04T13:30:00Z"
+
+
+def test_vectorized_without_interviewers():
+    assert calc_available_slots_vectorized(BUSY_DATA, [], 60, START, END, CUTOFF) == []
@@ -0,0 +1,186 @@
+import json
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from interviews.cache import availability_cache
+from interviews.renderers import BitmapRenderer
+from interviews.renderers import decode_day_bitmap
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+def date_range_body(template, **extra):
+    start = datetime.now(UTC).date() + timedelta(days=2)
+    return {
+        "templateId": template.id,
+        "startDate": f"{start}T00:00:00Z",
+        "endDate": f"{start + timedelta(days=20)}T23:59:59Z",
+        **extra,
+    }
+
+
+def expand_bitmap(data):
+    slots = []
+    for day, encoded in data["availableStarts"].items():
+        mask = decode_day_bitmap(encoded)
+        for bit in range(data["slotsPerDay"]):
+            if mask >> bit & 1:
+                start = datetime.fromisoformat(day) + timedelta(
+                    minutes=bit * data["granularity"],
+                )
+                end = start + timedelta(minutes=data["durationMinutes"])
+                slots.append(
+                    {"start": start.isoformat() + "Z", "end": end.isoformat() + "Z"},
+                )
+    return slots
+
+
+def test_availability_etag(client, template, monkeypatch):
+    url = f"/api/interviews/{template.id}/availability/"
+    response = client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [interviewer["name"] for interviewer in response.json()["interviewers"]] == [
+        "Ada Lovelace",
+        "Alan Turing",
+    ]
+
+    def no_compute(*args, **kwargs):
+        msg = "slots were computed"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr("interviews.views.get_availability_slots", no_compute)
+    not_modified = client.get(url, headers={"If-None-Match": response["ETag"]})
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.content == b""
+
+
+def test_etag_follows_refetched_busy_data(client, template, monkeypatch):
+    url = f"/api/interviews/{template.id}/availability/"
+    first = client.get(url)
+    ada = template.interviewers.get(first_name="Ada").id
+    tomorrow = datetime.now(UTC).date() + timedelta(days=1)
+
+    # the cached busy data expires and the provider now has Ada busy every day of the
+    # window
+    cache.clear()
+    availability_cache.clear_local()
+    monkeypatch.setattr(
+        "interviews.availability.get_panel_busy_data",
+        lambda provider, interviewer_ids, *args: [
+            {
+                "interviewerId": ada,
+                "busy": [
+                    {
+                        "start": f"{tomorrow}T00:00:00Z",
+                        "end": f"{tomorrow + timedelta(days=60)}T00:00:00Z",
+                    },
+                ],
+            },
+        ],
+    )
+    second = client.get(url, headers={"If-None-Match": first["ETag"]})
+
+    assert second.status_code == status.HTTP_200_OK
+    assert second.json()["availableSlots"] != first.json()["availableSlots"]
+    assert second["ETag"] != first["ETag"]
+    assert (
+        client.get(url, headers={"If-None-Match": second["ETag"]}).status_code
+        == status.HTTP_304_NOT_MODIFIED
+    )
+
+
+def test_availability_bitmap_format(client, template):
+    url = f"/api/interviews/{template.id}/availability/"
+    slots = client.get(url).json()["availableSlots"]
+
+    by_param = client.get(url, {"format": "bitmap"})
+    by_accept = client.get(url, headers={"Accept": BitmapRenderer.media_type})
+
+    assert by_param["Content-Type"] == BitmapRenderer.media_type
+    assert by_param.content == by_accept.content
+    assert expand_bitmap(by_param.json()) == slots
+    assert by_param["ETag"] != client.get(url)["ETag"]
+
+
+def test_date_range_bitmap_format(client, template):
+    url = "/api/interviews/availability_date_range/"
+    body = date_range_body(template, granularity=15)
+    slots = client.post(url, body, format="json").json()["availableSlots"]
+
+    response = client.post(f"{url}?format=bitmap", body, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == BitmapRenderer.media_type
+    assert response.json()["granularity"] == body["granularity"]
+    assert expand_bitmap(response.json()) == slots
+
+
+def test_missing_template(client, template):
+    assert (
+        client.get(f"/api/interviews/{template.id + 1}/availability/").status_code
+        == status.HTTP_404_NOT_FOUND
+    )
+    response = client.post(
+        "/api/interviews/availability_date_range/",
+        date_range_body(template, templateId=template.id + 1),
+        format="json",
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_date_range_streaming(client, template, settings):
+    settings.INTERVIEWS_STREAM_CHUNK_DAYS = 3
+    url = "/api/interviews/availability_date_range/"
+    body = date_range_body(template)
+    response = client.post(url, body, format="json")
+    expected, expected_etag = response.json(), response["ETag"]
+
+    response = client.post(url, {**body, "stream": True}, format="json")
+
+    assert response.streaming
+    assert response["Content-Type"] == "application/json"
+    assert json.loads(b"".join(response.streaming_content)) == expected
+    assert response["ETag"] != expected_etag
+
+    not_modified = client.post(
+        url,
+        {**body, "stream": True},
+        format="json",
+        headers={"If-None-Match": response["ETag"]},
+    )
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not not_modified.streaming
+
+
+def test_server_timing_phases(client, template):
+    url = f"/api/interviews/{template.id}/availability/"
+
+    cold = {
+        metric.split(";")[0] for metric in client.get(url)["Server-Timing"].split(", ")
+    }
+    warm = {
+        metric.split(";")[0] for metric in client.get(url)["Server-Timing"].split(", ")
+    }
+
+    assert {
+        "roster",
+        "etag",
+        "cache",
+        "provider",
+        "compute",
+        "serialize",
+        "total",
+    } <= cold
+    assert "provider" not in warm
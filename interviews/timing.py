@@ -0,0 +1,123 @@
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.conf import settings
+
+logger = logging.getLogger("interviews_timing")
+
+
+class RequestTimings:
+    """
+    Self time per phase of one request. Phases nest: while an inner phase runs the outer
+    one is paused, so a provider fetch inside the result cache lookup counts as
+    provider, not cache, and the phases add up to at most the total.
+    """
+
+    def __init__(self):
+        self.phases = {}  # name -> seconds, in the order the phases first ran
+        self.stack = []  # [name, resumed at] of the open phases
+
+    def enter(self, name: str):
+        now = perf_counter()
+        if self.stack:
+            self.add(self.stack[-1][0], now - self.stack[-1][1])
+        self.stack.append([name, now])
+
+    def exit(self):
+        now = perf_counter()
+        name, resumed = self.stack.pop()
+        self.add(name, now - resumed)
+        if self.stack:
+            self.stack[-1][1] = now
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def header(self, total: float) -> str:
+        metrics = [*self.phases.items(), ("total", total)]
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in metrics
+        )
+
+
+# timings of the current request, None outside ServerTimingMiddleware (commands, shells,
+# tests)
+_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "interviews_timings",
+    default=None,
+)
+
+
+def get_request_timings() -> RequestTimings | None:
+    return _timings.get()
+
+
+@contextmanager
+def phase(name: str):
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    timings.enter(name)
+    try:
+        yield
+    finally:
+        timings.exit()
+
+
+def timed(name: str):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header with the phases timed during the request (roster, etag,
+    cache, provider, compute, log, serialize) and the total, and with
+    INTERVIEWS_TIMING_LOG one JSON line per request on the interviews_timing logger. For
+    streamed responses the total stops when the headers are ready, the body is computed
+    afterwards.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        total = perf_counter() - start
+
+        if settings.INTERVIEWS_SERVER_TIMING:
+            response["Server-Timing"] = timings.header(total)
+        if settings.INTERVIEWS_TIMING_LOG:
+            logger.info(
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        **{
+                            name: round(seconds * 1000, 2)
+                            for name, seconds in timings.phases.items()
+                        },
+                        "total": round(total * 1000, 2),
+                    },
+                ),
+            )
+        return response
@@ -1,354 +1,692 @@
-from datetime import datetime, timedelta, date, time
+import json
+import logging
 from collections import defaultdict
+from collections.abc import Iterator
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from functools import lru_cache
 from math import ceil
-import logging
-import json
+
+from .intervals import BusyInterval
+from .intervals import busy_between
+from .intervals import get_calendars
+from .intervals import merge_calendars
+from .intervals import normalize_busy_data
+from .log import debug_enabled
+from .log import lazy_message
+from .timing import timed
 
 logger = logging.getLogger("interviews_availability")
 
-# set of all possible 30 min time slots and then remove the busy ones
-# free slots for an interviewer
-def get_available_slots(busy_slots: list[dict[str, str]]) -> dict[date, list[tuple[time, time]]]:
-    work_hours = (9, 17)  # 9 AM to 5 PM
-    busy_days = defaultdict(set)
-    dates = set()
-    cutoff_datetime = datetime.utcnow() + timedelta(hours=24) # No slot may begin before this (less than 24 hours in the future)
-    
-    for slot in busy_slots:
-        start_dt = datetime.fromisoformat(slot["start"].rstrip("Z"))
-        end_dt = datetime.fromisoformat(slot["end"].rstrip("Z"))
+SLOT_MINUTES = 30  # default grid: every bit in a day bitmap covers one 30 min slot
+SLOT_GRANULARITIES = (5, 10, 15, 30)  # supported grid sizes in minutes
+MINUTES_PER_DAY = 24 * 60
+WORK_HOURS = (9, 17)  # 9 AM to 5 PM
+WORK_WINDOW = (WORK_HOURS[0] * 60, WORK_HOURS[1] * 60)  # minutes after midnight
+SATURDAY = 5  # date.weekday() of the first weekend day
+
+
+def validate_granularity(granularity: int) -> int:
+    if granularity not in SLOT_GRANULARITIES:
+        choices = ", ".join(map(str, SLOT_GRANULARITIES))
+        msg = f"Slot granularity must be one of {choices} minutes"
+        raise ValueError(msg)
+    return granularity
+
+
+def slots_per_day(granularity: int = SLOT_MINUTES) -> int:
+    # 48 bits per interviewer-day on the 30 min grid
+    return MINUTES_PER_DAY // granularity
+
+
+# Availability is kept as one integer bitmap per day: bit i is set when the slot
+# starting at i * granularity minutes after midnight is free. Intersecting a panel is a
+# bitwise AND per day and time objects are only created when the bitmaps are turned back
+# into slots.
+def slot_range_mask(start_slot: int, end_slot: int) -> int:
+    if end_slot <= start_slot:
+        return 0
+    return ((1 << (end_slot - start_slot)) - 1) << start_slot
+
+
+def parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.rstrip("Z"))
+
+
+# sorted busy intervals (see intervals.py) as (start_minute, end_minute) per day, blocks
+# running past midnight are split
+def get_busy_intervals(busy: list[BusyInterval]) -> dict[date, list[tuple[int, int]]]:
+    busy_intervals = defaultdict(list)
+
+    for start_dt, end_dt in busy:
         day = start_dt.date()
-        dates.add(day)
-        
-        # Convert start time to 30-minute slot index (index: 0-48)
-        start_slot = start_dt.hour * 2
-        if start_dt.minute >= 30:
-            start_slot += 1
-            
-        # Convert end time to 30-minute slot index (index: 0-48)
-        end_slot = end_dt.hour * 2
-        if end_dt.minute > 0:
-            end_slot += 1
-            
-        # Add each 30 min slot that is busy period to busy_days
-        for slot30min in range(start_slot, end_slot):
-            busy_days[day].add(slot30min)
-    
-    # Determine the date range
+
+        start_minute = start_dt.hour * 60 + start_dt.minute
+        while day < end_dt.date():  # block runs past midnight
+            busy_intervals[day].append((start_minute, MINUTES_PER_DAY))
+            day += timedelta(days=1)
+            start_minute = 0
+        end_minute = end_dt.hour * 60 + end_dt.minute
+        if end_dt.second or end_dt.microsecond:
+            end_minute += 1
+        busy_intervals[day].append((start_minute, end_minute))
+
+    return busy_intervals
+
+
+# sweep-line over the busy intervals sorted by start: anything between the furthest busy
+# end seen so far and the next busy start is free. Normalized busy data is already
+# sorted.
+def get_free_intervals(
+    busy_intervals,
+    window: tuple[int, int] = WORK_WINDOW,
+    *,
+    presorted: bool = False,
+) -> list[tuple[int, int]]:
+    window_start, window_end = window
+    free_intervals = []
+    cursor = window_start
+
+    for start, end in busy_intervals if presorted else sorted(busy_intervals):
+        if start >= window_end:
+            break
+        if start > cursor:
+            free_intervals.append((cursor, start))
+        cursor = max(cursor, end)
+
+    if cursor < window_end:
+        free_intervals.append((cursor, window_end))
+    return free_intervals
+
+
+# a slot is only free when it lies entirely inside a free interval
+def intervals_to_mask(intervals, granularity: int = SLOT_MINUTES) -> int:
+    mask = 0
+    for start, end in intervals:
+        mask |= slot_range_mask(-(-start // granularity), end // granularity)
+    return mask
+
+
+def get_free_masks(
+    busy_intervals: dict[date, list[tuple[int, int]]],
+    dates,
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, int]:
+    free_masks = {}
+    for day in dates:
+        if day.weekday() >= SATURDAY:  # Skip Saturday and Sunday (5, 6)
+            continue
+        free_intervals = get_free_intervals(busy_intervals.get(day, ()), presorted=True)
+        free_masks[day] = intervals_to_mask(free_intervals, granularity)
+    return free_masks
+
+
+# bits of `day` whose slot begins at or after cutoff_datetime
+def get_cutoff_mask(
+    day: date,
+    cutoff_datetime: datetime,
+    granularity: int = SLOT_MINUTES,
+) -> int:
+    cutoff_day = cutoff_datetime.date()
+    if day > cutoff_day:
+        return slot_range_mask(0, slots_per_day(granularity))
+    if day < cutoff_day:
+        return 0
+    seconds = (
+        cutoff_datetime.hour * 3600
+        + cutoff_datetime.minute * 60
+        + cutoff_datetime.second
+    )
+    if cutoff_datetime.microsecond:
+        seconds += 1
+    first_slot = -(-seconds // (granularity * 60))
+    return slot_range_mask(first_slot, slots_per_day(granularity))
+
+
+def apply_cutoff(
+    free_masks: dict[date, int],
+    cutoff_datetime: datetime,
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, int]:
+    return {
+        day: mask & get_cutoff_mask(day, cutoff_datetime, granularity)
+        for day, mask in free_masks.items()
+    }
+
+
+def get_default_cutoff() -> datetime:
+    # No slot may begin before this (less than 24 hours in the future)
+    return datetime.utcnow() + timedelta(hours=24)
+
+
+def date_range(start_date: date, end_date: date) -> list[date]:
+    return [
+        start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)
+    ]
+
+
+# free bitmaps for an interviewer's normalized busy intervals, from today until the last
+# day they have a busy block
+def get_available_masks(
+    busy: list[BusyInterval],
+    cutoff_datetime: datetime | None = None,
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, int]:
+    if cutoff_datetime is None:
+        cutoff_datetime = get_default_cutoff()
+    busy_intervals = get_busy_intervals(busy)
+
     start_date = datetime.utcnow().date()
+    dates = set(busy_intervals)
     if not dates:
         dates = {start_date}
     else:
-        max_date = max(dates)
-        days_to_include = (max_date - start_date).days + 1 # include last day
-        for i in range(days_to_include):
-            current_date = start_date + timedelta(days=i)
-            dates.add(current_date)
-    
-    # find all available slots
-    all_available_slots = {}
-    for day in sorted(dates):
-        if day.weekday() >= 5: # Skip Saturday and Sunday (5, 6)
-            continue
+        dates.update(date_range(start_date, max(dates)))
 
-        # All possible work hour 30-minute slots
-        # 16 slots per dat
-        work_start_slot = work_hours[0] * 2  # 18
-        work_end_slot = work_hours[1] * 2    # 34
-        all_slots = set(range(work_start_slot, work_end_slot))
-        
-        # Remove busy slots
-        available_slots = all_slots - busy_days[day]
-        
-        # Convert to start and end time tuple (start_time, end_time)
-        slots = []
-        for free_slot in sorted(available_slots):
-            start_hour = free_slot // 2 # extract hour from 30-min time slot
-            if free_slot % 2 == 0:
-                start_minute = 0
-            else:
-                start_minute = 30
-            start_time = time(start_hour, start_minute)
-            
-            slot_datetime = datetime.combine(day, time(start_hour, start_minute))
-            if slot_datetime < cutoff_datetime: # check cutoff threshold 
-                continue
-
-            # Find end time (30 mins later)
-            end_hour = start_hour
-            if start_minute == 0:
-                end_minute = 30
-            else:
-                end_minute = 0
-                end_hour += 1  # When start time is at the 30 min mark jump to next hour
-                
-            end_time = time(end_hour, end_minute)
-            slots.append((start_time, end_time))
-        
-        all_available_slots[day] = slots
-    
-    return all_available_slots
-
-def get_available_slots_range(interviewers_data: list[dict], start_date_str: str, end_date_str: str) -> dict[date, list[tuple[time, time]]]:
-    work_hours = (9, 17)  # 9 AM to 5 PM
-    busy_days = defaultdict(set)
-    cutoff_datetime = datetime.utcnow() + timedelta(hours=24)
-    
-    for interviewer in interviewers_data:
-        for slot in interviewer["busy"]:
-            start_dt = datetime.fromisoformat(slot["start"].rstrip("Z"))
-            end_dt = datetime.fromisoformat(slot["end"].rstrip("Z"))
-            day = start_dt.date()
-            
-            # Convert start time to 30-minute slot index (index: 0-48)
-            start_slot = start_dt.hour * 2
-            if start_dt.minute >= 30:
-                start_slot += 1
-                
-            # Convert end time to 30-minute slot index (index: 0-48)
-            end_slot = end_dt.hour * 2
-            if end_dt.minute > 0:
-                end_slot += 1
-                
-            # Add each 30 min slot that is busy period to busy_days
-            for slot30min in range(start_slot, end_slot):
-                busy_days[day].add(slot30min)
-    
-    start_date = datetime.fromisoformat(start_date_str.rstrip("Z")).date()
-    end_date = datetime.fromisoformat(end_date_str.rstrip("Z")).date()
-    
-    # Generate date range
-    dates = []
-    current_date = start_date
-    while current_date <= end_date:
-        dates.append(current_date)
-        current_date += timedelta(days=1)
-    
-    # find all available slots
-    all_available_slots = {}
-    for day in dates:
-        if day.weekday() >= 5: # Skip Saturday and Sunday (5, 6)
-            continue
-        
-        # All possible work hour 30-minute slots
-        # 16 slots per day
-        work_start_slot = work_hours[0] * 2  # 18
-        work_end_slot = work_hours[1] * 2    # 34
-        all_slots = set(range(work_start_slot, work_end_slot))
-        
-        # Remove busy slots
-        available_slots = all_slots - busy_days[day]
-        
-        # Convert to start and end time tuple (start_time, end_time)
-        slots = []
-        for free_slot in sorted(available_slots):
-            start_hour = free_slot // 2 # extract hour from 30-min time slot
-            if free_slot % 2 == 0:
-                start_minute = 0
-            else:
-                start_minute = 30
-            start_time = time(start_hour, start_minute)
-            
-            slot_datetime = datetime.combine(day, time(start_hour, start_minute))
-            if slot_datetime < cutoff_datetime: # check cutoff threshold 
-                continue
-            # Find end time (30 mins later)
-            end_hour = start_hour
-            if start_minute == 0:
-                end_minute = 30
-            else:
-                end_minute = 0
-                end_hour += 1  # When start time is at the 30 min mark jump to next hour
-                
-            end_time = time(end_hour, end_minute)
-            slots.append((start_time, end_time))
-        
-        if slots:  # Only add dates that have available slots
-            all_available_slots[day] = slots
-    
-    return all_available_slots
-
-def get_shared_slots(interviewers_availability: dict[int, dict[date, list[time]]]) -> dict[date, list[time]]:
-    date_counts = defaultdict(dict)
-    
-    # count occurrences for every slot held by interviewers
-    for all_slots in interviewers_availability.values():
-        for date, times in all_slots.items():
-            for time in times:
-                date_counts[date][time] = date_counts[date].get(time, 0) + 1
-    
-    # find slot overlap
-    shared_slots = {}
-    interviewers_count = len(interviewers_availability)
-    for date in sorted(date_counts.keys()):
-        common_times = []
-        
-        for time, count in date_counts[date].items():
-            if count == interviewers_count:
-                common_times.append(time)
-        
-        # Only add dates with available times
-        if common_times:
-            sorted_times = sorted(common_times)
-            shared_slots[date] = sorted_times
-    
-    return shared_slots
-
-def get_interview_slots(matching_slots: dict[date, list[tuple[time, time]]], duration: int) -> list[dict[str, str]]:
-    def find_required_slots(slots, start_index, count):
-        for i in range(start_index, start_index + count - 1):   # check slots sequentially for contiguous block
-            curr_slot_end_time = slots[i][1]
-            next_slot_start_time = slots[i+1][0]
-            
-            if curr_slot_end_time != next_slot_start_time:      # return false if they dont match (gap)
-                return False
-        return True
-
-    slot_size = 30  # assumes all interviewer slots are on 30 min interval
-    slots_needed = ceil(duration / slot_size)
+    free_masks = get_free_masks(busy_intervals, sorted(dates), granularity)
+    return apply_cutoff(free_masks, cutoff_datetime, granularity)
+
+
+# free bitmaps (before the cutoff) for every weekday between start_date and end_date,
+# including days without free slots
+def get_range_free_masks(
+    busy: list[BusyInterval],
+    start_date: date,
+    end_date: date,
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, int]:
+    # only the blocks overlapping the requested days are split into per day intervals
+    window_start = datetime.combine(start_date, time())
+    window_end = datetime.combine(end_date + timedelta(days=1), time())
+    busy_intervals = get_busy_intervals(busy_between(busy, window_start, window_end))
+    return get_free_masks(busy_intervals, date_range(start_date, end_date), granularity)
+
+
+# free bitmaps for normalized busy intervals between two ISO dates, dropping days
+# without free slots
+def get_available_masks_range(
+    busy: list[BusyInterval],
+    start_date_str: str,
+    end_date_str: str,
+    cutoff_datetime: datetime | None = None,
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, int]:
+    if cutoff_datetime is None:
+        cutoff_datetime = get_default_cutoff()
+    start_date = parse_datetime(start_date_str).date()
+    end_date = parse_datetime(end_date_str).date()
+
+    free_masks = get_range_free_masks(busy, start_date, end_date, granularity)
+    free_masks = apply_cutoff(free_masks, cutoff_datetime, granularity)
+
+    return {day: mask for day, mask in free_masks.items() if mask}
+
+
+# panel availability: AND every interviewer's bitmap per day, a day missing for anyone
+# is busy
+def get_shared_masks(interviewers_masks: dict[int, dict[date, int]]) -> dict[date, int]:
+    if not interviewers_masks:
+        return {}
+
+    all_masks = iter(interviewers_masks.values())
+    shared_masks = dict(next(all_masks))
+    for masks in all_masks:
+        shared_masks = {
+            day: mask & masks.get(day, 0) for day, mask in shared_masks.items()
+        }
+
+    # Only keep dates with available times
+    return {day: mask for day, mask in sorted(shared_masks.items()) if mask}
+
+
+@lru_cache(maxsize=1024)
+def slot_time(slot: int, granularity: int = SLOT_MINUTES) -> time:
+    minutes = (slot * granularity) % MINUTES_PER_DAY
+    return time(minutes // 60, minutes % 60)
+
+
+def time_to_slot(slot_time: time, granularity: int = SLOT_MINUTES) -> int:
+    return (slot_time.hour * 60 + slot_time.minute) // granularity
+
+
+# Convert a day bitmap to start and end time tuples (start_time, end_time)
+def mask_to_slots(
+    mask: int,
+    granularity: int = SLOT_MINUTES,
+) -> list[tuple[time, time]]:
+    slots = []
+    while mask:
+        lowest_bit = mask & -mask
+        slot = lowest_bit.bit_length() - 1
+        slots.append((slot_time(slot, granularity), slot_time(slot + 1, granularity)))
+        mask ^= lowest_bit
+    return slots
+
+
+def masks_to_slots(
+    masks: dict[date, int],
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, list[tuple[time, time]]]:
+    return {day: mask_to_slots(mask, granularity) for day, mask in masks.items()}
+
+
+def slots_to_masks(
+    slots_by_day: dict[date, list[tuple[time, time]]],
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, int]:
+    masks = {}
+    for day, slots in slots_by_day.items():
+        mask = 0
+        for start_time, _ in slots:
+            mask |= 1 << time_to_slot(start_time, granularity)
+        masks[day] = mask
+    return masks
+
+
+# free slots for an interviewer
+def get_available_slots(
+    busy_slots: list[dict[str, str]],
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, list[tuple[time, time]]]:
+    busy = merge_calendars([busy_slots])
+    return masks_to_slots(
+        get_available_masks(busy, granularity=granularity),
+        granularity,
+    )
+
+
+def get_available_slots_range(
+    interviewers_data: list[dict],
+    start_date_str: str,
+    end_date_str: str,
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, list[tuple[time, time]]]:
+    busy = merge_calendars(
+        [
+            calendar
+            for interviewer in interviewers_data
+            for calendar in get_calendars(interviewer)
+        ],
+    )
+    return masks_to_slots(
+        get_available_masks_range(
+            busy,
+            start_date_str,
+            end_date_str,
+            granularity=granularity,
+        ),
+        granularity,
+    )
+
+
+def get_shared_slots(
+    interviewers_availability: dict[int, dict[date, list[tuple[time, time]]]],
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, list[tuple[time, time]]]:
+    interviewers_masks = {
+        interviewer_id: slots_to_masks(all_slots, granularity)
+        for interviewer_id, all_slots in interviewers_availability.items()
+    }
+    return masks_to_slots(get_shared_masks(interviewers_masks), granularity)
+
+
+# durations are rounded up to whole slots, so the finer the grid the less time is wasted
+def get_slots_needed(duration: int, granularity: int = SLOT_MINUTES) -> int:
+    return max(1, ceil(duration / granularity))
+
+
+# bit i of the result is set when slots i .. i + slots_needed - 1 are all free in mask.
+# AND-ing the mask with itself shifted doubles the run length each step, so a 90 min
+# interview needs 2 integer ops per day instead of a scan per start position
+def get_interview_starts(mask: int, slots_needed: int) -> int:
+    starts = mask
+    covered = 1
+    while covered < slots_needed and starts:
+        shift = min(covered, slots_needed - covered)
+        starts &= starts >> shift
+        covered += shift
+    return starts
+
+
+# Slot boundaries are a small set (day x minute on the grid) that every response and
+# every cached result formats again, so the strings are memoized; minutes past midnight
+# roll over into the following days like timedelta would.
+@lru_cache(maxsize=65536)
+def format_timestamp(day: date, minutes: int) -> str:
+    if not 0 <= minutes < MINUTES_PER_DAY:
+        day += timedelta(days=minutes // MINUTES_PER_DAY)
+        minutes %= MINUTES_PER_DAY
+    return f"{day.isoformat()}T{minutes // 60:02d}:{minutes % 60:02d}:00Z"
+
+
+def format_interview_slot(day: date, start_time: time, duration: int) -> dict[str, str]:
+    start_minutes = start_time.hour * 60 + start_time.minute
+    return {
+        "start": format_timestamp(day, start_minutes),
+        "end": format_timestamp(day, start_minutes + duration),
+    }
+
+
+# per day bitmap of the slots an interview can start at, days without any start are
+# dropped
+def get_interview_start_masks(
+    shared_masks: dict[date, int],
+    duration: int,
+    granularity: int = SLOT_MINUTES,
+) -> dict[date, int]:
+    slots_needed = get_slots_needed(duration, granularity)
+    start_masks = {
+        day: get_interview_starts(mask, slots_needed)
+        for day, mask in shared_masks.items()
+    }
+    return {day: starts for day, starts in start_masks.items() if starts}
+
+
+# generator version for streaming responses: one list of interview slots per day with
+# starts
+def iter_interview_slots_from_starts(
+    start_masks: dict[date, int],
+    duration: int,
+    granularity: int = SLOT_MINUTES,
+) -> Iterator[list[dict[str, str]]]:
+    for day, day_starts in start_masks.items():
+        day_interviews = []
+        starts = day_starts
+        while starts:
+            lowest_bit = starts & -starts
+            start_time = slot_time(lowest_bit.bit_length() - 1, granularity)
+            day_interviews.append(format_interview_slot(day, start_time, duration))
+            starts ^= lowest_bit
+        yield day_interviews
+
+
+def get_interview_slots_from_starts(
+    start_masks: dict[date, int],
+    duration: int,
+    granularity: int = SLOT_MINUTES,
+) -> list[dict[str, str]]:
+    return [
+        slot
+        for day_interviews in iter_interview_slots_from_starts(
+            start_masks,
+            duration,
+            granularity,
+        )
+        for slot in day_interviews
+    ]
+
+
+def get_interview_slots_from_masks(
+    shared_masks: dict[date, int],
+    duration: int,
+    granularity: int = SLOT_MINUTES,
+) -> list[dict[str, str]]:
+    return get_interview_slots_from_starts(
+        get_interview_start_masks(shared_masks, duration, granularity),
+        duration,
+        granularity,
+    )
+
+
+def get_interview_slots(
+    matching_slots: dict[date, list[tuple[time, time]]],
+    duration: int,
+    granularity: int = SLOT_MINUTES,
+) -> list[dict[str, str]]:
+    slots_needed = get_slots_needed(duration, granularity)
     available_interviews = []
-    
+
     for day, time_slots in matching_slots.items():
         sorted_slots = sorted(time_slots)
-        
-        # check each possible starting position for a sequence of consecutive time slots that fit the required slots_needed
-        for start_index in range(len(sorted_slots) - slots_needed + 1): # include last slot
-            # Check if slots from start_index are consecutive
-            if find_required_slots(sorted_slots, start_index, slots_needed):
-                # Create interview slot if required slots are available
-                interview_start = datetime.combine(day, sorted_slots[start_index][0])
-                interview_end = interview_start + timedelta(minutes=duration)
-                interview_slot = {
-                    "start": interview_start.isoformat() + "Z",
-                    "end": interview_end.isoformat() + "Z"
-                }
-                available_interviews.append(interview_slot)
-    
+
+        # single pass: track where the current contiguous run began and emit a start
+        # every time the run is long enough to hold slots_needed slots
+        run_start = 0
+        for index, (start_time, _) in enumerate(sorted_slots):
+            if (
+                index and sorted_slots[index - 1][1] != start_time
+            ):  # gap, start a new run
+                run_start = index
+            if index - run_start + 1 >= slots_needed:
+                interview_start_time = sorted_slots[index - slots_needed + 1][0]
+                available_interviews.append(
+                    format_interview_slot(day, interview_start_time, duration),
+                )
+
     return available_interviews
 
-def calc_available_slots(busy_data: list[dict], interviewer_ids: list[int], duration: int) -> list[dict[str, str]]:
-    interviewers_availability = {}
+
+def calc_available_slots(
+    busy_data: list[dict],
+    interviewer_ids: list[int],
+    duration: int,
+    granularity: int = SLOT_MINUTES,
+) -> list[dict[str, str]]:
+    validate_granularity(granularity)
+    cutoff_datetime = get_default_cutoff()
+    normalized_busy = normalize_busy_data(busy_data)
+    interviewers_masks = {}
     for interviewer_id in interviewer_ids:
-        for item in busy_data:
-            if item["interviewerId"] == interviewer_id:
-                available_slots = get_available_slots(item["busy"])
-                log_available_slots(available_slots, interviewer_id) # /logs/interviews_availability.log
-                interviewers_availability[interviewer_id] = available_slots
-                break
-    
-    shared_slots = get_shared_slots(interviewers_availability)
-    log_available_slots(shared_slots)                                # /logs/interviews_availability.log
-    interview_slots = get_interview_slots(shared_slots, duration)
-    log_interview_slots(interview_slots, duration)                   # /logs/interviews_availability.log
+        if interviewer_id not in normalized_busy:
+            continue
+        available_masks = get_available_masks(
+            normalized_busy[interviewer_id],
+            cutoff_datetime,
+            granularity,
+        )
+        # /logs/interviews_availability.log
+        log_available_masks(available_masks, interviewer_id, granularity)
+        interviewers_masks[interviewer_id] = available_masks
+
+    shared_masks = get_shared_masks(interviewers_masks)
+    # /logs/interviews_availability.log
+    log_available_masks(shared_masks, granularity=granularity)
+    interview_slots = get_interview_slots_from_masks(
+        shared_masks,
+        duration,
+        granularity,
+    )
+    log_interview_slots(interview_slots, duration)  # /logs/interviews_availability.log
 
     return interview_slots
 
-# def calc_available_slots_with_date_range(busy_data: list[dict], interviewer_ids: list[int], duration: int, start_date_str: str, end_date_str: str) -> list[dict[str, str]]:
-#     interviewers_availability = {}
-    
-#     for interviewer_id in interviewer_ids:
-#         interviewer_busy = None
-#         for item in busy_data:
-#             if item["interviewerId"] == interviewer_id:
-#                 interviewer_busy = item
-#                 break
-        
-#         available_slots = get_available_slots_range([interviewer_busy], start_date_str, end_date_str)
-#         log_available_slots(available_slots, interviewer_id)
-#         interviewers_availability[interviewer_id] = available_slots
-    
-#     shared_slots = get_shared_slots(interviewers_availability)
-#     log_available_slots(shared_slots)
-#     interview_slots = get_interview_slots(shared_slots, duration)
-#     log_interview_slots(interview_slots, duration)
-    
-#     return interview_slots
-
-def calc_available_slots_with_date_range(busy_data: list[dict], interviewer_ids: list[int], duration: int, start_date_str: str, end_date_str: str) -> list[dict[str, str]]:
-    interviewers_availability = {}
-    
+
+def calc_available_slots_with_date_range(  # noqa: PLR0913
+    busy_data: list[dict],
+    interviewer_ids: list[int],
+    duration: int,
+    start_date_str: str,
+    end_date_str: str,
+    engine: str = "bitmask",
+    granularity: int = SLOT_MINUTES,
+) -> list[dict[str, str]]:
+    validate_granularity(granularity)
+    cutoff_datetime = get_default_cutoff()
+
+    if engine == "numpy":
+        from .vectorized import calc_available_slots_vectorized
+        from .vectorized import numpy_available
+
+        if numpy_available():
+            interview_slots = calc_available_slots_vectorized(
+                busy_data,
+                interviewer_ids,
+                duration,
+                start_date_str,
+                end_date_str,
+                cutoff_datetime,
+                granularity,
+            )
+            log_interview_slots(interview_slots, duration)
+            return interview_slots
+        logger.warning(
+            "numpy is not installed, falling back to the bitmask availability engine",
+        )
+
+    normalized_busy = normalize_busy_data(busy_data)
+    start_date = parse_datetime(start_date_str).date()
+    end_date = parse_datetime(end_date_str).date()
+    interviewers_free_masks = {}
+
     # Debug: log what we're working with
-    logger.debug(f"Processing interviewer_ids: {interviewer_ids}")
-    
+    logger.debug("Processing interviewer_ids: %s", interviewer_ids)
+
     for interviewer_id in interviewer_ids:
-        # Debug: log which interviewer we're processing
-        logger.debug(f"Processing interviewer ID: {interviewer_id}")
-        
-        interviewer_busy = None
-        for item in busy_data:
-            if item["interviewerId"] == interviewer_id:
-                interviewer_busy = item
-                break
-        
-        # Debug: log what we found for this interviewer
-        logger.debug(f"Found interviewer_busy for ID {interviewer_id}: {interviewer_busy}")
-        
+        interviewer_busy = normalized_busy.get(interviewer_id)
         if interviewer_busy is None:
-            interviewer_busy = {
-                "interviewerId": interviewer_id,
-                "name": f"Interviewer {interviewer_id}",
-                "busy": []
-            }
-            # Debug: log when we create a default entry
-            logger.debug(f"Created default entry for ID {interviewer_id}")
-        
-        available_slots = get_available_slots_range([interviewer_busy], start_date_str, end_date_str)
-        # Debug: log what we got back
-        logger.debug(f"Available slots for ID {interviewer_id}: {available_slots}")
-        
-        log_available_slots(available_slots, interviewer_id)
-        interviewers_availability[interviewer_id] = available_slots
-    
-    # Debug: show what's in our final dictionary
-    logger.debug(f"Final interviewers_availability: {list(interviewers_availability.keys())}")
-    
-    shared_slots = get_shared_slots(interviewers_availability)
-    log_available_slots(shared_slots)
-    interview_slots = get_interview_slots(shared_slots, duration)
+            interviewer_busy = []
+            # Debug: log when an interviewer has no busy data
+            logger.debug("No busy data for ID %s, treating as free", interviewer_id)
+
+        interviewers_free_masks[interviewer_id] = get_range_free_masks(
+            interviewer_busy,
+            start_date,
+            end_date,
+            granularity,
+        )
+
+    return calc_available_slots_from_free_masks(
+        interviewers_free_masks,
+        duration,
+        granularity,
+        cutoff_datetime,
+    )
+
+
+# cutoff, panel intersection and interview start bitmaps for per-interviewer free
+# bitmaps from get_range_free_masks (or the cache)
+def calc_interview_starts_from_free_masks(
+    interviewers_free_masks: dict[int, dict[date, int]],
+    duration: int,
+    granularity: int = SLOT_MINUTES,
+    cutoff_datetime: datetime | None = None,
+) -> dict[date, int]:
+    if cutoff_datetime is None:
+        cutoff_datetime = get_default_cutoff()
+    interviewers_masks = {}
+
+    for interviewer_id, free_masks in interviewers_free_masks.items():
+        available_masks = {
+            day: mask
+            for day, mask in apply_cutoff(
+                free_masks,
+                cutoff_datetime,
+                granularity,
+            ).items()
+            if mask
+        }
+        log_available_masks(available_masks, interviewer_id, granularity)
+        interviewers_masks[interviewer_id] = available_masks
+
+    shared_masks = get_shared_masks(interviewers_masks)
+    log_available_masks(shared_masks, granularity=granularity)
+    return get_interview_start_masks(shared_masks, duration, granularity)
+
+
+def calc_available_slots_from_free_masks(
+    interviewers_free_masks: dict[int, dict[date, int]],
+    duration: int,
+    granularity: int = SLOT_MINUTES,
+    cutoff_datetime: datetime | None = None,
+) -> list[dict[str, str]]:
+    start_masks = calc_interview_starts_from_free_masks(
+        interviewers_free_masks,
+        duration,
+        granularity,
+        cutoff_datetime,
+    )
+    interview_slots = get_interview_slots_from_starts(
+        start_masks,
+        duration,
+        granularity,
+    )
     log_interview_slots(interview_slots, duration)
-    
+
     return interview_slots
 
+
 # use on:
 #   get_free_busy_data()
+@timed("log")
 def log_busydata(data):
-    formatted_json = json.dumps(data, indent=4, default=str)
-    logger.debug(f"Inital busy slots generated by get_free_busy_data()\n{formatted_json}\n")
+    if debug_enabled(logger):
+        logger.debug(
+            "Inital busy slots generated by get_free_busy_data()\n%s\n",
+            lazy_message(json.dumps, data, indent=4, default=str),
+        )
 
-# use on:
-#   get_available_slots()
-#   get_shared_slots()
-def log_available_slots(available_slots, InterviewerId=""):
+
+def format_available_slots(available_slots, interviewer_id=""):
     log_lines = []
-    
+
     for slot_date, slots in sorted(available_slots.items()):
         weekday = slot_date.strftime("%A")
         date_str = f"{slot_date.isoformat()} ({weekday})"
         log_lines.append(f"\n{date_str}")
         log_lines.append("-" * len(date_str))
-        
+
         for start_time, end_time in slots:
             start_str = start_time.strftime("%I:%M %p").lstrip("0")
             end_str = end_time.strftime("%I:%M %p").lstrip("0")
             log_lines.append(f"  {start_str} - {end_str}")
-    
+
     formatted_output = "\n".join(log_lines)
-    if not InterviewerId: 
+    if not interviewer_id:
         msg = "Available slots (Shared):"
     else:
-        msg = f"Available slots (ID: {InterviewerId}):"
+        msg = f"Available slots (ID: {interviewer_id}):"
+
+    return f"{msg}\n{formatted_output}\n"
 
-    logger.debug(f"{msg}\n{formatted_output}\n")
 
 # use on:
-#   get_interview_slots()
-def log_interview_slots(interview_slots, duration):
+#   get_available_slots()
+#   get_shared_slots()
+@timed("log")
+def log_available_slots(available_slots, InterviewerId=""):
+    if debug_enabled(logger):
+        logger.debug(
+            "%s",
+            lazy_message(format_available_slots, available_slots, InterviewerId),
+        )
+
+
+# only materialize slot times when the debug log will actually be written
+@timed("log")
+def log_available_masks(available_masks, interviewer_id="", granularity=SLOT_MINUTES):
+    if debug_enabled(logger):
+        logger.debug(
+            "%s",
+            lazy_message(
+                lambda: format_available_slots(
+                    masks_to_slots(available_masks, granularity),
+                    interviewer_id,
+                ),
+            ),
+        )
+
+
+def format_interview_slots(interview_slots, duration):
     lines = [f"\nAvailable {duration}-minute interview slots:"]
-    
+
     for slot in interview_slots:
         start = datetime.fromisoformat(slot["start"])
         end = datetime.fromisoformat(slot["end"])
-        lines.append(f"{start.strftime('%Y-%m-%d %I:%M %p')} to {end.strftime('%Y-%m-%d %I:%M %p')}")
-    
-    message = "\n".join(lines)
-    logger.debug(message + "\n")
\ No newline at end of file
+        lines.append(
+            f"{start:%Y-%m-%d %I:%M %p} to {end:%Y-%m-%d %I:%M %p}",
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+# use on:
+#   get_interview_slots()
+@timed("log")
+def log_interview_slots(interview_slots, duration):
+    if debug_enabled(logger):
+        logger.debug(
+            "%s",
+            lazy_message(format_interview_slots, interview_slots, duration),
+        )
@@ -0,0 +1,134 @@
+from datetime import datetime
+from datetime import timedelta
+from math import ceil
+
+# numpy is optional, the bitmask engine in utils.py is used without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .intervals import get_calendars
+from .utils import SLOT_MINUTES
+from .utils import WORK_WINDOW
+from .utils import format_interview_slot
+from .utils import get_default_cutoff
+from .utils import get_slots_needed
+from .utils import parse_datetime
+from .utils import slot_time
+from .utils import slots_per_day
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+# row index, start and end of every busy block, one row per interviewer. Every calendar
+# of an interviewer lands on the same row, overlaps are absorbed by the difference array
+# in calc_available_slots_vectorized; interviewers without busy data are free all day
+def get_busy_blocks(
+    busy_data: list[dict],
+    interviewer_ids: list[int],
+) -> tuple[list[int], list[str], list[str]]:
+    calendars_by_id = {}
+    for item in busy_data:
+        calendars_by_id.setdefault(item["interviewerId"], []).extend(
+            get_calendars(item),
+        )
+
+    rows, starts, ends = [], [], []
+    for row, interviewer_id in enumerate(interviewer_ids):
+        for calendar in calendars_by_id.get(interviewer_id, []):
+            for slot in calendar:
+                rows.append(row)
+                starts.append(slot["start"].rstrip("Z"))
+                ends.append(slot["end"].rstrip("Z"))
+    return rows, starts, ends
+
+
+# Whole range at once: a (interviewers x days x slots) busy array is built from every
+# busy block, the weekday, work hours and cutoff masks are applied to the whole grid,
+# the panel is reduced with all(axis=0) and interview starts come from a sliding window
+# sum over each day.
+def calc_available_slots_vectorized(  # noqa: PLR0913
+    busy_data: list[dict],
+    interviewer_ids: list[int],
+    duration: int,
+    start_date_str: str,
+    end_date_str: str,
+    cutoff_datetime: datetime | None = None,
+    granularity: int = SLOT_MINUTES,
+) -> list[dict[str, str]]:
+    if np is None:
+        msg = "numpy is required for the vectorized availability engine"
+        raise RuntimeError(msg)
+    if cutoff_datetime is None:
+        cutoff_datetime = get_default_cutoff()
+    if not interviewer_ids:
+        return []
+
+    start_date = parse_datetime(start_date_str).date()
+    end_date = parse_datetime(end_date_str).date()
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        return []
+    origin = datetime.combine(start_date, datetime.min.time())
+    day_slots = slots_per_day(granularity)
+    total_slots = days * day_slots
+    slot_seconds = granularity * 60
+
+    rows, starts, ends = get_busy_blocks(busy_data, interviewer_ids)
+
+    # difference array: +1 where a busy block starts, -1 where it ends, cumsum > 0 is
+    # busy
+    changes = np.zeros((len(interviewer_ids), total_slots + 1), dtype=np.int32)
+    if rows:
+        # numpy parses the ISO strings in bulk, offsets are in seconds from the start of
+        # the range
+        range_origin = np.datetime64(start_date, "s")
+        start_offsets = (np.array(starts, dtype="datetime64[s]") - range_origin).astype(
+            np.int64,
+        )
+        end_offsets = (np.array(ends, dtype="datetime64[s]") - range_origin).astype(
+            np.int64,
+        )
+        rows_arr = np.asarray(rows)
+        # starts round down, ends round up
+        starts_arr = np.clip(start_offsets // slot_seconds, 0, total_slots)
+        ends_arr = np.clip(-(-end_offsets // slot_seconds), 0, total_slots)
+        keep = starts_arr < ends_arr
+        np.add.at(changes, (rows_arr[keep], starts_arr[keep]), 1)
+        np.add.at(changes, (rows_arr[keep], ends_arr[keep]), -1)
+    busy = (np.cumsum(changes, axis=1)[:, :-1] > 0).reshape(
+        len(interviewer_ids),
+        days,
+        day_slots,
+    )
+
+    # Skip Saturday and Sunday
+    weekday_mask = np.is_busday(np.datetime64(start_date, "D") + np.arange(days))
+    work_mask = np.zeros(day_slots, dtype=bool)
+    work_mask[-(-WORK_WINDOW[0] // granularity) : WORK_WINDOW[1] // granularity] = True
+    cutoff_slot = ceil((cutoff_datetime - origin).total_seconds() / slot_seconds)
+    cutoff_mask = (np.arange(total_slots) >= cutoff_slot).reshape(days, day_slots)
+
+    free = ~busy
+    shared = free.all(axis=0) & weekday_mask[:, None] & work_mask[None, :] & cutoff_mask
+
+    # sliding window sum of free slots within each day, a start is valid when the whole
+    # window is free
+    slots_needed = get_slots_needed(duration, granularity)
+    if slots_needed > day_slots:
+        return []
+    running = np.zeros((days, day_slots + 1), dtype=np.int32)
+    np.cumsum(shared, axis=1, out=running[:, 1:])
+    valid = (running[:, slots_needed:] - running[:, :-slots_needed]) == slots_needed
+
+    return [
+        format_interview_slot(
+            start_date + timedelta(days=int(day_index)),
+            slot_time(int(slot_index), granularity),
+            duration,
+        )
+        for day_index, slot_index in zip(*np.nonzero(valid), strict=True)
+    ]
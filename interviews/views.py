@@ -1,242 +1,517 @@
-from django.shortcuts import render, get_object_or_404
+import logging
 
-from services.mock_availability import get_free_busy_data, get_free_busy_data_range
-from .serializers import InterviewAvailabilitySerializer
-from .models import InterviewTemplate, Interviewer
-from rest_framework.permissions import AllowAny
-from rest_framework.decorators import action
-from rest_framework.response import Response
+from django.conf import settings
+from django.http import HttpResponseNotModified
 from django.http import JsonResponse
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
+from rest_framework import status
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from services.mock_availability import get_free_busy_data
+from services.mock_availability import get_free_busy_data_range
+from services.providers import ProviderTimeoutError
+
+from .availability import get_availability_etag
+from .availability import get_availability_panel
+from .availability import get_availability_slots
+from .availability import get_availability_start_masks
+from .availability import get_availability_window
+from .availability import get_date_range_slots
+from .availability import get_date_range_start_masks
+from .availability import get_template_panel
+from .availability import iter_date_range_slots
+from .log import debug_enabled
+from .metrics import observe_availability
+from .models import Interviewer
+from .models import InterviewTemplate
+from .prewarm import record_template_request
+from .renderers import BitmapRenderer
+from .renderers import ORJSONRenderer
+from .renderers import ORJSONResponse
+from .renderers import bitmap_availability
+from .renderers import is_bitmap_request
+from .renderers import iter_json_envelope
+from .roster import get_template_roster
+from .serializers import InterviewAvailabilitySerializer
+from .timing import phase
 from .utils import *
-import logging
 
 # /logs/interviews_availability.log
 logger = logging.getLogger("interviews_availability")
 
+
+# slot grid for a request: ?granularity= / "granularity" overrides
+# INTERVIEWS_SLOT_GRANULARITY
+def get_granularity(value) -> int:
+    if value in (None, ""):
+        return settings.INTERVIEWS_SLOT_GRANULARITY
+    return validate_granularity(int(value))
+
+
+# If-None-Match check for the availability endpoints. The date range body is part of the
+# ETag, so that POST answers 304 as well instead of the 412 Django's GET oriented
+# helpers would give. Without an ETag (busy data not cached) nothing matches.
+def is_not_modified(request, etag: str | None) -> bool:
+    if etag is None:
+        return False
+    etags = parse_etags(request.headers.get("If-None-Match", ""))
+    return "*" in etags or etag in etags
+
+
+def etag_headers(etag: str | None) -> dict[str, str]:
+    return {"ETag": etag} if etag else {}
+
+
+# both ends of a date range request, the messages are the ones returned with the 400
+def parse_date_range(
+    start_date_str: str,
+    end_date_str: str,
+) -> tuple[datetime, datetime]:
+    try:
+        start_date = datetime.fromisoformat(start_date_str.rstrip("Z"))
+        end_date = datetime.fromisoformat(end_date_str.rstrip("Z"))
+    except ValueError:
+        msg = "Invalid date format."
+        raise ValueError(msg) from None
+    if end_date < start_date:
+        msg = "End date must be after start date"
+        raise ValueError(msg)
+    return start_date, end_date
+
+
 class InterviewTemplateViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = InterviewTemplate.objects.all()
     serializer_class = InterviewAvailabilitySerializer
     permission_classes = [AllowAny]  # Allow anyone to access the endpoint
-    
-    @action(detail=True, methods=["get"], url_path="availability", permission_classes=[AllowAny])
+    renderer_classes = [ORJSONRenderer, BitmapRenderer, BrowsableAPIRenderer]
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="availability",
+        permission_classes=[AllowAny],
+    )
     def availability(self, request, pk=None):
         try:
-            template = self.get_object()
-            interviewer_ids = list(template.interviewers.values_list("id", flat=True))
-            interviewers_data = list(template.interviewers.values("id", "first_name", "last_name"))
-            interviewer_names = {
-                interviewer["id"]: f"{interviewer["first_name"]} {interviewer["last_name"]}"
-                for interviewer in interviewers_data
-            }
+            granularity = get_granularity(request.query_params.get("granularity"))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            template = get_template_roster(pk)
+            if template is None:
+                return Response(
+                    {"error": "Interview template not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            record_template_request(template["id"])
+            interviewer_ids, interviewer_names = get_availability_panel(template)
+            start_date, end_date = get_availability_window()
+            bitmap = is_bitmap_request(request)
+            wire_format = "bitmap" if bitmap else "json"
+            etag = get_availability_etag(
+                template,
+                interviewer_ids,
+                interviewer_names,
+                start_date,
+                end_date,
+                granularity,
+                wire_format,
+            )
+            if is_not_modified(request, etag):
+                return HttpResponseNotModified(headers={"ETag": etag})
+
+            if bitmap:
+                start_masks = get_availability_start_masks(
+                    interviewer_ids,
+                    interviewer_names,
+                    template["duration"],
+                    granularity,
+                )
+                availability = bitmap_availability(
+                    start_masks,
+                    start_date,
+                    end_date,
+                    granularity,
+                )
+                slot_count = sum(starts.bit_count() for starts in start_masks.values())
+            else:
+                availability = {
+                    "availableSlots": get_availability_slots(
+                        interviewer_ids,
+                        interviewer_names,
+                        template["duration"],
+                        granularity,
+                    ),
+                }
+                slot_count = len(availability["availableSlots"])
+            observe_availability(
+                request,
+                len(interviewer_ids),
+                (end_date - start_date).days + 1,
+                slot_count,
+            )
 
-            interviewer_ids.append(3)
-            busy_data = get_free_busy_data(interviewer_ids, interviewer_names)
-            log_busydata(busy_data) 
-            
-            available_slots = calc_available_slots(busy_data, interviewer_ids, template.duration)
-            
             response_data = {
-                "interviewId": template.id,
-                "name": template.name,
-                "durationMinutes": template.duration,
-                "interviewers": [{
-                    "id": interviewer.id,
-                    "name": f"{interviewer.first_name} {interviewer.last_name}"
-                } for interviewer in template.interviewers.all()],
-                "availableSlots": available_slots
+                "interviewId": template["id"],
+                "name": template["name"],
+                "durationMinutes": template["duration"],
+                "interviewers": template["interviewers"],
+                **availability,
             }
-            
-            return Response(response_data)
-        except InterviewTemplate.DoesNotExist:
-            return Response(
-                {"error": "Interview template not found"}, 
-                status=status.HTTP_404_NOT_FOUND
+
+            # stamped again, computing may have fetched fresh busy data
+            etag = get_availability_etag(
+                template,
+                interviewer_ids,
+                interviewer_names,
+                start_date,
+                end_date,
+                granularity,
+                wire_format,
             )
+            return Response(response_data, headers=etag_headers(etag))
+        except ProviderTimeoutError as e:
+            return Response({"error": str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
 
-    @action(detail=False, methods=["post"], url_path="availability_date_range_missing", permission_classes=[AllowAny])
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="availability_date_range_missing",
+        permission_classes=[AllowAny],
+    )
     def availability_date_range_missing(self, request):
         try:
             data = json.loads(request.body)
-            
-            #template_id = data.get("templateId")
-            template_id = 2 # Force 2, so we can add a person with empty schedule
+
+            # template_id = data.get("templateId")
+            template_id = 2  # Force 2, so we can add a person with empty schedule
             start_date_str = data.get("startDate")
             end_date_str = data.get("endDate")
-            
+
             # Validate that all fields are present
             if not all([template_id, start_date_str, end_date_str]):
-                return JsonResponse({
-                    "error": "All fields are required"
-                }, status=400)
-            
-            try:
-                template = InterviewTemplate.objects.get(id=template_id)
-            except InterviewTemplate.DoesNotExist:
-                return JsonResponse({
-                    "error": f"Interview template with id {template_id} not found"
-                }, status=404)
-            
+                return JsonResponse(
+                    {
+                        "error": "All fields are required",
+                    },
+                    status=400,
+                )
+
+            template = get_template_roster(template_id)
+            if template is None:
+                return JsonResponse(
+                    {
+                        "error": f"Interview template with id {template_id} not found",
+                    },
+                    status=404,
+                )
+
             try:
-                start_date = datetime.fromisoformat(start_date_str.rstrip('Z'))
-                end_date = datetime.fromisoformat(end_date_str.rstrip('Z'))
-            except ValueError:
-                return JsonResponse({
-                    "error": "Invalid date format."
-                }, status=400)
-            
-            # Validate date range
-            if end_date < start_date:
-                return JsonResponse({
-                    "error": "End date must be after start date"
-                }, status=400)
-            
-            interviewer_ids = list(template.interviewers.values_list("id", flat=True))
-            interviewers_data = list(template.interviewers.values("id", "first_name", "last_name"))
-            interviewer_names = {
-                interviewer["id"]: f"{interviewer["first_name"]} {interviewer["last_name"]}"
-                for interviewer in interviewers_data
-            }
-            
+                start_date, end_date = parse_date_range(start_date_str, end_date_str)
+                granularity = get_granularity(data.get("granularity"))
+            except (TypeError, ValueError) as e:
+                return JsonResponse(
+                    {
+                        "error": str(e),
+                    },
+                    status=400,
+                )
+
+            interviewer_ids, interviewer_names = get_template_panel(template)
+
             # pass 2 for days to deduct: busy data only generate for end_date -2
             #    To test that interviewers will have open schedules prior to end date
-            busy_data = get_free_busy_data_range(interviewer_ids, interviewer_names, start_date_str, end_date_str, 2)
+            with phase("provider"):
+                busy_data = get_free_busy_data_range(
+                    interviewer_ids,
+                    interviewer_names,
+                    start_date_str,
+                    end_date_str,
+                    2,
+                )
 
             test_interviewer = {
                 "interviewerId": 3,
                 "name": "Thomas Jefferson",
-                "busy": []
+                "busy": [],
             }
 
             busy_data.append(test_interviewer)
             interviewer_ids.append(3)
-            logger.debug(f"interviewer_ids before calc function: {interviewer_ids}")
-            logger.debug(f"new interviewers: {template.interviewers.all()}")
+            if debug_enabled(logger):
+                logger.debug(
+                    "interviewer_ids before calc function: %s",
+                    list(interviewer_ids),
+                )
+                logger.debug("new interviewers: %s", template["interviewers"])
             log_busydata(busy_data)
-            
-            available_slots = calc_available_slots_with_date_range(busy_data, interviewer_ids, template.duration,start_date_str, end_date_str)
-            
+
+            with phase("compute"):
+                available_slots = calc_available_slots_with_date_range(
+                    busy_data,
+                    interviewer_ids,
+                    template["duration"],
+                    start_date_str,
+                    end_date_str,
+                    settings.INTERVIEWS_AVAILABILITY_ENGINE,
+                    granularity,
+                )
+
             response_interviewers = []
             for item in busy_data:
-                response_interviewers.append({
-                    "id": item["interviewerId"], 
-                    "name": item["name"]
-                })
+                response_interviewers.append(
+                    {
+                        "id": item["interviewerId"],
+                        "name": item["name"],
+                    },
+                )
 
             response_data = {
-                "interviewId": template.id,
-                "name": template.name,
-                "durationMinutes": template.duration,
+                "interviewId": template["id"],
+                "name": template["name"],
+                "durationMinutes": template["duration"],
                 "interviewers": response_interviewers,
-                "availableSlots": available_slots
+                "availableSlots": available_slots,
             }
+            observe_availability(
+                request,
+                len(interviewer_ids),
+                (end_date.date() - start_date.date()).days + 1,
+                len(available_slots),
+            )
 
-            return JsonResponse(response_data)    
+            return ORJSONResponse(response_data)
         except json.JSONDecodeError:
-            return JsonResponse({
-                "error": "Invalid JSON data"
-            }, status=400)
+            return JsonResponse(
+                {
+                    "error": "Invalid JSON data",
+                },
+                status=400,
+            )
         except Exception as e:
-            return JsonResponse({
-                "error": str(e)
-            }, status=500)
+            return JsonResponse(
+                {
+                    "error": str(e),
+                },
+                status=500,
+            )
 
-    @action(detail=False, methods=["post"], url_path="availability_date_range", permission_classes=[AllowAny])
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="availability_date_range",
+        permission_classes=[AllowAny],
+    )
     def availability_date_range(self, request):
         try:
             data = json.loads(request.body)
-            
+
             template_id = data.get("templateId")
             start_date_str = data.get("startDate")
             end_date_str = data.get("endDate")
-            
+
             # Validate that all fields are present
             if not all([template_id, start_date_str, end_date_str]):
-                return JsonResponse({
-                    "error": "All fields are required"
-                }, status=400)
-            
-            try:
-                template = InterviewTemplate.objects.get(id=template_id)
-            except InterviewTemplate.DoesNotExist:
-                return JsonResponse({
-                    "error": f"Interview template with id {template_id} not found"
-                }, status=404)
-            
+                return JsonResponse(
+                    {
+                        "error": "All fields are required",
+                    },
+                    status=400,
+                )
+
+            template = get_template_roster(template_id)
+            if template is None:
+                return JsonResponse(
+                    {
+                        "error": f"Interview template with id {template_id} not found",
+                    },
+                    status=404,
+                )
+            record_template_request(template["id"])
+
             try:
-                start_date = datetime.fromisoformat(start_date_str.rstrip('Z'))
-                end_date = datetime.fromisoformat(end_date_str.rstrip('Z'))
-            except ValueError:
-                return JsonResponse({
-                    "error": "Invalid date format."
-                }, status=400)
-            
-            # Validate date range
-            if end_date < start_date:
-                return JsonResponse({
-                    "error": "End date must be after start date"
-                }, status=400)
-            
-            interviewer_ids = list(template.interviewers.values_list("id", flat=True))
-            interviewers_data = list(template.interviewers.values("id", "first_name", "last_name"))
-            interviewer_names = {
-                interviewer["id"]: f"{interviewer["first_name"]} {interviewer["last_name"]}"
-                for interviewer in interviewers_data
-            }
-            
-            # pass 2 for days to deduct: busy data only generate for end_date -2
-            #    To verify that interviewers will have open schedules prior to end date
-            busy_data = get_free_busy_data_range(interviewer_ids, interviewer_names, start_date_str, end_date_str, 2)
-            log_busydata(busy_data)
-            
-            available_slots = calc_available_slots_with_date_range(busy_data, interviewer_ids, template.duration, start_date_str, end_date_str)
-            
+                start_date, end_date = parse_date_range(start_date_str, end_date_str)
+                granularity = get_granularity(data.get("granularity"))
+            except (TypeError, ValueError) as e:
+                return JsonResponse(
+                    {
+                        "error": str(e),
+                    },
+                    status=400,
+                )
+
+            interviewer_ids, interviewer_names = get_template_panel(template)
+            bitmap = is_bitmap_request(request)
+            wire_format = (
+                "bitmap" if bitmap else "stream" if data.get("stream") else "json"
+            )
+            etag = get_availability_etag(
+                template,
+                interviewer_ids,
+                interviewer_names,
+                start_date.date(),
+                end_date.date(),
+                granularity,
+                wire_format,
+            )
+            if is_not_modified(request, etag):
+                return HttpResponseNotModified(headers={"ETag": etag})
+
             response_data = {
-                "interviewId": template.id,
-                "name": template.name,
-                "durationMinutes": template.duration,
-                "interviewers": [{
-                    "id": interviewer.id,
-                    "name": f"{interviewer.first_name} {interviewer.last_name}"
-                } for interviewer in template.interviewers.all()],
-                "availableSlots": available_slots
+                "interviewId": template["id"],
+                "name": template["name"],
+                "durationMinutes": template["duration"],
+                "interviewers": template["interviewers"],
             }
-            
-            return JsonResponse(response_data)    
+            range_days = (end_date.date() - start_date.date()).days + 1
+
+            if bitmap:
+                start_masks = get_date_range_start_masks(
+                    interviewer_ids,
+                    interviewer_names,
+                    template["duration"],
+                    start_date_str,
+                    end_date_str,
+                    granularity,
+                )
+                response_data.update(
+                    bitmap_availability(
+                        start_masks,
+                        start_date.date(),
+                        end_date.date(),
+                        granularity,
+                    ),
+                )
+                observe_availability(
+                    request,
+                    len(interviewer_ids),
+                    range_days,
+                    sum(starts.bit_count() for starts in start_masks.values()),
+                )
+                etag = get_availability_etag(
+                    template,
+                    interviewer_ids,
+                    interviewer_names,
+                    start_date.date(),
+                    end_date.date(),
+                    granularity,
+                    wire_format,
+                )
+                return ORJSONResponse(
+                    response_data,
+                    content_type=BitmapRenderer.media_type,
+                    headers=etag_headers(etag),
+                )
+
+            if data.get("stream"):
+                # the status is sent with the envelope, a provider failure later on
+                # aborts the response. The ETag is the one checked above: should a
+                # window refetch busy data on the way, the versions move on and a
+                # revalidation with it gets the full response again
+                day_slots = iter_date_range_slots(
+                    interviewer_ids,
+                    interviewer_names,
+                    template["duration"],
+                    start_date_str,
+                    end_date_str,
+                    granularity,
+                )
+                observe_availability(request, len(interviewer_ids), range_days)
+                return StreamingHttpResponse(
+                    iter_json_envelope(response_data, "availableSlots", day_slots),
+                    content_type="application/json",
+                    headers=etag_headers(etag),
+                )
+
+            response_data["availableSlots"] = get_date_range_slots(
+                interviewer_ids,
+                interviewer_names,
+                template["duration"],
+                start_date_str,
+                end_date_str,
+                granularity,
+            )
+            observe_availability(
+                request,
+                len(interviewer_ids),
+                range_days,
+                len(response_data["availableSlots"]),
+            )
+            etag = get_availability_etag(
+                template,
+                interviewer_ids,
+                interviewer_names,
+                start_date.date(),
+                end_date.date(),
+                granularity,
+                wire_format,
+            )
+            return ORJSONResponse(response_data, headers=etag_headers(etag))
         except json.JSONDecodeError:
-            return JsonResponse({
-                "error": "Invalid JSON data"
-            }, status=400)
+            return JsonResponse(
+                {
+                    "error": "Invalid JSON data",
+                },
+                status=400,
+            )
+        except ProviderTimeoutError as e:
+            return JsonResponse(
+                {
+                    "error": str(e),
+                },
+                status=504,
+            )
         except Exception as e:
-            return JsonResponse({
-                "error": str(e)
-            }, status=500)
+            return JsonResponse(
+                {
+                    "error": str(e),
+                },
+                status=500,
+            )
 
-    @action(detail=False, methods=["post"], url_path="test_availability", permission_classes=[AllowAny])
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="test_availability",
+        permission_classes=[AllowAny],
+    )
     def test_availability(self, request):
         return Response({"message": "availability test works"})
 
-    @action(detail=False, methods=['POST'])
+    @action(detail=False, methods=["POST"])
     def test_route(self, request):
         return Response({"message": "test works"})
 
-
-    @action(detail=False, methods=["get"], url_path=r"interviewer/(?P<interviewer_id>\d+)", permission_classes=[AllowAny])
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"interviewer/(?P<interviewer_id>\d+)",
+        permission_classes=[AllowAny],
+    )
     def interviewer_busy_data(self, request, interviewer_id=None):
         try:
             interviewer = get_object_or_404(Interviewer, id=interviewer_id)
-            
+
             busy_data = get_free_busy_data([interviewer_id])
-            
+
             response_data = {
                 "interviewerId": interviewer.id,
                 "name": f"{interviewer.first_name} {interviewer.last_name}",
-                "busyPeriods": busy_data[0]["busy"] if busy_data and busy_data[0]["busy"] else []
+                "busyPeriods": busy_data[0]["busy"]
+                if busy_data and busy_data[0]["busy"]
+                else [],
             }
-            
+
             return Response(response_data)
         except Interviewer.DoesNotExist:
             return Response(
-                {"error": f"Interviewer with ID {interviewer_id} not found"}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
\ No newline at end of file
+                {"error": f"Interviewer with ID {interviewer_id} not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
@@ -0,0 +1,465 @@
+"""
+Deterministic synthetic calendars at org scale.
+
+Every random draw is a counter based hash of (seed, interviewer, day, stream, index)
+rather than a step of a shared generator, so a block only depends on the seed and on
+who/when it belongs to: the same interviewer and day give the same blocks whatever
+range, batch or order they are generated in. That makes the data usable as cache
+fixtures and as stable benchmark and load test input. Blocks are produced with numpy for
+a whole batch of interviewers x days at once.
+
+Per interviewer and day there are
+  - ad hoc meetings on weekdays, on average `density` per day, 15 min to 2 h, 8:00 to
+    18:00, which overlap each other like real calendars do,
+  - `recurring` weekly or biweekly series (standups, 1:1s) on a fixed weekday and time,
+    with the odd occurrence cancelled,
+  - all-day blocks (time off) with probability `all_day_rate` per weekday,
+spread over `calendars` source calendars: the first is "busy", the others go to
+"calendars" (see interviews.intervals.get_calendars). Times are UTC.
+
+    python -m services.calendar_generator calendars.jsonl --interviewers 1000 --days 365
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import nullcontext
+from datetime import date
+from datetime import timedelta
+from itertools import pairwise
+from pathlib import Path
+from typing import IO
+
+import numpy as np
+
+MINUTES_PER_DAY = 24 * 60
+MEETING_DURATIONS = np.array([15, 30, 30, 30, 45, 60, 60, 60, 90, 120])
+RECURRING_DURATIONS = np.array([15, 30, 30, 60])
+SKIP_RATE = 0.1  # share of recurring occurrences that are cancelled
+BIWEEKLY_RATE = 0.3  # share of recurring series that meet every other week
+WORKDAYS = 5  # Monday to Friday, weekday 0 to 4
+
+# streams keep the draws of different properties independent of each other
+(
+    PRESENT,
+    START,
+    DURATION,
+    CALENDAR,
+    ALL_DAY,
+    SERIES_DAY,
+    SERIES_START,
+    SERIES_LENGTH,
+    SERIES_INTERVAL,
+    SERIES_SKIP,
+) = range(10)
+
+_MASK = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return (x ^ (x >> np.uint64(31))) & _MASK
+
+
+# uniform [0, 1) floats, one per element of the broadcast keys
+def _uniform(seed: int, *keys) -> np.ndarray:
+    h = np.full(
+        np.broadcast_shapes(*(np.shape(key) for key in keys)),
+        seed,
+        dtype=np.uint64,
+    )
+    for key in keys:
+        h = _splitmix64(h ^ np.asarray(key).astype(np.uint64))
+    return (h >> np.uint64(11)) * (1.0 / (1 << 53))
+
+
+def _pick(values: np.ndarray, uniform: np.ndarray) -> np.ndarray:
+    return values[(uniform * len(values)).astype(np.int64)]
+
+
+class CalendarGenerator:
+    def __init__(
+        self,
+        seed: int = 0,
+        density: float = 4.0,
+        recurring: int = 3,
+        all_day_rate: float = 0.02,
+        calendars: int = 1,
+    ):
+        if density < 0 or recurring < 0 or not 0 <= all_day_rate <= 1 or calendars < 1:
+            msg = (
+                "density, recurring and all_day_rate must not be negative, calendars "
+                "must be at least 1"
+            )
+            raise ValueError(msg)
+        self.seed = seed
+        self.density = density
+        self.recurring = recurring
+        self.all_day_rate = all_day_rate
+        self.calendars = calendars
+        # slots drawn per weekday for ad hoc meetings, each filled with probability
+        # density / slots
+        self.meeting_slots = max(1, int(np.ceil(density * 2)))
+
+    # busy blocks of the interviewers over [start_date, end_date] as parallel arrays
+    # sorted by interviewer, calendar and start: interviewer id, calendar index, start
+    # and end in minutes since the epoch
+    def blocks(
+        self,
+        interviewer_ids,
+        start_date: date,
+        end_date: date,
+    ) -> dict[str, np.ndarray]:
+        interviewers = np.asarray(interviewer_ids, dtype=np.int64)[:, None]
+        epoch_days = np.arange(
+            np.datetime64(start_date, "D"),
+            np.datetime64(end_date, "D") + 1,
+        ).astype(np.int64)[None, :]
+        weekday = (epoch_days + 3) % 7  # 1970-01-01 was a Thursday, Monday is 0
+        workday = np.broadcast_to(
+            weekday < WORKDAYS,
+            (interviewers.shape[0], epoch_days.shape[1]),
+        )
+        iv, day = np.broadcast_arrays(interviewers, epoch_days)
+        parts = []
+
+        # ad hoc meetings: meeting_slots draws per (interviewer, day)
+        k = np.arange(self.meeting_slots)[None, None, :]
+        iv3, day3 = iv[..., None], day[..., None]
+        present = (
+            _uniform(self.seed, iv3, day3, PRESENT, k)
+            < self.density / self.meeting_slots
+        ) & workday[..., None]
+        start = 8 * 60 + 15 * (_uniform(self.seed, iv3, day3, START, k) * 40).astype(
+            np.int64,
+        )
+        duration = _pick(MEETING_DURATIONS, _uniform(self.seed, iv3, day3, DURATION, k))
+        calendar = (
+            _uniform(self.seed, iv3, day3, CALENDAR, k) * self.calendars
+        ).astype(np.int64)
+        parts.append((iv3, day3, calendar, start, start + duration, present))
+
+        # recurring series, drawn per (interviewer, series) and placed on every matching
+        # day
+        if self.recurring:
+            series = np.arange(self.recurring)[None, None, :]
+            series_day = (
+                _uniform(self.seed, iv3, series, SERIES_DAY) * WORKDAYS
+            ).astype(
+                np.int64,
+            )
+            series_start = 9 * 60 + 30 * (
+                _uniform(self.seed, iv3, series, SERIES_START) * 16
+            ).astype(np.int64)
+            series_length = _pick(
+                RECURRING_DURATIONS,
+                _uniform(self.seed, iv3, series, SERIES_LENGTH),
+            )
+            interval = 1 + (
+                _uniform(self.seed, iv3, series, SERIES_INTERVAL) < BIWEEKLY_RATE
+            )
+            series_calendar = (
+                _uniform(self.seed, iv3, series, CALENDAR) * self.calendars
+            ).astype(np.int64)
+            week = (day3 + 3) // 7
+            present = (
+                (weekday[..., None] == series_day)
+                & (week % interval == 0)
+                & (_uniform(self.seed, iv3, day3, SERIES_SKIP, series) >= SKIP_RATE)
+            )
+            parts.append(
+                (
+                    iv3,
+                    day3,
+                    series_calendar,
+                    series_start,
+                    series_start + series_length,
+                    present,
+                ),
+            )
+
+        # all-day blocks on the primary calendar
+        if self.all_day_rate:
+            present = (
+                _uniform(self.seed, iv, day, ALL_DAY) < self.all_day_rate
+            ) & workday
+            zeros = np.zeros_like(day)
+            parts.append((iv, day, zeros, zeros, zeros + MINUTES_PER_DAY, present))
+
+        columns = {"interviewer": [], "calendar": [], "start": [], "end": []}
+        for iv_part, day_part, calendar_part, start_part, end_part, present in parts:
+            shape = present.shape
+            columns["interviewer"].append(np.broadcast_to(iv_part, shape)[present])
+            columns["calendar"].append(np.broadcast_to(calendar_part, shape)[present])
+            day_minutes = np.broadcast_to(day_part, shape)[present] * MINUTES_PER_DAY
+            columns["start"].append(
+                day_minutes + np.broadcast_to(start_part, shape)[present],
+            )
+            columns["end"].append(
+                day_minutes + np.broadcast_to(end_part, shape)[present],
+            )
+
+        blocks = {name: np.concatenate(values) for name, values in columns.items()}
+        order = np.lexsort(
+            (blocks["end"], blocks["start"], blocks["calendar"], blocks["interviewer"]),
+        )
+        return {name: values[order] for name, values in blocks.items()}
+
+    # (interviewer id, [(starts, ends) per calendar]) with ISO strings, generated
+    # batch_size interviewers at a time
+    def iter_runs(
+        self,
+        interviewer_ids,
+        start_date: date,
+        end_date: date,
+        batch_size: int = 256,
+    ) -> Iterator[tuple[int, list[tuple[list[str], list[str]]]]]:
+        interviewer_ids = list(interviewer_ids)
+        for offset in range(0, len(interviewer_ids), batch_size):
+            batch = interviewer_ids[offset : offset + batch_size]
+            blocks = self.blocks(batch, start_date, end_date)
+            starts = _format_minutes(blocks["start"])
+            ends = _format_minutes(blocks["end"])
+            # blocks are sorted by (interviewer, calendar), so every calendar of every
+            # interviewer is a contiguous run and its bounds can be found in one search
+            keys = blocks["interviewer"] * self.calendars + blocks["calendar"]
+            queries = np.asarray(batch, dtype=np.int64)[
+                :,
+                None,
+            ] * self.calendars + np.arange(self.calendars + 1)
+            cuts = np.searchsorted(keys, queries).tolist()
+            for interviewer_id, bounds in zip(batch, cuts, strict=True):
+                yield (
+                    interviewer_id,
+                    [(starts[lo:hi], ends[lo:hi]) for lo, hi in pairwise(bounds)],
+                )
+
+    # provider shaped entries, one per interviewer: {"interviewerId", "name", "busy",
+    # "calendars"} ("calendars" only with more than one calendar)
+    def iter_calendars(
+        self,
+        interviewer_ids,
+        start_date: date,
+        end_date: date,
+        batch_size: int = 256,
+    ) -> Iterator[dict]:
+        for interviewer_id, runs in self.iter_runs(
+            interviewer_ids,
+            start_date,
+            end_date,
+            batch_size,
+        ):
+            calendars = [
+                [
+                    {"start": start, "end": end}
+                    for start, end in zip(starts, ends, strict=True)
+                ]
+                for starts, ends in runs
+            ]
+            entry = {
+                "interviewerId": interviewer_id,
+                "name": f"Interviewer {interviewer_id}",
+                "busy": calendars[0],
+            }
+            if self.calendars > 1:
+                entry["calendars"] = calendars[1:]
+            yield entry
+
+    # busy blocks of one interviewer with every calendar merged in, as a free/busy API
+    # answers
+    def busy_blocks(
+        self,
+        interviewer_id: int,
+        start_date: date,
+        end_date: date,
+    ) -> list[dict[str, str]]:
+        return self.busy_batch([interviewer_id], start_date, end_date)[interviewer_id]
+
+    def busy_batch(
+        self,
+        interviewer_ids: list[int],
+        start_date: date,
+        end_date: date,
+    ) -> dict[int, list[dict[str, str]]]:
+        busy = {}
+        for interviewer_id, runs in self.iter_runs(
+            interviewer_ids,
+            start_date,
+            end_date,
+        ):
+            # ISO strings of the same format sort chronologically
+            blocks = sorted(
+                (start, end)
+                for starts, ends in runs
+                for start, end in zip(starts, ends, strict=True)
+            )
+            busy[interviewer_id] = [
+                {"start": start, "end": end} for start, end in blocks
+            ]
+        return busy
+
+    # one JSON line per interviewer (the iter_calendars shape), returns the number of
+    # blocks written
+    def write_jsonl(
+        self,
+        out: IO[str],
+        interviewer_ids,
+        start_date: date,
+        end_date: date,
+        batch_size: int = 256,
+    ) -> int:
+        written = 0
+        for interviewer_id, runs in self.iter_runs(
+            interviewer_ids,
+            start_date,
+            end_date,
+            batch_size,
+        ):
+            # the strings need no escaping, building the line directly is several times
+            # faster than json.dumps
+            lists = [
+                "["
+                + ",".join(
+                    f'{{"start":"{start}","end":"{end}"}}'
+                    for start, end in zip(starts, ends, strict=True)
+                )
+                + "]"
+                for starts, ends in runs
+            ]
+            line = (
+                f'{{"interviewerId":{interviewer_id},'
+                f'"name":"Interviewer {interviewer_id}","busy":{lists[0]}'
+            )
+            if len(lists) > 1:
+                line += f',"calendars":[{",".join(lists[1:])}]'
+            out.write(line + "}\n")
+            written += sum(len(starts) for starts, _ in runs)
+        return written
+
+
+# blocks start and end on a few hundred distinct times per day, each is formatted once
+def _format_minutes(minutes: np.ndarray) -> list[str]:
+    unique, inverse = np.unique(minutes, return_inverse=True)
+    formatted = np.array(
+        [
+            f"{value}Z"
+            for value in np.datetime_as_string(
+                unique.astype("datetime64[m]"),
+                unit="s",
+            ).tolist()
+        ],
+    )
+    return formatted[inverse].tolist()
+
+
+# Deterministic stand-in for a batched calendar provider
+# (services.providers.BatchBusyDataProvider): the same interviewer and range always get
+# the same busy blocks, after the simulated latency.
+class SyntheticAvailabilityProvider:
+    def __init__(self, generator: CalendarGenerator, latency: float = 0):
+        self.generator = generator
+        self.latency = latency  # seconds per call
+
+    async def get_busy_blocks(
+        self,
+        interviewer_id: int,
+        start_date: date,
+        end_date: date,
+    ) -> list[dict[str, str]]:
+        return (await self.get_busy_batch([interviewer_id], start_date, end_date))[
+            interviewer_id
+        ]
+
+    async def get_busy_batch(
+        self,
+        interviewer_ids: list[int],
+        start_date: date,
+        end_date: date,
+    ) -> dict[int, list[dict[str, str]]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.generator.busy_batch(interviewer_ids, start_date, end_date)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Write deterministic synthetic calendars as JSONL, one interviewer per line"
+        ),
+    )
+    parser.add_argument("output", help="Output file, - for stdout")
+    parser.add_argument(
+        "--interviewers",
+        type=int,
+        default=100,
+        help="Interviewer ids 1..N",
+    )
+    parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        default=date(2030, 1, 1),
+        help="First day (YYYY-MM-DD)",
+    )
+    parser.add_argument("--days", type=int, default=30, help="Days from --start")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=4.0,
+        help="Ad hoc meetings per weekday",
+    )
+    parser.add_argument(
+        "--recurring",
+        type=int,
+        default=3,
+        help="Recurring series per interviewer",
+    )
+    parser.add_argument(
+        "--all-day-rate",
+        type=float,
+        default=0.02,
+        help="Probability of an all-day block per weekday",
+    )
+    parser.add_argument(
+        "--calendars",
+        type=int,
+        default=1,
+        help="Source calendars per interviewer",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=256,
+        help="Interviewers generated at once",
+    )
+    args = parser.parse_args()
+
+    generator = CalendarGenerator(
+        args.seed,
+        args.density,
+        args.recurring,
+        args.all_day_rate,
+        args.calendars,
+    )
+    end = args.start + timedelta(days=args.days - 1)
+    started = time.perf_counter()
+    with (
+        Path(args.output).open("w")
+        if args.output != "-"
+        else nullcontext(sys.stdout) as out
+    ):
+        blocks = generator.write_jsonl(
+            out,
+            range(1, args.interviewers + 1),
+            args.start,
+            end,
+            args.batch_size,
+        )
+    elapsed = time.perf_counter() - started
+    sys.stderr.write(
+        f"{blocks} blocks for {args.interviewers} interviewers in {elapsed:.1f}s\n",
+    )
@@ -1,9 +1,17 @@
-from datetime import datetime, timedelta, date, time
+import asyncio
+import json
+import random
+import threading
+import time as clock
 from collections import defaultdict
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
 from faker import Faker
-import random
-import json
-import math
 
 fake = Faker()
 Faker.seed(0)
@@ -11,7 +19,7 @@ Faker.seed(0)
 # def generate_busy_blocks(start_date, days=7): #days = 7
 #     busy_blocks = []
 #     work_hours = (9, 17)  # Work hours from 9 AM to 5 PM
-    
+
 #     # Generate 3-6 busy blocks
 #     for _ in range(random.randint(3, 6)):
 #         day_offset = random.randint(0, days - 1)
@@ -32,7 +40,8 @@ Faker.seed(0)
 
 #     return busy_blocks
 
-#add random 30 mins at start or end
+
+# add random 30 mins at start or end
 def generate_busy_blocks(start_date, days=7):
     busy_blocks = []
     work_hours = (9, 17)  # Work hours from 9 AM to 5 PM
@@ -59,71 +68,88 @@ def generate_busy_blocks(start_date, days=7):
 
         # dont go past work hours
         end_of_day = datetime.combine(date, time(work_hours[1], 0))
-        if end_dt > end_of_day:
-            end_dt = end_of_day
+        end_dt = min(end_dt, end_of_day)
 
-        busy_blocks.append({
-            "start": start_dt.isoformat() + "Z",
-            "end": end_dt.isoformat() + "Z",
-        })
+        busy_blocks.append(
+            {
+                "start": start_dt.isoformat() + "Z",
+                "end": end_dt.isoformat() + "Z",
+            },
+        )
 
     return busy_blocks
 
-def generate_busy_blocks_with_range(start_date, end_date, days_to_deduct=0):
+
+# blocks: number of busy blocks over the whole range (3-6 when not given)
+# rng: a seeded random.Random for reproducible calendars, the module level generator
+# otherwise
+def generate_busy_blocks_with_range(
+    start_date,
+    end_date,
+    days_to_deduct=0,
+    blocks=None,
+    rng=random,
+):
     busy_blocks = []
     work_hours = (9, 17)  # Work hours from 9 AM to 5 PM
-    
+
     # Convert string dates to datetime objects if needed
     if isinstance(start_date, str):
-        start_date = datetime.fromisoformat(start_date.rstrip('Z'))
+        start_date = datetime.fromisoformat(start_date.rstrip("Z"))
     if isinstance(end_date, str):
-        end_date = datetime.fromisoformat(end_date.rstrip('Z'))
-    
+        end_date = datetime.fromisoformat(end_date.rstrip("Z"))
+
     # Deduct days from end date if specified
     if days_to_deduct > 0:
         end_date = end_date - timedelta(days=days_to_deduct)
-    
+
     # Ensure end date is not before start date
-    if end_date < start_date:
-        end_date = start_date
-    
+    end_date = max(end_date, start_date)
+
     # Calculate number of days in the range
     days_in_range = (end_date - start_date).days + 1
-    
-    for _ in range(random.randint(3, 6)):
+
+    if blocks is None:
+        blocks = rng.randint(3, 6)
+
+    for _ in range(blocks):
         # Choose random day within the date range
-        day_offset = random.randint(0, days_in_range - 1)
+        day_offset = rng.randint(0, days_in_range - 1)
         date = start_date + timedelta(days=day_offset)
-        
+
         # Choose random hour between 9 and 15 (to ensure end time <= 17)
-        start_hour = random.randint(work_hours[0], work_hours[1] - 2)
-        duration_hours = random.randint(1, 2)
-        
+        start_hour = rng.randint(work_hours[0], work_hours[1] - 2)
+        duration_hours = rng.randint(1, 2)
+
         # to add or not to add 30 minutes
-        add_half_hour_start = random.choice([True, False])
+        add_half_hour_start = rng.choice([True, False])
         start_dt = datetime.combine(date, time(start_hour, 0)).replace(tzinfo=None)
         if add_half_hour_start:
             start_dt += timedelta(minutes=30)
-        
-        add_half_hour_end = random.choice([True, False])
+
+        add_half_hour_end = rng.choice([True, False])
         end_dt = start_dt + timedelta(hours=duration_hours)
         if add_half_hour_end:
             end_dt += timedelta(minutes=30)
-        
+
         # dont go past work hours
         end_of_day = datetime.combine(date, time(work_hours[1], 0))
-        if end_dt > end_of_day:
-            end_dt = end_of_day
-        
-        busy_blocks.append({
-            "start": start_dt.isoformat() + "Z",
-            "end": end_dt.isoformat() + "Z",
-        })
-    
+        end_dt = min(end_dt, end_of_day)
+
+        busy_blocks.append(
+            {
+                "start": start_dt.isoformat() + "Z",
+                "end": end_dt.isoformat() + "Z",
+            },
+        )
+
     return busy_blocks
 
 
-def get_free_busy_data(interviewer_ids: list[int], interviewer_names: dict[int, str]) -> list[dict]:
+def get_free_busy_data(
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+) -> list[dict]:
     start_date = datetime.utcnow().date()
     data = []
 
@@ -131,89 +157,226 @@ def get_free_busy_data(interviewer_ids: list[int], interviewer_names: dict[int,
         interviewer = {
             "interviewerId": id_,
             "name": interviewer_names[id_],
-            "busy": generate_busy_blocks(start_date)
+            "busy": generate_busy_blocks(start_date),
         }
         data.append(interviewer)
 
     return data
 
-def get_free_busy_data_range(interviewer_ids: list[int], interviewer_names: dict[int, str], start: str, end: str, days_to_deduct=0) -> list[dict]:
+
+def get_free_busy_data_range(
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    start: str,
+    end: str,
+    days_to_deduct=0,
+) -> list[dict]:
     data = []
     for id_ in interviewer_ids:
         interviewer = {
             "interviewerId": id_,
-            "name": interviewer_names[id_], #fake.name(),
-            "busy": generate_busy_blocks_with_range(start, end, days_to_deduct)  # Changed from 'availability' to 'busy'
+            "name": interviewer_names[id_],  # fake.name(),
+            "busy": generate_busy_blocks_with_range(
+                start,
+                end,
+                days_to_deduct,
+            ),  # Changed from 'availability' to 'busy'
         }
         data.append(interviewer)
 
-    return data 
+    return data
 
 
-def get_available_slots_range(interviewers_data: list[dict], start_date_str: str, end_date_str: str) -> dict[date, list[tuple[time, time]]]:
+# Local stand-in for a calendar provider behind services.providers.BusyDataProvider;
+# every call sleeps for the simulated round trip before generating the random busy
+# blocks
+class MockAvailabilityProvider:
+    def __init__(self, latency: float = 0, days_to_deduct: int = 0):
+        self.latency = latency  # seconds per interviewer fetch
+        self.days_to_deduct = days_to_deduct
+
+    async def get_busy_blocks(
+        self,
+        interviewer_id: int,
+        start_date: date,
+        end_date: date,
+    ) -> list[dict[str, str]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        start = datetime.combine(start_date, time())
+        end = datetime.combine(end_date, time())
+        return generate_busy_blocks_with_range(start, end, self.days_to_deduct)
+
+
+# Local HTTP stand-in for a batched free/busy API, used by
+# services.provider_client.HttpBusyDataProvider.
+#  POST /freebusy {"interviewerIds": [1, 2], "start": "2025-05-01", "end": "2025-05-07"}
+#  -> {"calendars": [{"interviewerId": 1, "busy": [...]}, ...]}
+# Connections are kept alive (HTTP/1.1), each batch sleeps for the simulated latency and
+# batches above max_batch_size are rejected with 413 like a real provider would.
+class MockFreeBusyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):  # noqa: N802 -- BaseHTTPRequestHandler dispatches on the method name
+        if self.path != "/freebusy":
+            self.send_json(404, {"error": "Not found"})
+            return
+        try:
+            body = json.loads(
+                self.rfile.read(int(self.headers.get("Content-Length", 0))),
+            )
+            interviewer_ids = body["interviewerIds"]
+            start_date = date.fromisoformat(body["start"])
+            end_date = date.fromisoformat(body["end"])
+        except (KeyError, ValueError):
+            self.send_json(400, {"error": "Invalid request"})
+            return
+        max_batch_size = self.server.max_batch_size
+        if len(interviewer_ids) > max_batch_size:
+            error = f"At most {max_batch_size} interviewers per request"
+            self.send_json(413, {"error": error})
+            return
+
+        self.server.batch_sizes.append(len(interviewer_ids))
+        if self.server.latency:
+            clock.sleep(self.server.latency)
+        start = datetime.combine(start_date, time())
+        end = datetime.combine(end_date, time())
+        self.send_json(
+            200,
+            {
+                "calendars": [
+                    {
+                        "interviewerId": interviewer_id,
+                        "busy": generate_busy_blocks_with_range(start, end),
+                    }
+                    for interviewer_id in interviewer_ids
+                ],
+            },
+        )
+
+    def send_json(self, status, data):
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockFreeBusyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency: float = 0,
+        max_batch_size: int = 50,
+    ):
+        super().__init__((host, port), MockFreeBusyHandler)
+        self.latency = latency  # seconds per batch
+        self.max_batch_size = max_batch_size
+        self.connections = 0  # accepted TCP connections, to check pooling
+        self.batch_sizes = []  # interviewers per accepted batch
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockFreeBusyServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            args=(0.05,),
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+def get_available_slots_range(
+    interviewers_data: list[dict],
+    start_date_str: str,
+    end_date_str: str,
+) -> dict[date, list[tuple[time, time]]]:
     work_hours = (9, 17)  # 9 AM to 5 PM
     busy_days = defaultdict(set)
     cutoff_datetime = datetime.utcnow() + timedelta(hours=24)
-    
+
     # Extract busy slots from interviewer data
     for interviewer in interviewers_data:
         for slot in interviewer["busy"]:
             start_dt = datetime.fromisoformat(slot["start"].rstrip("Z"))
             end_dt = datetime.fromisoformat(slot["end"].rstrip("Z"))
             day = start_dt.date()
-            
+
             # Convert start time to 30-minute slot index (index: 0-48)
             start_slot = start_dt.hour * 2
             if start_dt.minute >= 30:
                 start_slot += 1
-                
+
             # Convert end time to 30-minute slot index (index: 0-48)
             end_slot = end_dt.hour * 2
             if end_dt.minute > 0:
                 end_slot += 1
-                
+
             # Add each 30 min slot that is busy period to busy_days
             for slot30min in range(start_slot, end_slot):
                 busy_days[day].add(slot30min)
-    
+
     # Parse ISO 8601 dates
     start_date = datetime.fromisoformat(start_date_str.rstrip("Z")).date()
     end_date = datetime.fromisoformat(end_date_str.rstrip("Z")).date()
-    
+
     # Generate date range
     dates = []
     current_date = start_date
     while current_date <= end_date:
         dates.append(current_date)
         current_date += timedelta(days=1)
-    
+
     # find all available slots
     all_available_slots = {}
     for day in dates:
-        if day.weekday() >= 5: # Skip Saturday and Sunday (5, 6)
+        if day.weekday() >= 5:  # Skip Saturday and Sunday (5, 6)
             continue
-        
+
         # All possible work hour 30-minute slots
         # 16 slots per day
         work_start_slot = work_hours[0] * 2  # 18
-        work_end_slot = work_hours[1] * 2    # 34
+        work_end_slot = work_hours[1] * 2  # 34
         all_slots = set(range(work_start_slot, work_end_slot))
-        
+
         # Remove busy slots
         available_slots = all_slots - busy_days[day]
-        
+
         # Convert to start and end time tuple (start_time, end_time)
         slots = []
         for free_slot in sorted(available_slots):
-            start_hour = free_slot // 2 # extract hour from 30-min time slot
+            start_hour = free_slot // 2  # extract hour from 30-min time slot
             if free_slot % 2 == 0:
                 start_minute = 0
             else:
                 start_minute = 30
             start_time = time(start_hour, start_minute)
-            
+
             slot_datetime = datetime.combine(day, time(start_hour, start_minute))
-            if slot_datetime < cutoff_datetime: # check cutoff threshold 
+            if slot_datetime < cutoff_datetime:  # check cutoff threshold
                 continue
             # Find end time (30 mins later)
             end_hour = start_hour
@@ -222,13 +385,13 @@ def get_available_slots_range(interviewers_data: list[dict], start_date_str: str
             else:
                 end_minute = 0
                 end_hour += 1  # When start time is at the 30 min mark jump to next hour
-                
+
             end_time = time(end_hour, end_minute)
             slots.append((start_time, end_time))
-        
+
         if slots:  # Only add dates that have available slots
             all_available_slots[day] = slots
-    
+
     return all_available_slots
 
 
@@ -238,12 +401,13 @@ def print_available_slots(available_slots):
         date_str = f"{date.isoformat()} ({weekday})"
         print(f"\n{date_str}")
         print("-" * len(date_str))
-        
+
         for start_time, end_time in slots:
             start_str = start_time.strftime("%I:%M %p").lstrip("0")
             end_str = end_time.strftime("%I:%M %p").lstrip("0")
             print(f"  {start_str} - {end_str}")
 
+
 # # set of all possible 30 min time slots and then remove the busy ones
 # def get_available_slots(busy_slots: list[dict[str, str]]):
 #     work_hours = (9, 17)  # 9 AM to 5 PM
@@ -256,21 +420,21 @@ def print_available_slots(available_slots):
 #         end_dt = datetime.fromisoformat(slot["end"].rstrip("Z"))
 #         day = start_dt.date()
 #         dates.add(day)
-        
+
 #         # Convert start time to 30-minute slot index (index: 0-48)
 #         start_slot = start_dt.hour * 2
 #         if start_dt.minute >= 30:
 #             start_slot += 1
-            
+
 #         # Convert end time to 30-minute slot index (index: 0-48)
 #         end_slot = end_dt.hour * 2
 #         if end_dt.minute > 0:
 #             end_slot += 1
-            
+
 #         # Add each 30 min slot that is busy period to busy_days
 #         for slot30min in range(start_slot, end_slot):
 #             busy_days[day].add(slot30min)
-    
+
 #     # Determine the date range
 #     start_date = datetime.utcnow().date()
 #     if not dates:
@@ -281,7 +445,7 @@ def print_available_slots(available_slots):
 #         for i in range(days_to_include):
 #             current_date = start_date + timedelta(days=i)
 #             dates.add(current_date)
-    
+
 #     # find all available slots
 #     all_available_slots = {}
 #     for day in sorted(dates):
@@ -293,10 +457,10 @@ def print_available_slots(available_slots):
 #         work_start_slot = work_hours[0] * 2  # 18
 #         work_end_slot = work_hours[1] * 2    # 34
 #         all_slots = set(range(work_start_slot, work_end_slot))
-        
+
 #         # Remove busy slots
 #         available_slots = all_slots - busy_days[day]
-        
+
 #         # Convert to start and end time tuple (start_time, end_time)
 #         slots = []
 #         for free_slot in sorted(available_slots):
@@ -306,9 +470,9 @@ def print_available_slots(available_slots):
 #             else:
 #                 start_minute = 30
 #             start_time = time(start_hour, start_minute)
-            
+
 #             slot_datetime = datetime.combine(day, time(start_hour, start_minute))
-#             if slot_datetime < cutoff_datetime: # check cutoff threshold 
+#             if slot_datetime < cutoff_datetime: # check cutoff threshold
 #                 continue
 
 #             # Find end time (30 mins later)
@@ -318,38 +482,38 @@ def print_available_slots(available_slots):
 #             else:
 #                 end_minute = 0
 #                 end_hour += 1  # When start time is at the 30 min mark jump to next hour
-                
+
 #             end_time = time(end_hour, end_minute)
 #             slots.append((start_time, end_time))
-        
+
 #         all_available_slots[day] = slots
-    
+
 #     return all_available_slots
 
 # def get_shared_slots(interviewers_availability: dict[int, dict[date, list[time]]]) -> dict[date, list[time]]:
 #     date_counts = defaultdict(dict)
-    
+
 #     # count occurrences for every slot held by interviewers
 #     for all_slots in interviewers_availability.values():
 #         for date, times in all_slots.items():
 #             for time in times:
 #                 date_counts[date][time] = date_counts[date].get(time, 0) + 1
-    
+
 #     # find slot overlap
 #     shared_slots = {}
 #     interviewers_count = len(interviewers_availability)
 #     for date in sorted(date_counts.keys()):
 #         common_times = []
-        
+
 #         for time, count in date_counts[date].items():
 #             if count == interviewers_count:
 #                 common_times.append(time)
-        
+
 #         # Only add dates with available times
 #         if common_times:
 #             sorted_times = sorted(common_times)
 #             shared_slots[date] = sorted_times
-    
+
 #     return shared_slots
 
 # def get_interview_slots(matching_slots, duration):
@@ -357,7 +521,7 @@ def print_available_slots(available_slots):
 #         for i in range(start_index, start_index + count - 1):   # check slots sequentially for contiguous block
 #             curr_slot_end_time = slots[i][1]
 #             next_slot_start_time = slots[i+1][0]
-            
+
 #             if curr_slot_end_time != next_slot_start_time:      # return false if they dont match (gap)
 #                 return False
 #         return True
@@ -365,10 +529,10 @@ def print_available_slots(available_slots):
 #     slot_size = 30  # minutes
 #     slots_needed = math.ceil(duration / slot_size)
 #     available_interviews = []
-    
+
 #     for day, time_slots in matching_slots.items():
 #         sorted_slots = sorted(time_slots)
-        
+
 #         # check each possible starting position for a sequence of consecutive time slots that fit the required slots_needed
 #         for start_index in range(len(sorted_slots) - slots_needed + 1): # include last slot
 #             # Check if slots from start_index are consecutive
@@ -381,7 +545,7 @@ def print_available_slots(available_slots):
 #                     "end": interview_end.isoformat()
 #                 }
 #                 available_interviews.append(interview_slot)
-    
+
 #     return available_interviews
 
 # data = get_free_busy_data([1, 2], {1: "d", 2:"e"})
@@ -411,4 +575,16 @@ def print_available_slots(available_slots):
 # for slot in available_meetings:
 #     start = datetime.fromisoformat(slot["start"])
 #     end = datetime.fromisoformat(slot["end"])
-#     print(f"{start.strftime("%Y-%m-%d %I:%M %p")} to {end.strftime("%Y-%m-%d %I:%M %p")}")
\ No newline at end of file
+#     print(f"{start.strftime("%Y-%m-%d %I:%M %p")} to {end.strftime("%Y-%m-%d %I:%M %p")}")
+
+
+# python -m services.mock_availability [port] [latency] serves the stand-in free/busy API
+if __name__ == "__main__":
+    import sys
+
+    args = sys.argv[1:]
+    port = int(args[0]) if args else 8001
+    latency = float(args[1]) if len(args) > 1 else 0
+    server = MockFreeBusyServer(port=port, latency=latency)
+    print(f"Mock free/busy API on {server.url}/freebusy")  # noqa: T201
+    server.serve_forever()
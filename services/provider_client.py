@@ -0,0 +1,98 @@
+import asyncio
+from datetime import date
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .providers import ProviderTimeoutError
+
+
+class ProviderError(Exception):
+    """The free/busy API answered with an error."""
+
+
+# Client for a batched free/busy API (see services.mock_availability.MockFreeBusyServer
+# for the contract). One instance lives per worker process so its keep-alive connection
+# pool is reused across requests; batches larger than max_batch_size are split and sent
+# concurrently.
+class HttpBusyDataProvider:
+    def __init__(
+        self,
+        base_url: str,
+        max_batch_size: int = 50,
+        pool_size: int = 10,
+        timeout: float = 5,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch_batch(
+        self,
+        interviewer_ids: list[int],
+        start_date: date,
+        end_date: date,
+    ) -> dict[int, list[dict[str, str]]]:
+        try:
+            response = self.session.post(
+                f"{self.base_url}/freebusy",
+                json={
+                    "interviewerIds": interviewer_ids,
+                    "start": start_date.isoformat(),
+                    "end": end_date.isoformat(),
+                },
+                timeout=self.timeout,
+            )
+        except requests.Timeout as exc:
+            msg = f"Free/busy API took longer than {self.timeout}s"
+            raise ProviderTimeoutError(msg) from exc
+        if response.status_code != requests.codes.ok:
+            msg = f"Free/busy API returned {response.status_code}: {response.text}"
+            raise ProviderError(msg)
+        busy_by_id = {
+            calendar["interviewerId"]: calendar["busy"]
+            for calendar in response.json()["calendars"]
+        }
+        # interviewers the provider knows nothing about are free
+        return {
+            interviewer_id: busy_by_id.get(interviewer_id, [])
+            for interviewer_id in interviewer_ids
+        }
+
+    # blocking requests run in threads so split batches are in flight at the same time
+    async def get_busy_batch(
+        self,
+        interviewer_ids: list[int],
+        start_date: date,
+        end_date: date,
+    ) -> dict[int, list[dict[str, str]]]:
+        batches = [
+            interviewer_ids[i : i + self.max_batch_size]
+            for i in range(0, len(interviewer_ids), self.max_batch_size)
+        ]
+        busy_by_id = {}
+        for batch_busy in await asyncio.gather(
+            *(
+                asyncio.to_thread(self.fetch_batch, batch, start_date, end_date)
+                for batch in batches
+            ),
+        ):
+            busy_by_id.update(batch_busy)
+        return busy_by_id
+
+    async def get_busy_blocks(
+        self,
+        interviewer_id: int,
+        start_date: date,
+        end_date: date,
+    ) -> list[dict[str, str]]:
+        return (await self.get_busy_batch([interviewer_id], start_date, end_date))[
+            interviewer_id
+        ]
+
+    def close(self):
+        self.session.close()
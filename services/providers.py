@@ -0,0 +1,118 @@
+import asyncio
+from datetime import date
+from typing import Protocol
+
+
+class ProviderTimeoutError(Exception):
+    """The calendar provider did not answer for the whole panel in time."""
+
+
+class BusyDataProvider(Protocol):
+    # busy blocks ({"start": ..., "end": ...} ISO strings) of one interviewer between
+    # two dates
+    async def get_busy_blocks(
+        self,
+        interviewer_id: int,
+        start_date: date,
+        end_date: date,
+    ) -> list[dict[str, str]]: ...
+
+
+class BatchBusyDataProvider(BusyDataProvider, Protocol):
+    # busy blocks of a whole panel in one round trip, keyed by interviewer id
+    async def get_busy_batch(
+        self,
+        interviewer_ids: list[int],
+        start_date: date,
+        end_date: date,
+    ) -> dict[int, list[dict[str, str]]]: ...
+
+
+async def fetch_interviewer_busy_data(
+    provider: BusyDataProvider,
+    interviewer_id: int,
+    name: str,
+    start_date: date,
+    end_date: date,
+) -> dict:
+    return {
+        "interviewerId": interviewer_id,
+        "name": name,
+        "busy": await provider.get_busy_blocks(interviewer_id, start_date, end_date),
+    }
+
+
+async def fetch_batch_busy_data(
+    provider: BatchBusyDataProvider,
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    start_date: date,
+    end_date: date,
+) -> list[dict]:
+    busy_by_id = await provider.get_busy_batch(interviewer_ids, start_date, end_date)
+    return [
+        {
+            "interviewerId": interviewer_id,
+            "name": interviewer_names.get(interviewer_id, ""),
+            "busy": busy_by_id[interviewer_id],
+        }
+        for interviewer_id in interviewer_ids
+    ]
+
+
+# batch providers get the whole panel in one call, otherwise every panel member is
+# fetched concurrently; either way the panel costs its slowest round trip instead of the
+# sum of all of them
+async def fetch_panel_busy_data(
+    provider: BusyDataProvider,
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    start_date: date,
+    end_date: date,
+) -> list[dict]:
+    if hasattr(provider, "get_busy_batch"):
+        return await fetch_batch_busy_data(
+            provider,
+            interviewer_ids,
+            interviewer_names,
+            start_date,
+            end_date,
+        )
+    return await asyncio.gather(
+        *(
+            fetch_interviewer_busy_data(
+                provider,
+                interviewer_id,
+                interviewer_names.get(interviewer_id, ""),
+                start_date,
+                end_date,
+            )
+            for interviewer_id in interviewer_ids
+        ),
+    )
+
+
+# sync entry point for the (sync) views, busy data comes back in the get_free_busy_data
+# shape. On timeout the outstanding fetches are cancelled.
+def get_panel_busy_data(  # noqa: PLR0913
+    provider: BusyDataProvider,
+    interviewer_ids: list[int],
+    interviewer_names: dict[int, str],
+    start_date: date,
+    end_date: date,
+    timeout: float | None = None,
+) -> list[dict]:
+    if not interviewer_ids:
+        return []
+    panel_fetch = fetch_panel_busy_data(
+        provider,
+        interviewer_ids,
+        interviewer_names,
+        start_date,
+        end_date,
+    )
+    try:
+        return asyncio.run(asyncio.wait_for(panel_fetch, timeout))
+    except TimeoutError as exc:
+        msg = f"Busy data for {interviewer_ids} took longer than {timeout}s"
+        raise ProviderTimeoutError(msg) from exc